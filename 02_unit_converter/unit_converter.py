@@ -1,12 +1,14 @@
 import streamlit as st
 import math
+import re
+from types import MappingProxyType
 
 # =============================================================================
 # CUSTOM CSS STYLING
 # =============================================================================
 # This section defines the custom CSS styles for the application
 # It creates a modern, clean UI inspired by Google's design language
-st.markdown("""
+PAGE_CSS = """
 <style>
 /* Base styles */
 .stApp {
@@ -76,8 +78,40 @@ h1 {
     padding-right: 1rem;
     padding-bottom: 4rem;
 }
+/* Conversion history styling */
+.history-row {
+    display: grid;
+    grid-template-columns: 2fr 3fr;
+    gap: 1rem;
+    padding: 0.4rem 0.75rem;
+    border-bottom: 1px solid rgba(220, 38, 38, 0.15);
+    font-size: 0.95rem;
+}
+.history-row .history-type {
+    opacity: 0.7;
+}
 </style>
-""", unsafe_allow_html=True)
+"""
+
+
+@st.cache_resource
+def load_page_css():
+    """
+    Minify the page stylesheet once per server process.
+
+    Streamlit reruns this script on every full-page interaction, so the
+    stylesheet is stripped of comments and redundant whitespace a single
+    time and the cached string is reused by every session afterwards.
+
+    Returns:
+        The minified <style> block, ready for st.markdown
+    """
+    css = re.sub(r"/\*.*?\*/", "", PAGE_CSS, flags=re.DOTALL)
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{};:,>])\s*", r"\1", css).strip()
+
+
+st.markdown(load_page_css(), unsafe_allow_html=True)
 
 # =============================================================================
 # SIDEBAR CONFIGURATION
@@ -106,23 +140,46 @@ st.markdown('<p class="subtitle">Convert between different units with real-time
 # =============================================================================
 # UNIT DEFINITIONS
 # =============================================================================
-# Define conversion factors for length units (all relative to meters)
-# These values represent how many meters are in one unit of the given measurement
-LENGTH_UNITS = {
-    "Kilometer": 1000, "Meter": 1, "Centimeter": 0.01, "Millimeter": 0.001,
-    "Micrometer": 0.000001, "Nanometer": 0.000000001, "Mile": 1609.344,
-    "Yard": 0.9144, "Foot": 0.3048, "Inch": 0.0254, "Nautical Mile": 1852
-}
+@st.cache_resource
+def load_unit_tables():
+    """
+    Build the unit tables once per server process.
 
-# Define conversion factors for weight units (all relative to grams)
-# These values represent how many grams are in one unit of the given measurement
-WEIGHT_UNITS = {
-    "Kilogram": 1000, "Gram": 1, "Milligram": 0.001,
-    "Metric Ton": 1000000, "Pound": 453.592, "Ounce": 28.3495
-}
+    The tables are shared by every session, so they are wrapped in read-only
+    mappings to make sure no session can modify them for the others.
+
+    Returns:
+        A read-only mapping of conversion type to its units
+    """
+    # Define conversion factors for length units (all relative to meters)
+    # These values represent how many meters are in one unit of the given measurement
+    length_units = {
+        "Kilometer": 1000, "Meter": 1, "Centimeter": 0.01, "Millimeter": 0.001,
+        "Micrometer": 0.000001, "Nanometer": 0.000000001, "Mile": 1609.344,
+        "Yard": 0.9144, "Foot": 0.3048, "Inch": 0.0254, "Nautical Mile": 1852
+    }
+
+    # Define conversion factors for weight units (all relative to grams)
+    # These values represent how many grams are in one unit of the given measurement
+    weight_units = {
+        "Kilogram": 1000, "Gram": 1, "Milligram": 0.001,
+        "Metric Ton": 1000000, "Pound": 453.592, "Ounce": 28.3495
+    }
 
-# Define temperature units (no conversion factors needed as they use formulas)
-TEMPERATURE_UNITS = ["Celsius", "Fahrenheit", "Kelvin"]
+    # Define temperature units (no conversion factors needed as they use formulas)
+    temperature_units = ("Celsius", "Fahrenheit", "Kelvin")
+
+    return MappingProxyType({
+        "Length": MappingProxyType(length_units),
+        "Weight": MappingProxyType(weight_units),
+        "Temperature": temperature_units,
+    })
+
+
+UNIT_TABLES = load_unit_tables()
+LENGTH_UNITS = UNIT_TABLES["Length"]
+WEIGHT_UNITS = UNIT_TABLES["Weight"]
+TEMPERATURE_UNITS = UNIT_TABLES["Temperature"]
 
 # =============================================================================
 # CONVERSION FUNCTIONS
@@ -232,69 +289,170 @@ def format_number(number):
         return f"{number:,.2f}"
 
 
+def convert(conversion_type, value, from_unit, to_unit):
+    """
+    Convert a value using the conversion function for the given conversion type.
+
+    Args:
+        conversion_type: "Length", "Weight" or "Temperature"
+        value: The numeric value to convert
+        from_unit: The source unit
+        to_unit: The target unit
+
+    Returns:
+        The converted value in the target unit
+    """
+    if conversion_type == "Length":
+        return convert_length(value, from_unit, to_unit)
+    elif conversion_type == "Weight":
+        return convert_weight(value, from_unit, to_unit)
+    else:  # Temperature
+        return convert_temperature(value, from_unit, to_unit)
+
+
 # =============================================================================
-# USER INTERFACE ELEMENTS
+# CONVERSION HISTORY
 # =============================================================================
-# Create a number input field for the value to convert
-input_value = st.number_input(
-    "Enter value", value=1.0, format="%f", key="input_value"
-)
+# Maximum number of conversions kept in the session history
+HISTORY_LIMIT = 50
+
+
+def render_history_row(container, entry):
+    """
+    Draw a single conversion history row into the given container.
+
+    Each row is its own element, so a new conversion only sends one new row
+    to the browser instead of re-rendering the whole history table.
+
+    Args:
+        container: The Streamlit container holding the history table
+        entry: A (conversion_type, description) tuple
+    """
+    conversion_type, description = entry
+    container.markdown(
+        f"""
+        <div class="history-row">
+            <span class="history-type">{conversion_type}</span>
+            <span>{description}</span>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+
+def record_conversion(history_box, entry):
+    """
+    Add a conversion to the session history if it differs from the last one.
+
+    Args:
+        history_box: The Streamlit container holding the history table
+        entry: A (conversion_type, description) tuple
+    """
+    # The first result of a session is the default conversion, not a user action
+    last_entry = st.session_state.get("last_conversion")
+    st.session_state.last_conversion = entry
+    if last_entry is None or last_entry == entry:
+        return
+
+    history = st.session_state.history
+    history.append(entry)
+    del history[:-HISTORY_LIMIT]
+    render_history_row(history_box, entry)
+
+
+def swap_units():
+    """
+    Swap the source and target units in the session state.
+
+    This runs as the swap button's on_click callback, i.e. before the rerun
+    triggered by the click, so the swapped units are picked up by that same
+    rerun and no second rerun is needed.
+    """
+    st.session_state.from_unit, st.session_state.to_unit = (
+        st.session_state.to_unit, st.session_state.from_unit
+    )
 
-# Create two columns for the unit selection dropdowns
-col1, col2 = st.columns(2)
-with col1:
-    # Dynamically select the appropriate units based on the conversion type
-    units = {
-        "Length": LENGTH_UNITS.keys(),
-        "Weight": WEIGHT_UNITS.keys(),
-        "Temperature": TEMPERATURE_UNITS
-    }[conversion_type]
-    # Create a dropdown for the source unit
-    from_unit = st.selectbox("From", options=list(units), key="from_unit")
-
-with col2:
-    # Create a dropdown for the target unit
-    to_unit = st.selectbox("To", options=list(units), key="to_unit")
 
 # =============================================================================
-# CONVERSION LOGIC AND RESULT DISPLAY
+# USER INTERFACE ELEMENTS
 # =============================================================================
-# Only perform conversion if a valid input value is provided
-if input_value is not None:
-    result = None
-    # Select the appropriate conversion function based on the conversion type
-    if conversion_type == "Length":
-        result = convert_length(input_value, from_unit, to_unit)
-    elif conversion_type == "Weight":
-        result = convert_weight(input_value, from_unit, to_unit)
-    else:  # Temperature
-        result = convert_temperature(input_value, from_unit, to_unit)
+# Conversion history lives in the session so it survives reruns
+if "history" not in st.session_state:
+    st.session_state.history = []
+
+# Reserve the converter area first so it is displayed above the history table
+converter_area = st.container()
+
+st.subheader("Conversion History")
+history_box = st.container()
+# Earlier rows are only drawn on full-page runs; converter reruns append to them
+for history_entry in st.session_state.history:
+    render_history_row(history_box, history_entry)
+
+
+@st.fragment
+def unit_converter(conversion_type, history_box):
+    """
+    Render the inputs, the result and the swap button as a fragment.
+
+    Interacting with any widget inside the fragment only reruns this function,
+    so the stylesheet, sidebar, header and footer are not re-sent to the
+    browser on every keystroke.
+
+    Args:
+        conversion_type: The conversion type selected in the sidebar
+        history_box: The Streamlit container holding the history table
+    """
+    # Create a number input field for the value to convert
+    input_value = st.number_input(
+        "Enter value", value=1.0, format="%f", key="input_value"
+    )
+
+    # Dynamically select the appropriate units based on the conversion type
+    units = list(UNIT_TABLES[conversion_type])
+    # Reset units left over from a previous conversion type
+    for key, default in (("from_unit", units[0]), ("to_unit", units[0])):
+        if st.session_state.get(key) not in units:
+            st.session_state[key] = default
+
+    # Create two columns for the unit selection dropdowns
+    col1, col2 = st.columns(2)
+    with col1:
+        # Create a dropdown for the source unit
+        from_unit = st.selectbox("From", options=units, key="from_unit")
+
+    with col2:
+        # Create a dropdown for the target unit
+        to_unit = st.selectbox("To", options=units, key="to_unit")
 
-    # Display the result if a conversion was performed
-    if result is not None:
-        formatted_result = format_number(result)
+    # =========================================================================
+    # CONVERSION LOGIC AND RESULT DISPLAY
+    # =========================================================================
+    # Only perform conversion if a valid input value is provided
+    if input_value is not None:
+        result = convert(conversion_type, input_value, from_unit, to_unit)
+        description = (
+            f"{format_number(input_value)} {from_unit} = {format_number(result)} {to_unit}"
+        )
         st.markdown(
             f"""
             <div class="result-box">
-                {format_number(input_value)} {from_unit} = {formatted_result} {to_unit}
+                {description}
             </div>
             """,
             unsafe_allow_html=True
         )
+        record_conversion(history_box, (conversion_type, description))
 
-# =============================================================================
-# ADDITIONAL CONTROLS
-# =============================================================================
-# Add a button to swap the source and target units
-if st.button("🔄 Swap Units"):
-    # Store the current units in temporary variables
-    temp_from = st.session_state.from_unit
-    temp_to = st.session_state.to_unit
-    # Swap the units in the session state
-    st.session_state.from_unit = temp_to
-    st.session_state.to_unit = temp_from
-    # Rerun the app to update the UI
-    st.experimental_rerun()
+    # =========================================================================
+    # ADDITIONAL CONTROLS
+    # =========================================================================
+    # Add a button to swap the source and target units
+    st.button("🔄 Swap Units", on_click=swap_units)
+
+
+with converter_area:
+    unit_converter(conversion_type, history_box)
 
 # =============================================================================
 # FOOTER
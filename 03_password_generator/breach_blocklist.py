@@ -0,0 +1,493 @@
+"""
+Breached Password Blocklist
+
+Builds a compact on-disk blocklist from a large password corpus (one password
+per line) and answers membership queries against it in microseconds.
+
+The blocklist is stored as two files that are memory-mapped at load time:
+- <name>.bloom: a Bloom filter that rejects almost every non-listed password
+  after a handful of bit probes
+- <name>.idx: a sorted array of 64-bit password hashes that confirms a Bloom
+  filter hit exactly with an interpolation search
+
+Opening a blocklist only maps the files, so startup is instant and resident
+memory is limited to the pages actually touched by lookups.
+
+Passwords are compared case-insensitively, like COMMON_PASSWORDS.
+
+Usage:
+    python breach_blocklist.py synth -n 2000000 -o corpus.txt
+    python breach_blocklist.py build corpus.txt -o breached_passwords --fp-rate 0.001
+    python breach_blocklist.py check breached_passwords password123 Tr0ub4dor&3
+    python breach_blocklist.py bench breached_passwords corpus.txt
+
+License: MIT
+Version: 1.0.0
+"""
+
+import argparse
+import hashlib
+import heapq
+import logging
+import math
+import mmap
+import os
+import random
+import string
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONSTANTS AND CONFIGURATION
+# =============================================================================
+BLOOM_SUFFIX = ".bloom"
+INDEX_SUFFIX = ".idx"
+
+# Header layouts: magic, hash count k, bit count m, entry count n
+BLOOM_HEADER = struct.Struct("<8sIQQ")
+BLOOM_MAGIC = b"PWBLOOM1"
+# Header layout: magic, entry count
+INDEX_HEADER = struct.Struct("<8sQ")
+INDEX_MAGIC = b"PWHASH01"
+HASH_ENTRY = struct.Struct("<Q")
+# The index file is little-endian; arrays use the native byte order
+SWAP_BYTES = sys.byteorder != "little"
+
+DEFAULT_FP_RATE = 0.001
+# Hashes sorted in memory per chunk before spilling to a temporary file
+DEFAULT_CHUNK_SIZE = 5_000_000
+
+
+# =============================================================================
+# HASHING
+# =============================================================================
+def password_key(password: str) -> int:
+    """
+    Hash a password into the 64-bit key stored in the blocklist.
+
+    Args:
+        password: The password to hash (compared case-insensitively)
+
+    Returns:
+        int: The 64-bit key
+    """
+    digest = hashlib.blake2b(password.lower().encode("utf-8", "surrogateescape"),
+                             digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def bloom_step(key: int) -> int:
+    """
+    Derive the Bloom filter double-hashing step from a key.
+
+    The key is scrambled with the splitmix64 finalizer, so the filter can be
+    built from the stored keys alone, without re-reading the corpus.
+
+    Args:
+        key: The 64-bit password key
+
+    Returns:
+        int: An odd 64-bit step
+    """
+    z = (key + 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & 0xFFFFFFFFFFFFFFFF
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & 0xFFFFFFFFFFFFFFFF
+    return (z ^ (z >> 31)) | 1
+
+
+def bloom_parameters(count: int, fp_rate: float) -> Tuple[int, int]:
+    """
+    Choose the Bloom filter size and hash count for a target false-positive rate.
+
+    Args:
+        count: The number of entries the filter will hold
+        fp_rate: The target false-positive rate, between 0 and 1
+
+    Returns:
+        A (bit count, hash count) tuple
+    """
+    count = max(count, 1)
+    bits = math.ceil(-count * math.log(fp_rate) / math.log(2) ** 2)
+    bits = max(64, (bits + 7) // 8 * 8)
+    # The optimal hash count for this size is -log2(fp_rate)
+    hash_count = max(1, round(-math.log2(fp_rate)))
+    return bits, hash_count
+
+
+# =============================================================================
+# BUILDING
+# =============================================================================
+def read_corpus(path: str) -> Iterator[str]:
+    """
+    Stream passwords from a corpus file, one per line.
+
+    Undecodable bytes are kept as surrogate escapes so odd leaked passwords
+    are hashed consistently instead of aborting the build.
+
+    Args:
+        path: The corpus file path
+
+    Yields:
+        Non-empty passwords without their line endings
+    """
+    with open(path, "r", encoding="utf-8", errors="surrogateescape", newline="") as f:
+        for line in f:
+            password = line.rstrip("\r\n")
+            if password:
+                yield password
+
+
+def _sorted_runs(passwords: Iterable[str], chunk_size: int,
+                 tmp_dir: str) -> Tuple[List[str], int]:
+    """
+    Hash passwords and write them out as sorted, de-duplicated runs.
+
+    Args:
+        passwords: The passwords to hash
+        chunk_size: The number of hashes sorted in memory at once
+        tmp_dir: The directory for the run files
+
+    Returns:
+        The run file paths and the total number of passwords read
+    """
+    runs, total = [], 0
+    chunk = array("Q")
+
+    def spill():
+        path = os.path.join(tmp_dir, f"run{len(runs)}.bin")
+        with open(path, "wb") as f:
+            array("Q", sorted(set(chunk))).tofile(f)
+        runs.append(path)
+        del chunk[:]
+
+    for password in passwords:
+        chunk.append(password_key(password))
+        total += 1
+        if len(chunk) >= chunk_size:
+            spill()
+    if chunk or not runs:
+        spill()
+    return runs, total
+
+
+def _read_keys(path: str, offset: int = 0, swap: bool = False,
+               buffer_entries: int = 1 << 16) -> Iterator[int]:
+    """Yield the keys stored in a file of uint64 values"""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        while True:
+            block = array("Q")
+            block.frombytes(f.read(buffer_entries * 8))
+            if not block:
+                return
+            if swap:
+                block.byteswap()
+            yield from block
+
+
+def build_blocklist(passwords: Iterable[str], output: str,
+                    fp_rate: float = DEFAULT_FP_RATE,
+                    chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    Build the Bloom filter and sorted hash index for a password corpus.
+
+    Hashes are sorted in bounded chunks and merged from disk, so the corpus
+    can be much larger than memory, and it is only read once. The Bloom
+    filter is sized after the merge, from the exact number of distinct
+    passwords, and filled from the merged index.
+
+    Args:
+        passwords: The passwords to include
+        output: The output path prefix (".bloom" and ".idx" are appended)
+        fp_rate: The target Bloom filter false-positive rate
+        chunk_size: The number of hashes sorted in memory at once
+
+    Returns:
+        int: The number of distinct passwords in the blocklist
+
+    Raises:
+        ValueError: If fp_rate is not between 0 and 1
+    """
+    if not 0 < fp_rate < 1:
+        raise ValueError("fp_rate must be between 0 and 1")
+
+    start = time.perf_counter()
+    index_path = output + INDEX_SUFFIX
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        runs, total = _sorted_runs(passwords, chunk_size, tmp_dir)
+
+        # Merge the runs into the final index, dropping duplicates across runs
+        count, previous = 0, None
+        with open(index_path, "wb") as index_file:
+            index_file.write(INDEX_HEADER.pack(INDEX_MAGIC, 0))
+            block = array("Q")
+
+            def flush():
+                if SWAP_BYTES:
+                    block.byteswap()
+                block.tofile(index_file)
+                del block[:]
+
+            for key in heapq.merge(*(_read_keys(run) for run in runs)):
+                if key == previous:
+                    continue
+                previous = key
+                block.append(key)
+                count += 1
+                if len(block) >= 1 << 16:
+                    flush()
+            flush()
+            index_file.seek(0)
+            index_file.write(INDEX_HEADER.pack(INDEX_MAGIC, count))
+
+    bits, hash_count = bloom_parameters(count, fp_rate)
+    bloom = bytearray(bits // 8)
+    for key in _read_keys(index_path, INDEX_HEADER.size, SWAP_BYTES):
+        step = bloom_step(key)
+        for i in range(hash_count):
+            bit = (key + i * step) % bits
+            bloom[bit >> 3] |= 1 << (bit & 7)
+
+    with open(output + BLOOM_SUFFIX, "wb") as bloom_file:
+        bloom_file.write(BLOOM_HEADER.pack(BLOOM_MAGIC, hash_count, bits, count))
+        bloom_file.write(bloom)
+
+    logger.info(f"Built blocklist {output}: {count} distinct of {total} passwords, "
+                f"{bits // 8:,} byte filter, k={hash_count}, "
+                f"{time.perf_counter() - start:.1f}s")
+    return count
+
+
+# =============================================================================
+# LOOKUP
+# =============================================================================
+class Blocklist:
+    """
+    A memory-mapped breached password blocklist.
+
+    Use "password in blocklist" to check a password. The Bloom filter is
+    probed first; only its (rare) hits are confirmed against the sorted
+    hash index, so a lookup touches a few pages at most.
+    """
+
+    def __init__(self, path: str):
+        """
+        Map the blocklist files for reading.
+
+        Args:
+            path: The path prefix the blocklist was built with
+
+        Raises:
+            ValueError: If either file is not a valid blocklist file
+        """
+        self.path = path
+        with open(path + BLOOM_SUFFIX, "rb") as f:
+            self._bloom = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(path + INDEX_SUFFIX, "rb") as f:
+            self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.hash_count, self.bits, _ = BLOOM_HEADER.unpack_from(self._bloom)
+        if magic != BLOOM_MAGIC:
+            raise ValueError(f"{path}{BLOOM_SUFFIX} is not a blocklist Bloom filter")
+        magic, self.count = INDEX_HEADER.unpack_from(self._index)
+        if magic != INDEX_MAGIC:
+            raise ValueError(f"{path}{INDEX_SUFFIX} is not a blocklist hash index")
+
+    @classmethod
+    def open_if_exists(cls, path: str) -> Optional["Blocklist"]:
+        """
+        Open a blocklist, returning None if it hasn't been built.
+
+        Args:
+            path: The path prefix the blocklist was built with
+
+        Returns:
+            The opened blocklist, or None if its files are missing or invalid
+        """
+        if not (os.path.exists(path + BLOOM_SUFFIX) and os.path.exists(path + INDEX_SUFFIX)):
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError, struct.error) as e:
+            logger.error(f"Error opening blocklist {path}: {str(e)}")
+            return None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _bloom_contains(self, key: int) -> bool:
+        bloom, bits, offset = self._bloom, self.bits, BLOOM_HEADER.size
+        step = bloom_step(key)
+        for i in range(self.hash_count):
+            bit = (key + i * step) % bits
+            if not bloom[offset + (bit >> 3)] >> (bit & 7) & 1:
+                return False
+        return True
+
+    def _index_contains(self, key: int) -> bool:
+        # The keys are uniformly distributed hashes, so interpolation search
+        # finds a key in a few probes; it falls back to bisection in case a
+        # skewed stretch of keys keeps the guesses from converging
+        index, unpack, offset = self._index, HASH_ENTRY.unpack_from, INDEX_HEADER.size
+        lo, hi = 0, self.count - 1
+        lo_value, hi_value = 0, 1 << 64
+        probes = 0
+        while lo <= hi:
+            if probes < 8:
+                mid = lo + (key - lo_value) * (hi - lo) // max(hi_value - lo_value, 1)
+                mid = min(max(mid, lo), hi)
+            else:
+                mid = (lo + hi) // 2
+            probes += 1
+            value = unpack(index, offset + mid * 8)[0]
+            if value < key:
+                lo, lo_value = mid + 1, value
+            elif value > key:
+                hi, hi_value = mid - 1, value
+            else:
+                return True
+        return False
+
+    def might_contain(self, password: str) -> bool:
+        """
+        Check the Bloom filter only (may return false positives).
+
+        Args:
+            password: The password to check
+
+        Returns:
+            bool: False if the password is definitely not listed
+        """
+        return self._bloom_contains(password_key(password))
+
+    def __contains__(self, password: str) -> bool:
+        key = password_key(password)
+        return self._bloom_contains(key) and self._index_contains(key)
+
+    def close(self) -> None:
+        """Unmap the blocklist files"""
+        self._bloom.close()
+        self._index.close()
+
+
+# =============================================================================
+# SYNTHETIC CORPUS AND BENCHMARK
+# =============================================================================
+def write_synthetic_corpus(path: str, count: int, seed: int = 0) -> None:
+    """
+    Write a synthetic password corpus for testing and benchmarking.
+
+    The passwords mimic common leak patterns (words with digit suffixes,
+    keyboard walks, random strings) and include some duplicates.
+
+    Args:
+        path: The output file path
+        count: The number of lines to write
+        seed: The random seed, for reproducible corpora
+    """
+    rng = random.Random(seed)
+    words = ["password", "dragon", "monkey", "shadow", "sunshine", "princess",
+             "football", "charlie", "qwerty", "welcome", "master", "hello"]
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(count):
+            kind = i % 4
+            if kind == 0:
+                line = rng.choice(words) + str(rng.randrange(10_000))
+            elif kind == 1:
+                line = rng.choice(words).capitalize() + rng.choice("!@#$") + str(rng.randrange(100))
+            elif kind == 2:
+                line = "".join(rng.choices(string.ascii_lowercase + string.digits,
+                                           k=rng.randrange(6, 14)))
+            else:
+                line = str(rng.randrange(10 ** rng.randrange(4, 10)))
+            f.write(line + "\n")
+
+
+def benchmark(blocklist: Blocklist, listed: Sequence[str], samples: int = 100_000) -> dict:
+    """
+    Measure lookup latency for listed and unlisted passwords.
+
+    Args:
+        blocklist: The blocklist to query
+        listed: Passwords known to be in the blocklist
+        samples: The number of lookups per case
+
+    Returns:
+        A dict with the mean lookup time in microseconds per case
+    """
+    rng = random.Random(1)
+    hits = [rng.choice(listed) for _ in range(samples)]
+    misses = ["".join(rng.choices(string.ascii_letters + string.digits + "!@#$%^&*", k=16))
+              for _ in range(samples)]
+    results = {}
+    for name, queries in (("listed_us", hits), ("unlisted_us", misses)):
+        start = time.perf_counter()
+        for password in queries:
+            password in blocklist
+        results[name] = (time.perf_counter() - start) / samples * 1e6
+    return results
+
+
+# =============================================================================
+# COMMAND LINE INTERFACE
+# =============================================================================
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Build and query a breached password blocklist.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build = subparsers.add_parser("build", help="Build a blocklist from a corpus file")
+    build.add_argument("corpus", help="Password corpus, one password per line")
+    build.add_argument("-o", "--output", required=True, help="Output path prefix")
+    build.add_argument("--fp-rate", type=float, default=DEFAULT_FP_RATE,
+                       help="Bloom filter false-positive rate")
+    build.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                       help="Hashes sorted in memory per chunk")
+
+    check = subparsers.add_parser("check", help="Check passwords against a blocklist")
+    check.add_argument("blocklist", help="Blocklist path prefix")
+    check.add_argument("passwords", nargs="+")
+
+    synth = subparsers.add_parser("synth", help="Write a synthetic corpus for testing")
+    synth.add_argument("-n", "--count", type=int, default=1_000_000)
+    synth.add_argument("-o", "--output", required=True)
+    synth.add_argument("--seed", type=int, default=0)
+
+    bench = subparsers.add_parser("bench", help="Measure lookup latency")
+    bench.add_argument("blocklist", help="Blocklist path prefix")
+    bench.add_argument("corpus", help="The corpus the blocklist was built from")
+    bench.add_argument("--samples", type=int, default=100_000)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        build_blocklist(read_corpus(args.corpus), args.output, args.fp_rate, args.chunk_size)
+    elif args.command == "check":
+        blocklist = Blocklist(args.blocklist)
+        for password in args.passwords:
+            print(f"{'BREACHED' if password in blocklist else 'not found'}\t{password}")
+    elif args.command == "synth":
+        write_synthetic_corpus(args.output, args.count, args.seed)
+    else:
+        blocklist = Blocklist(args.blocklist)
+        listed = []
+        for password in read_corpus(args.corpus):
+            listed.append(password)
+            if len(listed) >= args.samples:
+                break
+        results = benchmark(blocklist, listed, args.samples)
+        print(f"{len(blocklist):,} entries: listed {results['listed_us']:.2f} µs, "
+              f"unlisted {results['unlisted_us']:.2f} µs per lookup")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
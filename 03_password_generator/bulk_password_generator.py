@@ -0,0 +1,359 @@
+"""
+Bulk Password Generator
+
+Generates cryptographically secure passwords in bulk. Randomness is drawn from
+os.urandom in large blocks and turned into characters with unbiased rejection
+sampling, and every password is guaranteed to contain a lowercase letter, an
+uppercase letter, a digit and a special character without any retry loop.
+
+Usage:
+    python bulk_password_generator.py generate -n 100000 -o passwords.txt
+    python bulk_password_generator.py generate -n 500000 --workers 4 -o passwords.txt
+    python bulk_password_generator.py bench -n 200000 --workers 1 2 4
+
+License: MIT
+Version: 1.0.0
+"""
+
+import argparse
+import logging
+import os
+import string
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONSTANTS AND CONFIGURATION
+# =============================================================================
+SPECIAL_CHARS = "!@#$%^&*"
+ALPHABET = string.ascii_letters + string.digits + SPECIAL_CHARS
+
+# Every generated password contains at least one character from each class
+CHARACTER_CLASSES: Tuple[str, ...] = (
+    string.ascii_lowercase,
+    string.ascii_uppercase,
+    string.digits,
+    SPECIAL_CHARS,
+)
+MIN_LENGTH = len(CHARACTER_CLASSES)
+# Insert positions are drawn from single bytes, which caps the length
+MAX_LENGTH = 256
+DEFAULT_LENGTH = 16
+
+# Number of random bytes read from the operating system per refill
+DEFAULT_BLOCK_SIZE = 1 << 16
+# Number of passwords generated per batch when streaming to a file
+DEFAULT_BATCH_SIZE = 10_000
+
+
+# =============================================================================
+# BUFFERED ENTROPY
+# =============================================================================
+def _sampling_table(symbols: bytes) -> Tuple[bytes, bytes]:
+    """
+    Build a bytes.translate table for unbiased sampling from the given symbols.
+
+    A random byte b is accepted when it is below the largest multiple of
+    len(symbols) that fits in a byte, and is then mapped to symbols[b % n].
+    Bytes above that limit are rejected (deleted), so every accepted symbol is
+    equally likely.
+
+    Args:
+        symbols: The output symbols, at most 256 of them
+
+    Returns:
+        The translation table and the bytes to delete
+    """
+    n = len(symbols)
+    limit = 256 - 256 % n
+    table = bytes(symbols[b % n] if b < limit else 0 for b in range(256))
+    return table, bytes(range(limit, 256))
+
+
+class EntropyPool:
+    """
+    A buffered source of uniformly distributed symbols backed by os.urandom.
+
+    Each symbol set gets its own stream. Refilling a stream reads a large block
+    from the operating system's CSPRNG and runs the rejection sampling through
+    bytes.translate, so the per-character cost is paid in C rather than in a
+    Python loop. The pool is thread-safe, and it discards its buffers when it
+    is used from a forked child so two processes never share random bytes.
+    """
+
+    def __init__(self, block_size: int = DEFAULT_BLOCK_SIZE):
+        self.block_size = block_size
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        # symbols -> [translate table, rejected bytes, buffer, read position]
+        self._streams: Dict[bytes, list] = {}
+
+    def take(self, symbols: bytes, count: int) -> bytes:
+        """
+        Draw count symbols, each chosen uniformly and independently.
+
+        Args:
+            symbols: The symbol set to draw from
+            count: The number of symbols to draw
+
+        Returns:
+            The drawn symbols as bytes
+        """
+        with self._lock:
+            if os.getpid() != self._pid:
+                self._pid = os.getpid()
+                self._streams.clear()
+
+            stream = self._streams.get(symbols)
+            if stream is None:
+                stream = [*_sampling_table(symbols), b"", 0]
+                self._streams[symbols] = stream
+            table, rejected, buffer, pos = stream
+
+            if len(buffer) - pos < count:
+                chunks = [buffer[pos:]]
+                available = len(chunks[0])
+                while available < count:
+                    block = os.urandom(max(self.block_size, count - available))
+                    chunk = block.translate(table, rejected)
+                    chunks.append(chunk)
+                    available += len(chunk)
+                buffer, pos = b"".join(chunks), 0
+
+            stream[2], stream[3] = buffer, pos + count
+            return buffer[pos:pos + count]
+
+    def chars(self, charset: str, count: int) -> str:
+        """
+        Draw count characters uniformly from an ASCII charset.
+
+        Args:
+            charset: The characters to choose from
+            count: The number of characters to draw
+
+        Returns:
+            The drawn characters as a string
+        """
+        return self.take(charset.encode("ascii"), count).decode("ascii")
+
+    def indices(self, n: int, count: int) -> bytes:
+        """
+        Draw count integers uniformly from range(n).
+
+        Args:
+            n: The exclusive upper bound, between 1 and 256
+            count: The number of integers to draw
+
+        Returns:
+            The drawn integers as bytes (index the result to get ints)
+        """
+        return self.take(bytes(range(n)), count)
+
+
+# Shared pool used when callers don't provide their own
+_default_pool = EntropyPool()
+
+
+# =============================================================================
+# PASSWORD GENERATION
+# =============================================================================
+def generate_passwords(count: int, length: int = DEFAULT_LENGTH,
+                       pool: Optional[EntropyPool] = None) -> List[str]:
+    """
+    Generate a batch of passwords that satisfy the character-class policy.
+
+    Each password is built from one character of every class plus
+    length - 4 characters from the full alphabet. The required characters are
+    inserted one by one at uniformly random positions, which gives the same
+    result as shuffling the whole password, so no password ever has to be
+    regenerated.
+
+    Args:
+        count: The number of passwords to generate
+        length: The length of every password (4 to 256)
+        pool: The entropy pool to draw from (default: a shared pool)
+
+    Returns:
+        A list of generated passwords
+
+    Raises:
+        ValueError: If length is outside the supported range
+    """
+    if not MIN_LENGTH <= length <= MAX_LENGTH:
+        raise ValueError(f"Password length must be between {MIN_LENGTH} and {MAX_LENGTH}")
+    if count <= 0:
+        return []
+
+    pool = pool or _default_pool
+    body_length = length - MIN_LENGTH
+    # Draw all randomness for the batch up front, one call per stream
+    body = pool.chars(ALPHABET, count * body_length)
+    required = [pool.chars(charset, count) for charset in CHARACTER_CLASSES]
+    positions = [pool.indices(body_length + k + 1, count) for k in range(MIN_LENGTH)]
+
+    passwords = []
+    for i in range(count):
+        password = body[i * body_length:(i + 1) * body_length]
+        for chars, slots in zip(required, positions):
+            p = slots[i]
+            password = password[:p] + chars[i] + password[p:]
+        passwords.append(password)
+    return passwords
+
+
+def generate_password(length: int = DEFAULT_LENGTH,
+                      pool: Optional[EntropyPool] = None) -> str:
+    """
+    Generate a single password that satisfies the character-class policy.
+
+    Args:
+        length: The length of the password (4 to 256)
+        pool: The entropy pool to draw from (default: a shared pool)
+
+    Returns:
+        A randomly generated password string
+    """
+    return generate_passwords(1, length, pool)[0]
+
+
+def iter_password_batches(count: int, length: int = DEFAULT_LENGTH,
+                          batch_size: int = DEFAULT_BATCH_SIZE,
+                          workers: int = 1) -> Iterator[List[str]]:
+    """
+    Yield batches of passwords until count passwords have been produced.
+
+    With more than one worker the batches are generated in a process pool,
+    each worker drawing from its own entropy pool.
+
+    Args:
+        count: The total number of passwords
+        length: The length of every password
+        batch_size: The number of passwords per batch
+        workers: The number of worker processes (1 generates in-process)
+
+    Yields:
+        Lists of generated passwords
+    """
+    sizes = [batch_size] * (count // batch_size)
+    if count % batch_size:
+        sizes.append(count % batch_size)
+
+    if workers <= 1:
+        for size in sizes:
+            yield generate_passwords(size, length)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(generate_passwords, sizes, [length] * len(sizes))
+
+
+def write_passwords(path: str, count: int, length: int = DEFAULT_LENGTH,
+                    batch_size: int = DEFAULT_BATCH_SIZE, workers: int = 1) -> int:
+    """
+    Stream generated passwords to a file, one per line.
+
+    Passwords are written batch by batch, so memory use is bounded by the
+    batch size rather than the total count. Use "-" to write to stdout.
+
+    Args:
+        path: The output file path, or "-" for stdout
+        count: The total number of passwords
+        length: The length of every password
+        batch_size: The number of passwords per batch
+        workers: The number of worker processes
+
+    Returns:
+        int: The number of passwords written
+    """
+    written = 0
+    out = sys.stdout if path == "-" else open(path, "w", encoding="ascii")
+    try:
+        for batch in iter_password_batches(count, length, batch_size, workers):
+            out.write("\n".join(batch))
+            out.write("\n")
+            written += len(batch)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    logger.info(f"Wrote {written} passwords to {path}")
+    return written
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+def benchmark(count: int, length: int = DEFAULT_LENGTH,
+              workers: Sequence[int] = (1,),
+              batch_size: int = DEFAULT_BATCH_SIZE) -> List[Dict[str, float]]:
+    """
+    Measure generation throughput for each worker count.
+
+    Args:
+        count: The number of passwords generated per run
+        length: The length of every password
+        workers: The worker counts to measure
+        batch_size: The number of passwords per batch
+
+    Returns:
+        A list of result dicts with workers, seconds and passwords_per_second
+    """
+    results = []
+    for worker_count in workers:
+        start = time.perf_counter()
+        generated = sum(len(batch) for batch in
+                        iter_password_batches(count, length, batch_size, worker_count))
+        elapsed = time.perf_counter() - start
+        results.append({
+            "workers": worker_count,
+            "seconds": elapsed,
+            "passwords_per_second": generated / elapsed,
+        })
+    return results
+
+
+# =============================================================================
+# COMMAND LINE INTERFACE
+# =============================================================================
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Generate secure passwords in bulk.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    generate = subparsers.add_parser("generate", help="Write passwords to a file")
+    generate.add_argument("-n", "--count", type=int, required=True, help="Number of passwords")
+    generate.add_argument("-o", "--output", default="-", help="Output file (default: stdout)")
+
+    bench = subparsers.add_parser("bench", help="Measure generation throughput")
+    bench.add_argument("-n", "--count", type=int, default=200_000, help="Passwords per run")
+    bench.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1],
+                       help="Worker counts to compare")
+
+    for sub in (generate, bench):
+        sub.add_argument("-l", "--length", type=int, default=DEFAULT_LENGTH, help="Password length")
+        sub.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                         help="Passwords per batch")
+    generate.add_argument("--workers", type=int, default=1, help="Worker processes")
+
+    args = parser.parse_args(argv)
+    if not MIN_LENGTH <= args.length <= MAX_LENGTH:
+        parser.error(f"--length must be between {MIN_LENGTH} and {MAX_LENGTH}")
+
+    if args.command == "generate":
+        write_passwords(args.output, args.count, args.length, args.batch_size, args.workers)
+    else:
+        for result in benchmark(args.count, args.length, args.workers, args.batch_size):
+            print(f"workers={result['workers']:<3} "
+                  f"{result['passwords_per_second']:>12,.0f} passwords/s "
+                  f"({result['seconds']:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,419 @@
+"""
+Password Audit (password-audit)
+
+Scores every password in a file with the strength analyzer and writes a
+summary report. Meant for auditing credential dumps from internal systems:
+the report only contains aggregate statistics, never the passwords
+themselves.
+
+Input formats:
+- plain: one password per line
+- potfile: "hash:plaintext" lines, as written by hashcat or John the Ripper
+  for cracked hashes. hashcat's $HEX[...] plaintext encoding is decoded.
+  Salted hash modes write "hash:salt:plaintext"; pass --hash-fields 2 for
+  those (the number of ":"-separated fields before the plaintext). If most
+  plaintexts still contain a ":", a warning suggests it.
+
+The file is read in chunks that are scored across a process pool, with a
+bounded number of chunks in flight so memory use stays flat for files with
+millions of lines.
+
+Usage:
+    python password_audit.py passwords.txt --report audit.json
+    python password_audit.py cracked.pot --format potfile --workers 8
+    python password_audit.py salted.pot --format potfile --hash-fields 2
+    python password_audit.py passwords.txt --blocklist breached_passwords
+
+License: MIT
+Version: 1.0.0
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from breach_blocklist import Blocklist
+from strength_analyzer import (
+    CASE_FEEDBACK, DIGIT_FEEDBACK, LENGTH_FEEDBACK, SPECIAL_FEEDBACK,
+    STRENGTH_RATINGS, analyze_password,
+)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONSTANTS AND CONFIGURATION
+# =============================================================================
+INPUT_FORMATS = ("plain", "potfile")
+DEFAULT_CHUNK_SIZE = 50_000
+# Potfile fields before the plaintext: hash, or hash and salt for salted modes
+DEFAULT_HASH_FIELDS = 1
+POTFILE_SEPARATOR = ":"
+# Passwords longer than this are counted in a single "32+" length bucket
+MAX_LENGTH_BUCKET = 32
+# Short report keys for each feedback message
+FEEDBACK_KEYS = {
+    LENGTH_FEEDBACK: "too_short",
+    CASE_FEEDBACK: "no_mixed_case",
+    DIGIT_FEEDBACK: "no_digit",
+    SPECIAL_FEEDBACK: "no_special_char",
+}
+
+# Per-process state set up by _init_worker
+_worker_blocklist: Optional[Blocklist] = None
+_worker_format = "plain"
+_worker_hash_fields = DEFAULT_HASH_FIELDS
+
+
+# =============================================================================
+# INPUT PARSING
+# =============================================================================
+def decode_hex_plaintext(plaintext: str) -> str:
+    """
+    Decode hashcat's $HEX[...] encoding for plaintexts with unusual bytes.
+
+    Args:
+        plaintext: The plaintext as written in the potfile
+
+    Returns:
+        str: The decoded plaintext (unchanged if it isn't hex-encoded)
+    """
+    if plaintext.startswith("$HEX[") and plaintext.endswith("]"):
+        try:
+            return bytes.fromhex(plaintext[5:-1]).decode("utf-8", "surrogateescape")
+        except ValueError:
+            return plaintext
+    return plaintext
+
+
+def parse_line(line: str, input_format: str, hash_fields: int = DEFAULT_HASH_FIELDS) -> Optional[str]:
+    """
+    Extract the password from one input line.
+
+    Args:
+        line: The line without its line ending
+        input_format: "plain" or "potfile"
+        hash_fields: Potfile fields before the plaintext (2 for hash:salt:plaintext)
+
+    Returns:
+        The password, or None if the line is empty or malformed
+    """
+    if input_format == "potfile":
+        # Hashes and salts don't contain the separator but plaintexts may
+        fields = line.split(POTFILE_SEPARATOR, hash_fields)
+        if len(fields) <= hash_fields:
+            return None
+        line = decode_hex_plaintext(fields[-1])
+    return line or None
+
+
+def iter_chunks(path: str, chunk_size: int) -> Iterator[List[str]]:
+    """
+    Read a file in chunks of lines.
+
+    Args:
+        path: The input file path, or "-" for stdin
+        chunk_size: The number of lines per chunk
+
+    Yields:
+        Lists of lines without their line endings
+    """
+    f = (open(sys.stdin.fileno(), "r", encoding="utf-8", errors="surrogateescape",
+              newline="", closefd=False)
+         if path == "-" else
+         open(path, "r", encoding="utf-8", errors="surrogateescape", newline=""))
+    with f:
+        lines = (line.rstrip("\r\n") for line in f)
+        while True:
+            chunk = list(islice(lines, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+
+# =============================================================================
+# SCORING
+# =============================================================================
+def new_summary() -> Dict[str, Any]:
+    """Create an empty audit summary"""
+    return {
+        "total": 0,
+        "skipped": 0,
+        # Potfile plaintexts containing the separator; many suggest salted lines
+        "separator_in_password": 0,
+        "common": 0,
+        "entropy_sum": 0.0,
+        "ratings": Counter(),
+        "scores": Counter(),
+        "feedback": Counter(),
+        "lengths": Counter(),
+        "entropy_bits": Counter(),
+    }
+
+
+def merge_summaries(target: Dict[str, Any], other: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Add the counts of one summary to another.
+
+    Args:
+        target: The summary to update in place
+        other: The summary to add
+
+    Returns:
+        The updated target summary
+    """
+    for key, value in other.items():
+        if isinstance(value, Counter):
+            target[key].update(value)
+        else:
+            target[key] += value
+    return target
+
+
+def summarize_chunk(lines: List[str], input_format: Optional[str] = None,
+                    blocklist: Optional[Blocklist] = None,
+                    hash_fields: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Score a chunk of input lines and summarize the results.
+
+    When called in a worker process, the input format, hash field count and
+    blocklist set up by the pool initializer are used.
+
+    Args:
+        lines: The input lines
+        input_format: "plain" or "potfile" (default: the worker's format)
+        blocklist: An optional breached password blocklist
+        hash_fields: Potfile fields before the plaintext (default: the worker's)
+
+    Returns:
+        The summary of the chunk
+    """
+    input_format = input_format or _worker_format
+    hash_fields = hash_fields or _worker_hash_fields
+    if blocklist is None:
+        blocklist = _worker_blocklist
+    summary = new_summary()
+    ratings, scores, feedback = summary["ratings"], summary["scores"], summary["feedback"]
+    lengths, entropy_bits = summary["lengths"], summary["entropy_bits"]
+
+    for line in lines:
+        password = parse_line(line, input_format, hash_fields)
+        if password is None:
+            summary["skipped"] += 1
+            continue
+        if input_format == "potfile" and POTFILE_SEPARATOR in password:
+            summary["separator_in_password"] += 1
+        report = analyze_password(password, blocklist)
+        summary["total"] += 1
+        summary["common"] += report.is_common
+        summary["entropy_sum"] += report.entropy_bits
+        ratings[report.rating] += 1
+        scores[report.score] += 1
+        for message in report.feedback:
+            key = FEEDBACK_KEYS.get(message)
+            if key:
+                feedback[key] += 1
+        lengths[min(report.length, MAX_LENGTH_BUCKET)] += 1
+        entropy_bits[int(report.entropy_bits)] += 1
+    return summary
+
+
+def _init_worker(input_format: str, hash_fields: int, blocklist_path: Optional[str]) -> None:
+    """Set up the input format, hash field count and blocklist in a worker process"""
+    global _worker_format, _worker_hash_fields, _worker_blocklist
+    _worker_format = input_format
+    _worker_hash_fields = hash_fields
+    _worker_blocklist = Blocklist(blocklist_path) if blocklist_path else None
+
+
+def audit_file(path: str, input_format: str = "plain", workers: int = 1,
+               blocklist_path: Optional[str] = None,
+               chunk_size: int = DEFAULT_CHUNK_SIZE,
+               hash_fields: int = DEFAULT_HASH_FIELDS) -> Dict[str, Any]:
+    """
+    Score every password in a file and summarize the results.
+
+    Args:
+        path: The input file path, or "-" for stdin
+        input_format: "plain" or "potfile"
+        workers: The number of worker processes (1 scores in-process)
+        blocklist_path: An optional breached password blocklist path prefix
+        chunk_size: The number of lines per chunk
+        hash_fields: Potfile fields before the plaintext (2 for hash:salt:plaintext)
+
+    Returns:
+        The merged summary of the whole file
+
+    Raises:
+        ValueError: If the input format or hash field count is invalid
+    """
+    if input_format not in INPUT_FORMATS:
+        raise ValueError(f"Unknown input format: {input_format}")
+    if hash_fields < 1:
+        raise ValueError(f"Hash fields must be at least 1, not {hash_fields}")
+
+    summary = new_summary()
+    chunks = iter_chunks(path, chunk_size)
+
+    if workers <= 1:
+        blocklist = Blocklist(blocklist_path) if blocklist_path else None
+        for chunk in chunks:
+            merge_summaries(summary, summarize_chunk(chunk, input_format, blocklist, hash_fields))
+        _warn_if_salted(summary)
+        return summary
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(input_format, hash_fields, blocklist_path)) as executor:
+        # Keep a bounded number of chunks in flight instead of reading the
+        # whole file up front
+        pending = set()
+        for chunk in chunks:
+            pending.add(executor.submit(summarize_chunk, chunk))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    merge_summaries(summary, future.result())
+        for future in pending:
+            merge_summaries(summary, future.result())
+    _warn_if_salted(summary)
+    return summary
+
+
+def _warn_if_salted(summary: Dict[str, Any]) -> None:
+    """Warn when most potfile plaintexts look like salt:plaintext"""
+    if summary["total"] and summary["separator_in_password"] * 2 > summary["total"]:
+        logger.warning(f"{summary['separator_in_password']:,} of {summary['total']:,} passwords contain "
+                       f"'{POTFILE_SEPARATOR}'; for hash:salt:plaintext potfiles, use --hash-fields 2")
+
+
+# =============================================================================
+# REPORTING
+# =============================================================================
+def _percentile(histogram: Counter, total: int, fraction: float) -> int:
+    """Return the smallest histogram key covering the given fraction of entries"""
+    target = fraction * total
+    running = 0
+    for key in sorted(histogram):
+        running += histogram[key]
+        if running >= target:
+            return key
+    return 0
+
+
+def build_report(summary: Dict[str, Any], source: str, elapsed: float) -> Dict[str, Any]:
+    """
+    Turn an audit summary into a JSON-serializable report.
+
+    Args:
+        summary: The merged audit summary
+        source: The audited file path
+        elapsed: The audit duration in seconds
+
+    Returns:
+        The report dict
+    """
+    total = summary["total"]
+
+    def share(count):
+        return round(count / total * 100, 2) if total else 0.0
+
+    entropy = summary["entropy_bits"]
+    return {
+        "source": source,
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "duration_seconds": round(elapsed, 3),
+        "passwords": total,
+        "skipped_lines": summary["skipped"],
+        "common_or_breached": {"count": summary["common"], "percent": share(summary["common"])},
+        "ratings": {rating: {"count": summary["ratings"][rating],
+                             "percent": share(summary["ratings"][rating])}
+                    for _, rating in STRENGTH_RATINGS},
+        "missing_requirements": {key: {"count": summary["feedback"][key],
+                                       "percent": share(summary["feedback"][key])}
+                                 for key in FEEDBACK_KEYS.values()},
+        "scores": {str(score): count for score, count in sorted(summary["scores"].items())},
+        "lengths": {(f"{length}+" if length == MAX_LENGTH_BUCKET else str(length)): count
+                    for length, count in sorted(summary["lengths"].items())},
+        "entropy_bits": {
+            "mean": round(summary["entropy_sum"] / total, 2) if total else 0.0,
+            "p10": _percentile(entropy, total, 0.10),
+            "p50": _percentile(entropy, total, 0.50),
+            "p90": _percentile(entropy, total, 0.90),
+        },
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """
+    Format a report as a human-readable summary.
+
+    Args:
+        report: The report dict from build_report
+
+    Returns:
+        str: The formatted summary
+    """
+    lines = [
+        f"Audited {report['passwords']:,} passwords from {report['source']} "
+        f"in {report['duration_seconds']:.1f}s ({report['skipped_lines']:,} lines skipped)",
+        f"Common or breached: {report['common_or_breached']['count']:,} "
+        f"({report['common_or_breached']['percent']}%)",
+        "Ratings:",
+    ]
+    for rating, stats in report["ratings"].items():
+        lines.append(f"  {rating:<14}{stats['count']:>12,}  {stats['percent']:>6}%")
+    lines.append("Missing requirements:")
+    for key, stats in report["missing_requirements"].items():
+        lines.append(f"  {key:<16}{stats['count']:>10,}  {stats['percent']:>6}%")
+    entropy = report["entropy_bits"]
+    lines.append(f"Entropy (bits): mean {entropy['mean']}, p10 {entropy['p10']}, "
+                 f"median {entropy['p50']}, p90 {entropy['p90']}")
+    return "\n".join(lines)
+
+
+# =============================================================================
+# COMMAND LINE INTERFACE
+# =============================================================================
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(
+        prog="password-audit",
+        description="Score a file of passwords and write a summary report.")
+    parser.add_argument("input", help="Input file, or - for stdin")
+    parser.add_argument("--format", choices=INPUT_FORMATS, default="plain",
+                        help="plain: one password per line; potfile: hash:plaintext lines")
+    parser.add_argument("--hash-fields", type=int, default=DEFAULT_HASH_FIELDS,
+                        help="Potfile fields before the plaintext, e.g. 2 for hash:salt:plaintext")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes (default: all cores)")
+    parser.add_argument("--blocklist", help="Breached password blocklist path prefix")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Lines scored per task")
+    parser.add_argument("--report", help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.hash_fields < 1:
+        parser.error("--hash-fields must be at least 1")
+    summary = audit_file(args.input, args.format, args.workers, args.blocklist, args.chunk_size,
+                         args.hash_fields)
+    report = build_report(summary, args.input, time.perf_counter() - start)
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        logger.info(f"Audit report written to {args.report}")
+    print(format_report(report))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
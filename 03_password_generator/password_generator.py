@@ -1,14 +1,48 @@
 import streamlit as st
-import random
-import string
-import re
+import os
+from breach_blocklist import Blocklist
+from bulk_password_generator import generate_password
+from pattern_estimator import PatternEstimator
+from strength_analyzer import analyze_password
 
 # =============================================================================
 # CONSTANTS AND CONFIGURATION
 # =============================================================================
-# List of common weak passwords that should be avoided
-# These passwords are frequently used and easily guessable
-COMMON_PASSWORDS = {"password", "123456", "qwerty", "abc123", "password123", "admin", "letmein", "welcome"}
+# Path prefix of the breached password blocklist built with breach_blocklist.py
+# The blocklist is optional; without it only the built-in common password list is checked
+BLOCKLIST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "breached_passwords")
+
+# Highest point score allowed for each pattern estimator score (0-4), so that
+# predictable passwords like "Password1234!!" can't rate as strong
+PATTERN_SCORE_CAPS = (2, 4, 6, 8, 10)
+
+
+@st.cache_resource
+def load_blocklist():
+    """
+    Open the breached password blocklist once per server process.
+
+    The blocklist files are memory-mapped, so this is fast and the mapping is
+    shared by every session.
+
+    Returns:
+        The Blocklist, or None if it hasn't been built
+    """
+    return Blocklist.open_if_exists(BLOCKLIST_PATH)
+
+
+@st.cache_resource
+def load_estimator():
+    """
+    Create the pattern estimator once per server process.
+
+    The dictionary automaton is loaded from its on-disk cache (or built and
+    cached on first use) and shared by every session.
+
+    Returns:
+        PatternEstimator: The shared estimator
+    """
+    return PatternEstimator()
 
 # =============================================================================
 # PASSWORD STRENGTH CHECKING
@@ -18,63 +52,32 @@ def check_password_strength(password):
     Evaluate the strength of a password using a point-based scoring system.
     
     This function checks multiple aspects of password security:
-    1. Checks if the password is in a list of common weak passwords
+    1. Checks if the password is in a list of common or breached passwords
     2. Evaluates password length (minimum 8 characters recommended)
     3. Checks for presence of uppercase and lowercase letters
     4. Checks for presence of numbers
     5. Checks for presence of special characters
     6. Awards bonus points for additional security features
+    7. Caps the score when the password is built from predictable patterns
+       (words, keyboard walks, sequences, repeats, dates)
+    
+    The scoring itself lives in strength_analyzer.py and pattern_estimator.py,
+    which have no Streamlit dependency and can also be used for batch audits.
     
     Args:
         password: The password string to evaluate
         
     Returns:
-        score: A numeric score from 0-10 indicating password strength
+        score: A numeric score indicating password strength
         feedback: A list of suggestions to improve the password
     """
-    score = 0
-    feedback = []
-
-    st.write(f"🔍 Checking password: `{password}`")
-
-    # Check if password is in the blacklist of common weak passwords
-    if password.lower() in COMMON_PASSWORDS:
-        return 0, ["❌ This password is too common. Choose a more unique password."]
-
-    # Check password length - minimum 8 characters is recommended
-    if len(password) >= 8:
-        score += 2
-    else:
-        feedback.append("❌ Password should be at least 8 characters long.")
-
-    # Check for both uppercase and lowercase letters
-    if re.search(r'[A-Z]', password) and re.search(r'[a-z]', password):
-        score += 2
-    else:
-        feedback.append("❌ Include both uppercase and lowercase letters.")
+    report = analyze_password(password, load_blocklist())
+    if report.is_common:
+        return report.score, list(report.feedback)
 
-    # Check for presence of numbers
-    if re.search(r'\d', password):
-        score += 2
-    else:
-        feedback.append("❌ Add at least one number (0-9).")
-
-    # Check for presence of special characters
-    if re.search(r'[!@#$%^&*]', password):
-        score += 2
-    else:
-        feedback.append("❌ Include at least one special character (!@#$%^&*).")
-
-    # Award bonus points for additional security features
-    if len(password) >= 12:
-        score += 2  # Bonus for longer passwords
-    if re.search(r'\d{3,}', password):  # 3+ consecutive digits
-        score += 1
-    if re.search(r'[!@#$%^&*]{2,}', password):  # 2+ consecutive special chars
-        score += 1
-
-    # Return the final score and feedback
-    return score, feedback
+    estimate = load_estimator().estimate(password)
+    score = min(report.score, PATTERN_SCORE_CAPS[estimate.score])
+    return score, list(report.feedback) + list(estimate.feedback)
 
 # =============================================================================
 # PASSWORD GENERATION
@@ -89,17 +92,17 @@ def generate_strong_password(length=16):
     - Numbers (0-9)
     - Special characters (!@#$%^&*)
     
+    Characters are drawn from the operating system's secure random source
+    (see bulk_password_generator.py), and the password is guaranteed to
+    contain at least one character of each type.
+    
     Args:
         length: The desired length of the password (default: 16)
         
     Returns:
         A randomly generated password string
     """
-    # Combine all possible character types
-    all_chars = string.ascii_letters + string.digits + "!@#$%^&*"
-    # Generate a random password of the specified length
-    password = ''.join(random.choices(all_chars, k=length))
-    return password
+    return generate_password(length)
 
 # =============================================================================
 # USER INTERFACE
@@ -110,6 +113,11 @@ st.title("🔐 Password Strength Meter")
 # Create a password input field (hidden by default)
 password = st.text_input("Enter your password:", type="password")
 
+# Show a quick crack-time estimate whenever the password changes
+if password:
+    estimate = load_estimator().estimate(password)
+    st.caption(f"Estimated guesses to crack: about 10^{estimate.guesses_log10:.0f}")
+
 # Create a button to check password strength
 if st.button("Check Password Strength"):
     # Only proceed if a password was entered
@@ -0,0 +1,720 @@
+"""
+Pattern-Aware Password Strength Estimator
+
+A zxcvbn-style estimator: instead of only checking character classes, it
+looks for the patterns attackers actually try first and estimates how many
+guesses a password would take.
+
+Detected patterns:
+- Dictionary words, common passwords and names (also reversed)
+- L33t substitutions (p@ssw0rd)
+- Keyboard walks (qwerty, 1qaz2wsx, 789456)
+- Repeats (aaa, abcabc)
+- Sequences (abcd, 9876)
+- Dates and years (1987, 12/05/1990)
+
+Dictionary matching runs in linear time through an Aho-Corasick automaton
+over all word lists. Building the automaton is the expensive part, so it is
+built once and pickled to a cache file next to the word lists; the cache is
+rebuilt automatically when a word list changes. The cheapest decomposition of
+the password into patterns is then found with dynamic programming, as in
+zxcvbn, which keeps an estimate well under a millisecond.
+
+License: MIT
+Version: 1.0.0
+"""
+
+import hashlib
+import logging
+import math
+import os
+import pickle
+import re
+from dataclasses import dataclass, field
+from datetime import date
+from itertools import product
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONSTANTS AND CONFIGURATION
+# =============================================================================
+WORDLIST_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wordlists")
+# Ranked word lists (most common first) matched as dictionary words
+DEFAULT_WORDLISTS = ("passwords", "english", "names")
+CACHE_FILE = ".automaton.pickle"
+# Bump when the pickled automaton layout changes
+CACHE_VERSION = 1
+
+# Guess-count constants from zxcvbn
+BRUTEFORCE_CARDINALITY = 10
+# Only this many leading characters are matched against patterns (matching
+# costs grow much faster than the length); the rest counts as bruteforce, as
+# in zxcvbn
+MAX_MATCH_LENGTH = 100
+# Estimates are capped at 10^this, which keeps them finite floats
+MAX_GUESSES_LOG10 = 300
+MIN_GUESSES_BEFORE_GROWING_SEQUENCE = 10_000
+MIN_SUBMATCH_GUESSES_SINGLE_CHAR = 10
+MIN_SUBMATCH_GUESSES_MULTI_CHAR = 50
+MIN_YEAR_SPACE = 20
+REFERENCE_YEAR = date.today().year
+
+# Upper guess bounds for scores 0-3; anything above scores 4
+SCORE_THRESHOLDS = (1e3, 1e6, 1e8, 1e10)
+
+# Common l33t substitutions, letter -> characters used in its place
+L33T_TABLE = {
+    "a": "4@", "b": "8", "c": "({[<", "e": "3", "g": "69", "i": "1!|",
+    "l": "1|7", "o": "0", "s": "$5", "t": "+7", "x": "%", "z": "2",
+}
+L33T_REVERSE: Dict[str, Tuple[str, ...]] = {}
+for _letter, _subs in L33T_TABLE.items():
+    for _sub in _subs:
+        L33T_REVERSE[_sub] = L33T_REVERSE.get(_sub, ()) + (_letter,)
+
+# Keyboard layouts as rows of (unshifted, shifted) key pairs; each row is
+# offset half a key to the right of the one above, as on a real keyboard
+QWERTY_ROWS = (
+    ("`~", "1!", "2@", "3#", "4$", "5%", "6^", "7&", "8*", "9(", "0)", "-_", "=+"),
+    ("qQ", "wW", "eE", "rR", "tT", "yY", "uU", "iI", "oO", "pP", "[{", "]}", "\\|"),
+    ("aA", "sS", "dD", "fF", "gG", "hH", "jJ", "kK", "lL", ";:", "'\""),
+    ("zZ", "xX", "cC", "vV", "bB", "nN", "mM", ",<", ".>", "/?"),
+)
+KEYPAD_ROWS = (
+    ("/", "*", "-"),
+    ("7", "8", "9", "+"),
+    ("4", "5", "6"),
+    ("1", "2", "3"),
+    ("0", "."),
+)
+# Neighbor offsets (row, column) on a slanted keyboard, in a fixed order so
+# that the index identifies the walk direction
+SLANTED_DIRECTIONS = ((0, -1), (-1, 0), (-1, 1), (0, 1), (1, 0), (1, -1))
+# Keypad keys are aligned, so diagonals are neighbors too
+ALIGNED_DIRECTIONS = ((0, -1), (-1, -1), (-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1))
+
+DATE_SEPARATORS = r"[\s/\\_.-]"
+DATE_WITH_SEPARATOR = re.compile(rf"(\d{{1,4}})({DATE_SEPARATORS})(\d{{1,2}})\2(\d{{1,4}})")
+MAYBE_DATE = re.compile(r"\d{4,8}")
+RECENT_YEAR = re.compile(r"19\d\d|20\d\d")
+
+FEEDBACK = {
+    "dictionary": "❌ Avoid common words, names and passwords, even with capital letters.",
+    "l33t": "❌ Predictable substitutions like '@' instead of 'a' don't help very much.",
+    "spatial": "❌ Avoid keyboard patterns like qwerty or 1qaz2wsx.",
+    "repeat": "❌ Avoid repeated words and characters like aaa or abcabc.",
+    "sequence": "❌ Avoid sequences like abc or 6543.",
+    "date": "❌ Avoid dates and years that are associated with you.",
+}
+
+
+@dataclass
+class Match:
+    """A pattern found in the password, covering password[i:j + 1]"""
+    pattern: str
+    i: int
+    j: int
+    token: str
+    guesses: float = 0.0
+    # Pattern-specific details, e.g. the dictionary name and rank
+    details: Dict[str, object] = field(default_factory=dict)
+
+
+class Estimate(NamedTuple):
+    """The result of estimating a password's strength"""
+    guesses: float
+    score: int
+    sequence: Tuple[Match, ...]
+    feedback: Tuple[str, ...]
+
+    @property
+    def guesses_log10(self) -> float:
+        """The order of magnitude of the guess estimate"""
+        return math.log10(max(self.guesses, 1))
+
+
+# =============================================================================
+# AHO-CORASICK AUTOMATON
+# =============================================================================
+class Automaton:
+    """
+    An Aho-Corasick automaton over ranked word lists.
+
+    Finds every occurrence of every word in a text in a single pass. Each
+    state maps to the words ending there as (length, dictionary, rank) tuples,
+    with the outputs of its failure chain already merged in.
+    """
+
+    def __init__(self, wordlists: Dict[str, Sequence[str]]):
+        """
+        Build the automaton.
+
+        Args:
+            wordlists: Dictionary name -> words, most common first
+        """
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[Tuple[int, str, int]]] = [[]]
+
+        for name, words in wordlists.items():
+            for rank, word in enumerate(words, start=1):
+                state = 0
+                for ch in word:
+                    nxt = goto[state].get(ch)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto[state][ch] = nxt
+                        goto.append({})
+                        outputs.append([])
+                    state = nxt
+                # Keep the best rank when a word is listed twice
+                if not any(n == name for _, n, _ in outputs[state]):
+                    outputs[state].append((len(word), name, rank))
+
+        # Breadth-first pass to compute failure links and merge outputs
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0) if goto[f].get(ch, 0) != nxt else 0
+                outputs[nxt] = outputs[nxt] + outputs[fail[nxt]]
+
+        self.goto = goto
+        self.fail = fail
+        self.outputs = [tuple(out) for out in outputs]
+
+    def find(self, text: str) -> List[Tuple[int, int, str, int]]:
+        """
+        Find all word occurrences in a text.
+
+        Args:
+            text: The (lowercased) text to search
+
+        Returns:
+            A list of (i, j, dictionary, rank) tuples for text[i:j + 1]
+        """
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        found = []
+        state = 0
+        for j, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for length, name, rank in outputs[state]:
+                found.append((j - length + 1, j, name, rank))
+        return found
+
+
+def _read_wordlist(path: str) -> List[str]:
+    """Read a ranked word list, one lowercase word per line"""
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip().lower() for line in f if line.strip()]
+
+
+def load_automaton(wordlist_dir: str = WORDLIST_DIR,
+                   names: Sequence[str] = DEFAULT_WORDLISTS) -> Automaton:
+    """
+    Load the dictionary automaton, building and caching it if needed.
+
+    The cache file is keyed on the word lists' names, sizes and modification
+    times, so editing a list triggers a rebuild on the next load.
+
+    Args:
+        wordlist_dir: The directory containing <name>.txt word lists
+        names: The word lists to include
+
+    Returns:
+        Automaton: The loaded or freshly built automaton
+    """
+    paths = {name: os.path.join(wordlist_dir, f"{name}.txt") for name in names}
+    signature = hashlib.sha256(repr((CACHE_VERSION, sorted(
+        (name, os.path.getsize(path), os.stat(path).st_mtime_ns)
+        for name, path in paths.items()
+    ))).encode()).hexdigest()
+
+    cache_path = os.path.join(wordlist_dir, CACHE_FILE)
+    try:
+        with open(cache_path, "rb") as f:
+            cached_signature, automaton = pickle.load(f)
+        if cached_signature == signature:
+            return automaton
+    except (OSError, EOFError, pickle.UnpicklingError, ValueError, TypeError, AttributeError):
+        pass
+
+    automaton = Automaton({name: _read_wordlist(path) for name, path in paths.items()})
+    try:
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump((signature, automaton), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Could not cache the dictionary automaton: {str(e)}")
+    return automaton
+
+
+# =============================================================================
+# KEYBOARD GRAPHS
+# =============================================================================
+def _build_graph(rows, directions) -> Dict[str, Tuple[Optional[str], ...]]:
+    """
+    Build a keyboard adjacency graph.
+
+    Args:
+        rows: Keyboard rows of key strings (unshifted char first)
+        directions: Neighbor offsets as (row, column) deltas
+
+    Returns:
+        Character -> neighboring keys, one slot per direction (None if absent)
+    """
+    graph = {}
+    for r, row in enumerate(rows):
+        for c, key in enumerate(row):
+            neighbors = []
+            for dr, dc in directions:
+                rr, cc = r + dr, c + dc
+                inside = 0 <= rr < len(rows) and 0 <= cc < len(rows[rr])
+                neighbors.append(rows[rr][cc] if inside else None)
+            for ch in key:
+                graph[ch] = tuple(neighbors)
+    return graph
+
+
+def _graph_stats(graph) -> Tuple[int, float]:
+    """Return the number of starting keys and the average key degree"""
+    keys = {neighbors for neighbors in graph.values()}
+    degrees = [sum(n is not None for n in neighbors) for neighbors in graph.values()]
+    return len(keys), sum(degrees) / len(degrees)
+
+
+KEYBOARD_GRAPHS = {
+    "qwerty": _build_graph(QWERTY_ROWS, SLANTED_DIRECTIONS),
+    "keypad": _build_graph(KEYPAD_ROWS, ALIGNED_DIRECTIONS),
+}
+KEYBOARD_STATS = {name: _graph_stats(graph) for name, graph in KEYBOARD_GRAPHS.items()}
+SHIFTED_CHARS = frozenset(key[1] for row in QWERTY_ROWS for key in row)
+
+
+# =============================================================================
+# GUESS ESTIMATES
+# =============================================================================
+def _n_ck(n: int, k: int) -> int:
+    return math.comb(n, k) if 0 <= k <= n else 0
+
+
+def uppercase_variations(token: str) -> int:
+    """Number of capitalization variants an attacker would try for a word"""
+    if token.islower() or not any(ch.isalpha() for ch in token):
+        return 1
+    if (token[0].isupper() and token[1:].islower()) or token.isupper() \
+            or (token[-1].isupper() and token[:-1].islower()):
+        return 2
+    upper = sum(ch.isupper() for ch in token)
+    lower = sum(ch.islower() for ch in token)
+    return sum(_n_ck(upper + lower, i) for i in range(1, min(upper, lower) + 1)) or 1
+
+
+def l33t_variations(token: str, subs: Dict[str, str]) -> int:
+    """Number of substitution variants an attacker would try for a l33t word"""
+    variations = 1
+    lowered = token.lower()
+    for subbed, letter in subs.items():
+        s = lowered.count(subbed)
+        u = lowered.count(letter)
+        if s == 0 or u == 0:
+            variations *= 2
+        else:
+            variations *= sum(_n_ck(u + s, i) for i in range(1, min(u, s) + 1))
+    return variations
+
+
+def dictionary_guesses(match: Match) -> float:
+    d = match.details
+    guesses = d["rank"] * uppercase_variations(match.token)
+    if d.get("l33t"):
+        guesses *= l33t_variations(match.token, d["subs"])
+    if d.get("reversed"):
+        guesses *= 2
+    return guesses
+
+
+def spatial_guesses(match: Match) -> float:
+    starts, degree = KEYBOARD_STATS[match.details["graph"]]
+    length, turns = len(match.token), match.details["turns"]
+    guesses = 0.0
+    for i in range(2, length + 1):
+        for j in range(1, min(turns, i - 1) + 1):
+            guesses += _n_ck(i - 1, j - 1) * starts * degree ** j
+    shifted = match.details["shifted"]
+    if shifted:
+        unshifted = length - shifted
+        if unshifted == 0:
+            guesses *= 2
+        else:
+            guesses *= sum(_n_ck(shifted + unshifted, i)
+                           for i in range(1, min(shifted, unshifted) + 1))
+    return guesses
+
+
+def sequence_guesses(match: Match) -> float:
+    first = match.token[0]
+    if first in "aAzZ019":
+        base = 4
+    elif first.isdigit():
+        base = 10
+    else:
+        base = 26
+    if not match.details["ascending"]:
+        base *= 2
+    return base * len(match.token)
+
+
+def date_guesses(match: Match) -> float:
+    year_space = max(abs(match.details["year"] - REFERENCE_YEAR), MIN_YEAR_SPACE)
+    if match.pattern == "year":
+        return year_space
+    guesses = year_space * 365
+    if match.details.get("separator"):
+        guesses *= 4
+    return guesses
+
+
+def bruteforce_guesses(token: str) -> float:
+    guesses = BRUTEFORCE_CARDINALITY ** len(token)
+    return guesses + 1 if len(token) == 1 else guesses
+
+
+# =============================================================================
+# ESTIMATOR
+# =============================================================================
+class PatternEstimator:
+    """
+    Estimates the number of guesses needed to crack a password.
+
+    Create one instance per process (building it loads the cached automaton)
+    and call estimate() for each password. Instances are read-only after
+    construction and safe to share between threads.
+    """
+
+    def __init__(self, automaton: Optional[Automaton] = None):
+        self.automaton = automaton or load_automaton()
+
+    # ----- matchers ----------------------------------------------------------
+    def _dictionary_matches(self, password: str) -> List[Match]:
+        lowered = password.lower()
+        matches = []
+        for i, j, name, rank in self.automaton.find(lowered):
+            matches.append(Match("dictionary", i, j, password[i:j + 1],
+                                 details={"dictionary": name, "rank": rank}))
+
+        # Reversed words, e.g. "drowssap"
+        n = len(password)
+        for i, j, name, rank in self.automaton.find(lowered[::-1]):
+            i, j = n - 1 - j, n - 1 - i
+            token = password[i:j + 1]
+            if token.lower() != token.lower()[::-1]:
+                matches.append(Match("dictionary", i, j, token,
+                                     details={"dictionary": name, "rank": rank, "reversed": True}))
+
+        # L33t words: decode every substitution variant and keep the words
+        # that include at least one substituted character
+        l33t_chars = sorted({ch for ch in lowered if ch in L33T_REVERSE})
+        if l33t_chars:
+            seen = set()
+            for letters in product(*(L33T_REVERSE[ch] for ch in l33t_chars)):
+                table = dict(zip(l33t_chars, letters))
+                decoded = "".join(table.get(ch, ch) for ch in lowered)
+                for i, j, name, rank in self.automaton.find(decoded):
+                    token = password[i:j + 1]
+                    subs = {ch: table[ch] for ch in set(token.lower()) if ch in table}
+                    if not subs or (i, j, name) in seen:
+                        continue
+                    seen.add((i, j, name))
+                    matches.append(Match("dictionary", i, j, token, details={
+                        "dictionary": name, "rank": rank, "l33t": True, "subs": subs}))
+        return matches
+
+    @staticmethod
+    def _spatial_matches(password: str) -> List[Match]:
+        matches = []
+        for graph_name, graph in KEYBOARD_GRAPHS.items():
+            i = 0
+            n = len(password)
+            while i < n - 1:
+                j = i + 1
+                last_direction = None
+                turns = 0
+                shifted = int(graph_name == "qwerty" and password[i] in SHIFTED_CHARS)
+                while j < n:
+                    neighbors = graph.get(password[j - 1])
+                    found = None
+                    if neighbors:
+                        for direction, key in enumerate(neighbors):
+                            if key and password[j] in key:
+                                found = direction
+                                if graph_name == "qwerty" and key.index(password[j]) == 1:
+                                    shifted += 1
+                                break
+                    if found is None:
+                        break
+                    if found != last_direction:
+                        turns += 1
+                        last_direction = found
+                    j += 1
+                if j - i > 2:
+                    matches.append(Match("spatial", i, j - 1, password[i:j], details={
+                        "graph": graph_name, "turns": turns, "shifted": shifted}))
+                i = j
+        return matches
+
+    @staticmethod
+    def _repeat_matches(password: str, estimate) -> List[Match]:
+        matches = []
+        greedy = re.compile(r"(.+)\1+")
+        lazy = re.compile(r"(.+?)\1+")
+        lazy_anchored = re.compile(r"^(.+?)\1+$")
+        pos = 0
+        while pos < len(password):
+            g = greedy.search(password, pos)
+            if not g:
+                break
+            l = lazy.search(password, pos)
+            if len(g.group(0)) > len(l.group(0)):
+                m = g
+                base = lazy_anchored.match(g.group(0)).group(1)
+            else:
+                m = l
+                base = l.group(1)
+            base_guesses = estimate(base, repeat=False).guesses
+            matches.append(Match("repeat", m.start(), m.end() - 1, m.group(0), details={
+                "base": base, "base_guesses": base_guesses,
+                "repeat_count": len(m.group(0)) // len(base)}))
+            pos = m.end()
+        return matches
+
+    @staticmethod
+    def _sequence_matches(password: str) -> List[Match]:
+        matches = []
+        n = len(password)
+        if n < 3:
+            return matches
+
+        def add(i, j, delta):
+            if j - i > 1 and 0 < abs(delta) <= 5:
+                matches.append(Match("sequence", i, j, password[i:j + 1],
+                                     details={"ascending": delta > 0}))
+
+        i = 0
+        last_delta = None
+        for k in range(1, n):
+            delta = ord(password[k]) - ord(password[k - 1])
+            if last_delta is None:
+                last_delta = delta
+            if delta == last_delta:
+                continue
+            add(i, k - 1, last_delta)
+            i = k - 1
+            last_delta = delta
+        add(i, n - 1, last_delta)
+        return matches
+
+    @staticmethod
+    def _date_matches(password: str) -> List[Match]:
+        matches = []
+        for m in RECENT_YEAR.finditer(password):
+            matches.append(Match("year", m.start(), m.end() - 1, m.group(0),
+                                 details={"year": int(m.group(0))}))
+
+        def plausible(d, mo, y):
+            if y < 100:
+                y += 1900 if y > 50 else 2000
+            if 1 <= mo <= 12 and 1 <= d <= 31 and 1000 <= y <= 2050:
+                return y
+            return None
+
+        # Dates without separators, e.g. 13051987 or 1387
+        n = len(password)
+        for i in range(n):
+            for j in range(i + 3, min(i + 8, n)):
+                token = password[i:j + 1]
+                if not token.isdigit():
+                    break
+                best = None
+                for ylen in (2, 4):
+                    if len(token) - ylen not in (2, 3, 4):
+                        continue
+                    for year_first in (True, False):
+                        y = int(token[:ylen] if year_first else token[-ylen:])
+                        rest = token[ylen:] if year_first else token[:-ylen]
+                        for split in range(1, len(rest)):
+                            a, b = int(rest[:split]), int(rest[split:])
+                            for d, mo in ((a, b), (b, a)):
+                                year = plausible(d, mo, y)
+                                if year and (best is None or abs(year - REFERENCE_YEAR)
+                                             < abs(best - REFERENCE_YEAR)):
+                                    best = year
+                if best:
+                    matches.append(Match("date", i, j, token, details={"year": best}))
+
+        # Dates with separators, e.g. 13/05/1987 or 1987-05-13
+        for m in DATE_WITH_SEPARATOR.finditer(password):
+            a, b, c = int(m.group(1)), int(m.group(3)), int(m.group(4))
+            for d, mo, y in ((a, b, c), (b, a, c), (c, b, a)):
+                year = plausible(d, mo, y)
+                if year:
+                    matches.append(Match("date", m.start(), m.end() - 1, m.group(0),
+                                         details={"year": year, "separator": m.group(2)}))
+                    break
+        return matches
+
+    # ----- scoring -----------------------------------------------------------
+    @staticmethod
+    def _match_guesses(match: Match, password_length: int) -> float:
+        if match.guesses:
+            return match.guesses
+        if match.pattern == "dictionary":
+            guesses = dictionary_guesses(match)
+        elif match.pattern == "spatial":
+            guesses = spatial_guesses(match)
+        elif match.pattern == "repeat":
+            guesses = match.details["base_guesses"] * match.details["repeat_count"]
+        elif match.pattern == "sequence":
+            guesses = sequence_guesses(match)
+        elif match.pattern in ("date", "year"):
+            guesses = date_guesses(match)
+        else:
+            guesses = bruteforce_guesses(match.token)
+        if len(match.token) < password_length:
+            guesses = max(guesses, MIN_SUBMATCH_GUESSES_SINGLE_CHAR if len(match.token) == 1
+                          else MIN_SUBMATCH_GUESSES_MULTI_CHAR)
+        match.guesses = guesses
+        return guesses
+
+    def _most_guessable_sequence(self, password: str, matches: List[Match]):
+        """
+        Find the decomposition of the password with the fewest total guesses.
+
+        This is zxcvbn's dynamic program: for every end position k and number
+        of matches l it keeps the best sequence, where a sequence of l matches
+        costs l! * product(guesses) + D^(l - 1). Uncovered stretches are
+        filled with bruteforce matches.
+        """
+        n = len(password)
+        by_end: List[List[Match]] = [[] for _ in range(n)]
+        for m in matches:
+            by_end[m.j].append(m)
+        for bucket in by_end:
+            bucket.sort(key=lambda m: m.i)
+
+        best_m: List[Dict[int, Match]] = [{} for _ in range(n)]
+        best_pi: List[Dict[int, float]] = [{} for _ in range(n)]
+        best_g: List[Dict[int, float]] = [{} for _ in range(n)]
+
+        def update(m: Match, l: int) -> None:
+            k = m.j
+            pi = self._match_guesses(m, n)
+            if l > 1:
+                pi *= best_pi[m.i - 1][l - 1]
+            g = math.factorial(l) * pi + MIN_GUESSES_BEFORE_GROWING_SEQUENCE ** (l - 1)
+            for other_l, other_g in best_g[k].items():
+                if other_l <= l and other_g <= g:
+                    return
+            best_g[k][l], best_m[k][l], best_pi[k][l] = g, m, pi
+
+        for k in range(n):
+            for m in by_end[k]:
+                if m.i > 0:
+                    for l in list(best_m[m.i - 1]):
+                        update(m, l + 1)
+                else:
+                    update(m, 1)
+            # Bruteforce matches ending at k
+            update(Match("bruteforce", 0, k, password[:k + 1]), 1)
+            for i in range(1, k + 1):
+                for l, last in list(best_m[i - 1].items()):
+                    if last.pattern != "bruteforce":
+                        update(Match("bruteforce", i, k, password[i:k + 1]), l + 1)
+
+        # Unwind the best sequence ending at the last position
+        k = n - 1
+        l, guesses = min(best_g[k].items(), key=lambda item: item[1])
+        sequence = []
+        while k >= 0:
+            m = best_m[k][l]
+            sequence.append(m)
+            k = m.i - 1
+            l -= 1
+        sequence.reverse()
+        return guesses, sequence
+
+    def estimate(self, password: str, repeat: bool = True) -> Estimate:
+        """
+        Estimate the number of guesses needed to crack a password.
+
+        Args:
+            password: The password to estimate
+            repeat: Whether to look for repeats (disabled when estimating the
+                base token of a repeat, to avoid infinite recursion)
+
+        Returns:
+            Estimate: The guess count, a 0-4 score, the cheapest pattern
+            sequence and feedback for the patterns in it
+        """
+        if not password:
+            return Estimate(1.0, 0, (), ())
+
+        if len(password) > MAX_MATCH_LENGTH:
+            # Match the head only; the tail multiplies the guesses as one
+            # bruteforce token
+            head = self.estimate(password[:MAX_MATCH_LENGTH], repeat)
+            tail = password[MAX_MATCH_LENGTH:]
+            tail_log10 = min(len(tail) * math.log10(BRUTEFORCE_CARDINALITY), MAX_GUESSES_LOG10)
+            guesses = 10 ** min(head.guesses_log10 + tail_log10, MAX_GUESSES_LOG10)
+            tail_match = Match("bruteforce", MAX_MATCH_LENGTH, len(password) - 1, tail, 10 ** tail_log10)
+            score = sum(guesses >= threshold + 5 for threshold in SCORE_THRESHOLDS)
+            return Estimate(guesses, score, head.sequence + (tail_match,), head.feedback)
+
+        matches = self._dictionary_matches(password)
+        matches += self._spatial_matches(password)
+        matches += self._sequence_matches(password)
+        matches += self._date_matches(password)
+        if repeat:
+            matches += self._repeat_matches(password, self.estimate)
+
+        guesses, sequence = self._most_guessable_sequence(password, matches)
+        score = sum(guesses >= threshold + 5 for threshold in SCORE_THRESHOLDS)
+
+        feedback = []
+        for m in sequence:
+            key = m.pattern
+            if key == "year":
+                key = "date"
+            if key == "dictionary" and m.details.get("l33t"):
+                key = "l33t"
+            message = FEEDBACK.get(key)
+            if message and message not in feedback:
+                feedback.append(message)
+        return Estimate(guesses, score, tuple(sequence), tuple(feedback))
+
+
+_default_estimator: Optional[PatternEstimator] = None
+
+
+def estimate_password(password: str) -> Estimate:
+    """
+    Estimate a password's strength with a shared, lazily created estimator.
+
+    Args:
+        password: The password to estimate
+
+    Returns:
+        Estimate: The guess estimate for the password
+    """
+    global _default_estimator
+    if _default_estimator is None:
+        _default_estimator = PatternEstimator()
+    return _default_estimator.estimate(password)
@@ -0,0 +1,199 @@
+"""
+Password Strength Analyzer
+
+Scores passwords with the same point-based system as the Password Strength
+Meter, without any Streamlit calls or other side effects, so the analyzer can
+be used from the app, from scripts and from the password-audit CLI.
+
+Every character is classified in a single pass, which yields the score, the
+feedback messages and an entropy estimate together.
+
+License: MIT
+Version: 1.0.0
+"""
+
+import math
+from typing import Iterable, List, NamedTuple, Tuple
+
+# =============================================================================
+# CONSTANTS AND CONFIGURATION
+# =============================================================================
+# List of common weak passwords that should be avoided
+# These passwords are frequently used and easily guessable
+COMMON_PASSWORDS = {"password", "123456", "qwerty", "abc123", "password123", "admin", "letmein", "welcome"}
+
+SPECIAL_CHARS = frozenset("!@#$%^&*")
+
+# Character pool sizes used for the entropy estimate
+LOWERCASE_POOL = 26
+UPPERCASE_POOL = 26
+DIGIT_POOL = 10
+SPECIAL_POOL = len(SPECIAL_CHARS)
+# Any other character: the remaining printable ASCII symbols and space
+OTHER_POOL = 33
+
+# Score thresholds for each strength rating, strongest first
+STRENGTH_RATINGS: Tuple[Tuple[int, str], ...] = (
+    (9, "Ultra Strong"),
+    (7, "Strong"),
+    (5, "Almost Strong"),
+    (3, "Moderate"),
+    (0, "Weak"),
+)
+
+COMMON_FEEDBACK = "❌ This password is too common. Choose a more unique password."
+LENGTH_FEEDBACK = "❌ Password should be at least 8 characters long."
+CASE_FEEDBACK = "❌ Include both uppercase and lowercase letters."
+DIGIT_FEEDBACK = "❌ Add at least one number (0-9)."
+SPECIAL_FEEDBACK = "❌ Include at least one special character (!@#$%^&*)."
+
+
+class StrengthReport(NamedTuple):
+    """The result of analyzing a single password"""
+    score: int
+    feedback: Tuple[str, ...]
+    entropy_bits: float
+    length: int
+    is_common: bool
+
+    @property
+    def rating(self) -> str:
+        """The strength rating for the score, e.g. "Strong" """
+        return strength_rating(self.score)
+
+
+# =============================================================================
+# ANALYSIS
+# =============================================================================
+def strength_rating(score: int) -> str:
+    """
+    Map a score to its strength rating.
+
+    Args:
+        score: A strength score
+
+    Returns:
+        str: The rating name
+    """
+    for threshold, rating in STRENGTH_RATINGS:
+        if score >= threshold:
+            return rating
+    return STRENGTH_RATINGS[-1][1]
+
+
+def is_common_password(password: str, blocklist=None) -> bool:
+    """
+    Check a password against the common and breached password lists.
+
+    Args:
+        password: The password string to check
+        blocklist: An optional breach_blocklist.Blocklist (or any container)
+
+    Returns:
+        bool: True if the password is common or appears in a known breach
+    """
+    if password.lower() in COMMON_PASSWORDS:
+        return True
+    return blocklist is not None and password in blocklist
+
+
+def analyze_password(password: str, blocklist=None) -> StrengthReport:
+    """
+    Evaluate the strength of a password using a point-based scoring system.
+
+    Scoring:
+    - 2 points each for a length of 8+, mixed case, a digit and a special character
+    - 2 bonus points for a length of 12+
+    - 1 bonus point for 3+ consecutive digits
+    - 1 bonus point for 2+ consecutive special characters
+    Common or breached passwords always score 0.
+
+    The entropy estimate is length * log2(pool size), where the pool is the
+    union of the character classes that appear in the password. It is an
+    upper bound that assumes random characters.
+
+    Args:
+        password: The password string to evaluate
+        blocklist: An optional breach_blocklist.Blocklist (or any container)
+
+    Returns:
+        StrengthReport: The score, feedback and entropy estimate
+    """
+    length = len(password)
+    has_lower = has_upper = has_digit = has_special = has_other = False
+    digit_run = special_run = max_digit_run = max_special_run = 0
+
+    # Classify every character in a single pass
+    for ch in password:
+        if "a" <= ch <= "z":
+            has_lower = True
+            digit_run = special_run = 0
+        elif "A" <= ch <= "Z":
+            has_upper = True
+            digit_run = special_run = 0
+        elif ch.isdecimal():
+            has_digit = True
+            digit_run += 1
+            special_run = 0
+            if digit_run > max_digit_run:
+                max_digit_run = digit_run
+        elif ch in SPECIAL_CHARS:
+            has_special = True
+            special_run += 1
+            digit_run = 0
+            if special_run > max_special_run:
+                max_special_run = special_run
+        else:
+            has_other = True
+            digit_run = special_run = 0
+
+    pool = (has_lower * LOWERCASE_POOL + has_upper * UPPERCASE_POOL + has_digit * DIGIT_POOL
+            + has_special * SPECIAL_POOL + has_other * OTHER_POOL)
+    entropy_bits = length * math.log2(pool) if pool else 0.0
+
+    # Check if password is in the blacklist of common or breached passwords
+    if is_common_password(password, blocklist):
+        return StrengthReport(0, (COMMON_FEEDBACK,), entropy_bits, length, True)
+
+    score = 0
+    feedback = []
+    if length >= 8:
+        score += 2
+    else:
+        feedback.append(LENGTH_FEEDBACK)
+    if has_upper and has_lower:
+        score += 2
+    else:
+        feedback.append(CASE_FEEDBACK)
+    if has_digit:
+        score += 2
+    else:
+        feedback.append(DIGIT_FEEDBACK)
+    if has_special:
+        score += 2
+    else:
+        feedback.append(SPECIAL_FEEDBACK)
+
+    # Award bonus points for additional security features
+    if length >= 12:
+        score += 2
+    if max_digit_run >= 3:
+        score += 1
+    if max_special_run >= 2:
+        score += 1
+
+    return StrengthReport(score, tuple(feedback), entropy_bits, length, False)
+
+
+def analyze_passwords(passwords: Iterable[str], blocklist=None) -> List[StrengthReport]:
+    """
+    Analyze a batch of passwords.
+
+    Args:
+        passwords: The passwords to evaluate
+        blocklist: An optional breach_blocklist.Blocklist (or any container)
+
+    Returns:
+        A list of StrengthReports, in the same order as the passwords
+    """
+    return [analyze_password(password, blocklist) for password in passwords]
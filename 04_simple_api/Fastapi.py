@@ -10,25 +10,48 @@ Features:
 - Inspirational money quotes
 - RESTful endpoints
 - FastAPI framework implementation
+- Pre-encoded responses (see snapshot.py)
+- Batch sampling with ?count=N and NDJSON/SSE streams
+- Sampled JSON access logging off the request path (see access_log.py)
+- Hot-reloaded content file with admin endpoints (see store.py)
+- ETags, conditional GETs and precompressed gzip/brotli bodies (see http_cache.py)
+- Prometheus metrics at /metrics, aggregated across workers (see metrics.py)
+- Ranked, paginated quote search with author filters (see search.py)
 
 Security Considerations:
 - Input validation
-- Rate limiting (to be implemented)
+- Rate limiting (token bucket per client, see rate_limit.py)
 - CORS policies (to be implemented)
-- API key authentication (to be implemented)
+- API key authentication for admin endpoints (ADMIN_API_KEY)
 
 Author: [Your Name]
 Version: 1.0.0
 License: MIT
 """
 
-from fastapi import FastAPI, HTTPException, Security
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query, Request, Security
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 from fastapi.security import APIKeyHeader
-from typing import Dict, List, Optional
+from enum import Enum
+from pydantic import BaseModel, Field
+from typing import AsyncIterator, Dict, List, Literal, Optional, Tuple, Union
+from contextlib import asynccontextmanager
+import asyncio
+import os
 import random
 import logging
+import secrets
+import time
 from datetime import datetime
 
+from access_log import AccessLog, AccessLogMiddleware
+from http_cache import cached_response, is_not_modified, not_modified_response
+from metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, Metrics, MetricsMiddleware
+from rate_limit import RateLimiter, RateLimitMiddleware, create_backend
+from snapshot import (LIST_CACHE_CONTROL, CacheableBody, EncodedBody, PreEncodedResponse, PreEncodedRoute,
+                      Snapshot, encode_batch, encode_json, http_date)
+from store import ContentStore
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -36,146 +59,688 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Start and stop the resources of one worker process.
+    
+    The content snapshot, rate limiter, access log and metrics registry are
+    created when this module is imported. Their connections, threads and
+    counters are set up lazily in each process, so they can be built once
+    in a parent process and shared by forked workers (see serve.py). This
+    runs in each worker: it starts the background tasks on startup and
+    flushes and closes everything on shutdown, after uvicorn has finished
+    the requests in flight.
+    """
+    logger.info("API starting up...")
+    # The content file may have changed since the content was preloaded
+    await asyncio.to_thread(store.reload_if_changed)
+    tasks = [
+        # Watch the content file for changes
+        asyncio.create_task(store.watch()),
+        # Measure event loop lag and share this worker's metrics
+        asyncio.create_task(metrics.run()),
+    ]
+    try:
+        yield
+    finally:
+        logger.info("API shutting down...")
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if metrics.directory is not None:
+            metrics.write_state(metrics.state())
+        rate_limiter.close()
+        await asyncio.to_thread(access_log.stop)
+        stats = access_log.stats()
+        if stats["dropped"]:
+            logger.warning(f"Access log dropped records: {stats['dropped']}")
+
 # Initialize FastAPI app with metadata
 app = FastAPI(
     title="Money Motivation API",
     description="An API for financial inspiration and side hustle ideas",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
-)
-
-# Data store - In a production environment, this would be in a database
-side_hustles: List[str] = [
-    "Freelancing - Start offering your skills online!",
-    "Dropshipping - Sell without handling inventory!",
-    "Stock Market - Invest and watch your money grow!",
-    "Affiliate Marketing - Earn by promoting products!",
-    "Crypto Trading - Buy and sell digital assets!",
-    "Online Courses - Share your knowledge and earn!",
-    "Print-on-Demand - Sell custom-designed products!",
-    "Blogging - Create content and earn through ads and sponsorships!",
-    "YouTube Channel - Monetize videos through ads and sponsorships!",
-    "Social Media Management - Manage accounts for brands and influencers!",
-    "App Development - Create mobile or web applications for businesses!",
-]
-
-money_quotes: List[str] = [
-    "The way to get started is to quit talking and begin doing. – Walt Disney",
-    "Formal education will make you a living; self-education will make you a fortune. – Jim Rohn",
-    "If you don't find a way to make money while you sleep, you will work until you die. – Warren Buffett",
-    "Do not save what is left after spending, but spend what is left after saving. – Warren Buffett",
-    "Money is a terrible master but an excellent servant. – P.T. Barnum",
-    "You must gain control over your money or the lack of it will forever control you. – Dave Ramsey",
-    "Opportunities don't happen. You create them. – Chris Grosser",
-    "Don't stay in bed unless you can make money in bed. – George Burns",
-    "Money often costs too much. – Ralph Waldo Emerson",
-    "Never depend on a single income. Make an investment to create a second source. – Warren Buffett",
-    "It's not about having lots of money. It's about knowing how to manage it. – Anonymous",
-    "Rich people have small TVs and big libraries, and poor people have small libraries and big TVs. – Zig Ziglar",
-    "Being rich is having money; being wealthy is having time. – Margaret Bonnano",
-    "A wise person should have money in their head, but not in their heart. – Jonathan Swift",
-    "Money grows on the tree of persistence. – Japanese Proverb",
-]
+    redoc_url="/redoc",
+    lifespan=lifespan
+)
+
+# Data store - the content lives in a JSON file that is watched for changes.
+# Every possible response body is encoded once per version of the content;
+# requests in flight keep the snapshot they started with.
+CONTENT_PATH = os.getenv("CONTENT_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "content.json"))
+store = ContentStore(CONTENT_PATH, poll_interval=float(os.getenv("CONTENT_POLL_INTERVAL", "2")))
+data = store.holder
+
+
+def publish_data(new_side_hustles: List[str], new_money_quotes: List[str]) -> Snapshot:
+    """
+    Replace the side hustles and money quotes served by the API.
+
+    The new content is written to the content file and published at once.
+
+    Args:
+        new_side_hustles: The new side hustle ideas
+        new_money_quotes: The new money quotes
+
+    Returns:
+        Snapshot: The newly published data snapshot
+    """
+    return store.replace(new_side_hustles, new_money_quotes)
+
+# Routes that serve pre-encoded bodies skip FastAPI's per-request
+# dependency resolution and serialization
+fast_router = APIRouter(route_class=PreEncodedRoute)
+
+# Maximum number of items in one batch response
+MAX_BATCH_COUNT = 100
+# Number of items sent per chunk on streaming endpoints
+STREAM_CHUNK_ITEMS = 16
+
+# Query parameters of the batch endpoints. Pre-encoded routes parse them
+# from the raw request, so they are documented here instead of in the signature
+BATCH_PARAMETERS = {
+    "parameters": [
+        {
+            "name": "count",
+            "in": "query",
+            "required": False,
+            "schema": {"type": "integer", "minimum": 1, "maximum": MAX_BATCH_COUNT},
+            "description": "Return a list of this many items instead of a single item",
+        },
+        {
+            "name": "unique",
+            "in": "query",
+            "required": False,
+            "schema": {"type": "boolean", "default": False},
+            "description": "Sample without replacement (at most every item once)",
+        },
+    ]
+}
+
+
+def parse_batch_params(request: Request) -> Tuple[Optional[int], bool]:
+    """
+    Read and validate the count and unique query parameters.
+
+    Args:
+        request: The incoming request
+
+    Returns:
+        The requested count (None for a single item) and whether to sample
+        without replacement
+
+    Raises:
+        HTTPException: 422 if a parameter is invalid
+    """
+    params = request.query_params
+    if not params:
+        return None, False
+
+    count = None
+    raw_count = params.get("count")
+    if raw_count is not None:
+        try:
+            count = int(raw_count)
+        except ValueError:
+            raise HTTPException(status_code=422, detail="count must be an integer")
+        if not 1 <= count <= MAX_BATCH_COUNT:
+            raise HTTPException(status_code=422, detail=f"count must be between 1 and {MAX_BATCH_COUNT}")
+
+    raw_unique = params.get("unique", "false").lower()
+    if raw_unique not in ("true", "false", "1", "0"):
+        raise HTTPException(status_code=422, detail="unique must be true or false")
+    return count, raw_unique in ("true", "1")
+
+
+def sample_batch(key: str, items_json: Tuple[bytes, ...], count: int, unique: bool) -> EncodedBody:
+    """
+    Sample items and assemble a batch response body.
+
+    Args:
+        key: The top-level key of the response
+        items_json: The pre-encoded items to sample from
+        count: The number of items requested
+        unique: Sample without replacement; the batch is then capped at the
+            number of available items
+
+    Returns:
+        EncodedBody: The batch response body
+    """
+    if unique:
+        batch = random.sample(items_json, min(count, len(items_json)))
+    else:
+        batch = random.choices(items_json, k=count)
+    return encode_batch(key, batch)
+
+
+async def stream_items(request: Request, bodies_of, count: Optional[int], fmt: str) -> AsyncIterator[bytes]:
+    """
+    Yield random items as NDJSON lines or Server-Sent Events.
+
+    Each chunk is taken from the current snapshot, so a long-lived stream
+    picks up newly published data. Nothing is buffered beyond one chunk;
+    the server only produces more when the client reads. The stream ends
+    as soon as the client disconnects.
+
+    Args:
+        request: The streaming request, checked for disconnects
+        bodies_of: Function returning the encoded bodies from a snapshot
+        count: The number of items to send, or None to stream until the
+            client disconnects
+        fmt: "ndjson" or "sse"
+
+    Yields:
+        bytes: Chunks of encoded items
+    """
+    prefix, suffix = (b"data: ", b"\n\n") if fmt == "sse" else (b"", b"\n")
+    remaining = count
+    while remaining is None or remaining > 0:
+        size = STREAM_CHUNK_ITEMS if remaining is None else min(remaining, STREAM_CHUNK_ITEMS)
+        bodies = random.choices(bodies_of(data.current), k=size)
+        yield b"".join(prefix + encoded.body + suffix for encoded in bodies)
+        if remaining is not None:
+            remaining -= size
+        # Sending doesn't always suspend (e.g. after a disconnect), so give
+        # other requests a turn and stop once the client has gone away
+        await asyncio.sleep(0)
+        if await request.is_disconnected():
+            return
+
+
+STREAM_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
 
 # API Key security (to be implemented)
 api_key_header = APIKeyHeader(name="X-API-Key")
 
+# Rate limiting: each client may make RATE_LIMIT_PER_SECOND requests per
+# second on average, with bursts of up to RATE_LIMIT_BURST. Clients sending a
+# known API key (ADMIN_API_KEY or one of the comma-separated RATE_LIMIT_API_KEYS)
+# are limited per key, all others per address. Set RATE_LIMIT_BACKEND=sqlite to
+# share the limits between worker processes.
+rate_limiter = RateLimiter(
+    rate=float(os.getenv("RATE_LIMIT_PER_SECOND", "10")),
+    burst=int(os.getenv("RATE_LIMIT_BURST", "20")),
+    backend=create_backend(
+        os.getenv("RATE_LIMIT_BACKEND", "memory"),
+        os.getenv("RATE_LIMIT_DB", "rate_limit.sqlite3")
+    ),
+    key_header=api_key_header.model.name,
+    api_keys=[os.getenv("ADMIN_API_KEY", ""), *(key.strip() for key in os.getenv("RATE_LIMIT_API_KEYS", "").split(","))],
+    exempt_paths={"/health", "/metrics", "/docs", "/redoc", "/openapi.json"}
+)
+app.add_middleware(RateLimitMiddleware, limiter=rate_limiter)
+
+# Metrics: request counts, statuses and latency per route, served at /metrics.
+# With several workers, set METRICS_DIR to an empty directory they share so
+# /metrics reports all of them. Added after the rate limiter to count 429s.
+metrics = Metrics(
+    directory=os.getenv("METRICS_DIR") or None,
+    flush_interval=float(os.getenv("METRICS_FLUSH_INTERVAL", "5"))
+)
+app.add_middleware(MetricsMiddleware, metrics=metrics)
+
+# Access logging: JSON lines written by a background thread to ACCESS_LOG_PATH
+# ("-" for stderr). ACCESS_LOG_SAMPLE_RATE sets the fraction of requests logged;
+# health checks are sampled more sparsely. Added last so it also logs 429s.
+access_log = AccessLog(
+    path=os.getenv("ACCESS_LOG_PATH", "-"),
+    sample_rates={"/health": 0.01, "/metrics": 0.01},
+    default_rate=float(os.getenv("ACCESS_LOG_SAMPLE_RATE", "1.0"))
+)
+app.add_middleware(AccessLogMiddleware, access_log=access_log)
+
+# The root response only changes with a new release, so caches may keep it
+ROOT_BODY = CacheableBody.build(
+    encode_json({
+        "message": "Hello World, Go to /side_hustles or /money_quotes to get a random side hustle or money quote",
+        "version": "1.0.0",
+        "documentation": "/docs"
+    }),
+    cache_control="public, max-age=3600",
+    last_modified=time.time()
+)
+
 @app.get("/", 
     response_model=Dict[str, str],
     summary="Root endpoint",
     description="Returns a welcome message and instructions for using the API"
 )
-async def read_root() -> Dict[str, str]:
+async def read_root(request: Request) -> PreEncodedResponse:
     """
     Root endpoint that provides API information and available routes.
     
+    Args:
+        request: The incoming request
+    
     Returns:
-        Dict[str, str]: Welcome message and instructions
+        Dict[str, str]: Welcome message and instructions (pre-encoded),
+        or 304 if the client's copy is current
     """
-    logger.info("Root endpoint accessed")
-    return {
-        "message": "Hello World, Go to /side_hustles or /money_quotes to get a random side hustle or money quote",
-        "version": "1.0.0",
-        "documentation": "/docs"
-    }
+    return cached_response(request, ROOT_BODY)
 
-@app.get("/side_hustles",
-    response_model=Dict[str, str],
+@fast_router.get("/side_hustles",
+    response_model=Dict[str, Union[str, List[str]]],
     summary="Get random side hustle",
-    description="Returns a random side hustle idea from the collection"
+    description="Returns a random side hustle idea from the collection, or a list of `count` ideas",
+    openapi_extra=BATCH_PARAMETERS
 )
-async def get_side_hustles() -> Dict[str, str]:
+async def get_side_hustles(request: Request) -> PreEncodedResponse:
     """
-    Returns a random side hustle idea.
+    Returns a random side hustle idea, or several with ?count=N.
+    
+    Args:
+        request: The incoming request
     
     Returns:
-        Dict[str, str]: Random side hustle suggestion
+        Dict[str, str]: Random side hustle suggestion (pre-encoded), or
+        {"side_hustles": [...]} when count is given
         
     Raises:
-        HTTPException: If the service is unavailable
+        HTTPException: If a parameter is invalid or the service is unavailable
     """
+    count, unique = parse_batch_params(request)
     try:
-        logger.info("Side hustle requested")
-        return {"side_hustle": random.choice(side_hustles)}
+        snapshot = data.current
+        if count is not None:
+            return PreEncodedResponse(sample_batch("side_hustles", snapshot.side_hustle_json, count, unique))
+        return PreEncodedResponse(random.choice(snapshot.side_hustle_bodies))
     except Exception as e:
         logger.error(f"Error getting side hustle: {str(e)}")
         raise HTTPException(status_code=500, detail="Service temporarily unavailable")
 
-@app.get("/money_quotes",
-    response_model=Dict[str, str],
+@fast_router.get("/money_quotes",
+    response_model=Dict[str, Union[str, List[str]]],
     summary="Get random money quote",
-    description="Returns a random inspirational quote about money"
+    description="Returns a random inspirational quote about money, or a list of `count` quotes",
+    openapi_extra=BATCH_PARAMETERS
 )
-async def get_money_quotes() -> Dict[str, str]:
+async def get_money_quotes(request: Request) -> PreEncodedResponse:
     """
-    Returns a random money-related quote.
+    Returns a random money-related quote, or several with ?count=N.
+    
+    Args:
+        request: The incoming request
     
     Returns:
-        Dict[str, str]: Random money quote
+        Dict[str, str]: Random money quote (pre-encoded), or
+        {"money_quotes": [...]} when count is given
         
     Raises:
-        HTTPException: If the service is unavailable
+        HTTPException: If a parameter is invalid or the service is unavailable
     """
+    count, unique = parse_batch_params(request)
     try:
-        logger.info("Money quote requested")
-        return {"money_quote": random.choice(money_quotes)}
+        snapshot = data.current
+        if count is not None:
+            return PreEncodedResponse(sample_batch("money_quotes", snapshot.money_quote_json, count, unique))
+        return PreEncodedResponse(random.choice(snapshot.money_quote_bodies))
     except Exception as e:
         logger.error(f"Error getting money quote: {str(e)}")
         raise HTTPException(status_code=500, detail="Service temporarily unavailable")
 
-# Startup event
-@app.on_event("startup")
-async def startup_event():
+@fast_router.get("/side_hustles/all",
+    response_model=Dict[str, List[str]],
+    summary="Get all side hustles",
+    description="Returns every side hustle idea. Supports ETag/If-None-Match and gzip or brotli compression"
+)
+async def get_all_side_hustles(request: Request) -> PreEncodedResponse:
     """
-    Initialize services and resources on startup.
+    Returns the full list of side hustle ideas.
+    
+    Args:
+        request: The incoming request
+    
+    Returns:
+        Dict[str, List[str]]: {"side_hustles": [...]} (precompressed when
+        the client accepts it), or 304 if the client's copy is current
     """
-    logger.info("API starting up...")
-    # Add initialization code here (database connections, cache setup, etc.)
+    return cached_response(request, data.current.side_hustle_list)
 
-# Shutdown event
-@app.on_event("shutdown")
-async def shutdown_event():
+@fast_router.get("/money_quotes/all",
+    response_model=Dict[str, List[str]],
+    summary="Get all money quotes",
+    description="Returns every money quote. Supports ETag/If-None-Match and gzip or brotli compression"
+)
+async def get_all_money_quotes(request: Request) -> PreEncodedResponse:
     """
-    Cleanup resources on shutdown.
+    Returns the full list of money quotes.
+    
+    Args:
+        request: The incoming request
+    
+    Returns:
+        Dict[str, List[str]]: {"money_quotes": [...]} (precompressed when
+        the client accepts it), or 304 if the client's copy is current
+    """
+    return cached_response(request, data.current.money_quote_list)
+
+@fast_router.get("/money_quotes/authors",
+    response_model=Dict[str, List[Dict[str, Union[str, int]]]],
+    summary="Get quote authors",
+    description="Returns every quoted author with their number of quotes, most quoted first"
+)
+async def get_money_quote_authors(request: Request) -> PreEncodedResponse:
     """
-    logger.info("API shutting down...")
-    # Add cleanup code here
+    Returns the authors of the money quotes, for filtering searches.
+    
+    Args:
+        request: The incoming request
+    
+    Returns:
+        Dict[str, List]: {"authors": [{"author": ..., "count": ...}]}, or 304
+        if the client's copy is current
+    """
+    return cached_response(request, data.current.money_quote_authors)
+
+app.include_router(fast_router)
+
+# Search limits: page size, and how deep results can be paged
+MAX_SEARCH_LIMIT = 50
+MAX_SEARCH_OFFSET = 1000
+MAX_QUERY_LENGTH = 200
+
+
+class QuoteResult(BaseModel):
+    """A money quote found by a search"""
+    quote: str
+    text: str
+    author: Optional[str]
+    score: float
+
+
+class QuoteSearchResponse(BaseModel):
+    """One page of quote search results"""
+    query: str
+    author: Optional[str]
+    total: int
+    # False when total is an estimate (large multi-word results)
+    total_exact: bool
+    offset: int
+    limit: int
+    results: List[QuoteResult]
+
+
+@app.get("/money_quotes/search",
+    response_model=QuoteSearchResponse,
+    summary="Search money quotes",
+    description="Finds quotes containing every word of `q`, optionally only by authors matching `author`, best matches first"
+)
+async def search_money_quotes(
+    request: Request,
+    response: Response,
+    q: str = Query("", max_length=MAX_QUERY_LENGTH, description="Words to search for in the quote and its author"),
+    author: Optional[str] = Query(None, max_length=MAX_QUERY_LENGTH, description="Full or partial author name, e.g. buffett"),
+    limit: int = Query(10, ge=1, le=MAX_SEARCH_LIMIT, description="Results per page"),
+    offset: int = Query(0, ge=0, le=MAX_SEARCH_OFFSET, description="Number of results to skip")
+) -> Union[Dict, Response]:
+    """
+    Searches the money quotes using the index of the current snapshot.
+    
+    Results only change when the content does, so they carry the snapshot's
+    ETag and can be revalidated with If-None-Match.
+    
+    Args:
+        request: The incoming request
+        response: The response, for the cache headers
+        q: Words that must all appear in the quote or its author
+        author: Only return quotes by authors whose names contain these words
+        limit: The maximum number of results
+        offset: The number of results to skip
+    
+    Returns:
+        QuoteSearchResponse: The total number of matches and one page of
+        results, or 304 if the client's copy is current
+        
+    Raises:
+        HTTPException: 422 if neither q nor author is given
+    """
+    if not q.strip() and not (author and author.strip()):
+        raise HTTPException(status_code=422, detail="Provide q, author or both")
+
+    snapshot = data.current
+    headers = {
+        "ETag": f'W/"{snapshot.digest}"',
+        "Last-Modified": http_date(snapshot.modified_at),
+        "Cache-Control": LIST_CACHE_CONTROL,
+    }
+    if is_not_modified(request, headers["ETag"].encode("latin-1"), snapshot.modified_at):
+        return not_modified_response(tuple((name.lower().encode("latin-1"), value.encode("latin-1"))
+                                           for name, value in headers.items()))
+
+    index = snapshot.quote_index
+    results = index.search(q, author, offset, limit)
+    response.headers.update(headers)
+    return {
+        "query": q,
+        "author": author,
+        "total": results.total,
+        "total_exact": results.total_exact,
+        "offset": offset,
+        "limit": limit,
+        "results": [
+            {
+                "quote": snapshot.money_quotes[quote_id],
+                "text": index.quotes[quote_id].text,
+                "author": index.quotes[quote_id].author,
+                "score": round(score, 4),
+            }
+            for quote_id, score in results.hits
+        ],
+    }
+
+@app.get("/stream/side_hustles",
+    response_class=StreamingResponse,
+    summary="Stream random side hustles",
+    description="Streams random side hustle ideas as NDJSON or Server-Sent Events"
+)
+async def stream_side_hustles(
+    request: Request,
+    count: Optional[int] = Query(None, ge=1, description="Number of items to send; omit to stream until you disconnect"),
+    format: Literal["ndjson", "sse"] = Query("ndjson", description="ndjson (one JSON object per line) or sse")
+) -> StreamingResponse:
+    """
+    Streams random side hustle ideas over one connection.
+    
+    Args:
+        request: The incoming request
+        count: Number of items to send, or None for an endless stream
+        format: The stream format, "ndjson" or "sse"
+    
+    Returns:
+        StreamingResponse: A stream of {"side_hustle": ...} objects
+    """
+    return StreamingResponse(
+        stream_items(request, lambda snapshot: snapshot.side_hustle_bodies, count, format),
+        media_type=STREAM_MEDIA_TYPES[format],
+        headers={"Cache-Control": "no-cache"}
+    )
+
+@app.get("/stream/money_quotes",
+    response_class=StreamingResponse,
+    summary="Stream random money quotes",
+    description="Streams random money quotes as NDJSON or Server-Sent Events"
+)
+async def stream_money_quotes(
+    request: Request,
+    count: Optional[int] = Query(None, ge=1, description="Number of items to send; omit to stream until you disconnect"),
+    format: Literal["ndjson", "sse"] = Query("ndjson", description="ndjson (one JSON object per line) or sse")
+) -> StreamingResponse:
+    """
+    Streams random money quotes over one connection.
+    
+    Args:
+        request: The incoming request
+        count: Number of items to send, or None for an endless stream
+        format: The stream format, "ndjson" or "sse"
+    
+    Returns:
+        StreamingResponse: A stream of {"money_quote": ...} objects
+    """
+    return StreamingResponse(
+        stream_items(request, lambda snapshot: snapshot.money_quote_bodies, count, format),
+        media_type=STREAM_MEDIA_TYPES[format],
+        headers={"Cache-Control": "no-cache"}
+    )
+
+# Admin endpoints - enabled when ADMIN_API_KEY is set; requests must send
+# the same key in the X-API-Key header
+ADMIN_API_KEY = os.getenv("ADMIN_API_KEY")
+# Maximum length of a side hustle or quote
+MAX_ENTRY_LENGTH = 500
+
+
+class ContentKind(str, Enum):
+    """The collections that can be edited through the admin endpoints"""
+    side_hustles = "side_hustles"
+    money_quotes = "money_quotes"
+
+
+class ContentEntry(BaseModel):
+    """A side hustle or money quote"""
+    text: str = Field(..., min_length=1, max_length=MAX_ENTRY_LENGTH,
+                      description="The entry, e.g. \"Money grows on the tree of persistence. – Japanese Proverb\"")
+
+
+def require_admin(api_key: str = Security(api_key_header)) -> None:
+    """
+    Check the admin API key.
+
+    Raises:
+        HTTPException: 503 if admin endpoints are disabled, 403 if the key is wrong
+    """
+    if not ADMIN_API_KEY:
+        raise HTTPException(status_code=503, detail="Admin endpoints are disabled")
+    if not secrets.compare_digest(api_key.encode(), ADMIN_API_KEY.encode()):
+        raise HTTPException(status_code=403, detail="Invalid API key")
+
+
+def content_change(action: str, kind: ContentKind, text: str, snapshot: Snapshot) -> Dict[str, Union[str, int]]:
+    return {
+        "status": action,
+        "kind": kind.value,
+        "text": text,
+        "version": snapshot.version,
+        "count": len(getattr(snapshot, kind.value)),
+    }
+
+
+@app.post("/admin/{kind}",
+    status_code=201,
+    dependencies=[Depends(require_admin)],
+    summary="Add an entry",
+    description="Adds a side hustle or money quote and publishes it immediately"
+)
+def add_entry(kind: ContentKind, entry: ContentEntry) -> Dict[str, Union[str, int]]:
+    """
+    Adds an entry to the content store.
+    
+    Args:
+        kind: The collection to add to
+        entry: The entry to add
+    
+    Returns:
+        Dict[str, Union[str, int]]: The change and the new content version
+        
+    Raises:
+        HTTPException: 409 if the entry already exists
+    """
+    text = entry.text.strip()
+    try:
+        snapshot = store.add(kind.value, text)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    logger.info(f"Added to {kind.value} (version {snapshot.version})")
+    return content_change("added", kind, text, snapshot)
+
+
+@app.delete("/admin/{kind}",
+    dependencies=[Depends(require_admin)],
+    summary="Remove an entry",
+    description="Removes a side hustle or money quote and publishes the change immediately"
+)
+def remove_entry(
+    kind: ContentKind,
+    text: str = Query(..., min_length=1, max_length=MAX_ENTRY_LENGTH, description="The exact entry to remove")
+) -> Dict[str, Union[str, int]]:
+    """
+    Removes an entry from the content store.
+    
+    Args:
+        kind: The collection to remove from
+        text: The exact entry to remove
+    
+    Returns:
+        Dict[str, Union[str, int]]: The change and the new content version
+        
+    Raises:
+        HTTPException: 404 if the entry doesn't exist, 409 if it is the last one
+    """
+    try:
+        snapshot = store.remove(kind.value, text)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Entry not found")
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    logger.info(f"Removed from {kind.value} (version {snapshot.version})")
+    return content_change("removed", kind, text, snapshot)
+
+# Event loop lag (seconds) above which the API reports itself as degraded
+MAX_HEALTHY_LOOP_LAG = float(os.getenv("MAX_HEALTHY_LOOP_LAG", "0.25"))
 
 # Health check endpoint
 @app.get("/health",
-    response_model=Dict[str, str],
+    response_model=Dict[str, Union[str, float]],
     summary="Health check",
-    description="Returns the health status of the API"
+    description="Returns the health status of the API, its event loop lag and the age of the served content"
 )
-async def health_check() -> Dict[str, str]:
+async def health_check(request: Request) -> Response:
     """
     Health check endpoint for monitoring.
     
+    The status is "degraded" while the event loop runs timers more than
+    MAX_HEALTHY_LOOP_LAG seconds late. The ETag changes with the status and
+    the content version, so monitors can poll with If-None-Match and get 304
+    while nothing changed.
+    
+    Args:
+        request: The incoming request
+    
     Returns:
-        Dict[str, str]: Health status and timestamp
+        Dict[str, Union[str, float]]: Health status, event loop lag, content
+        version and snapshot age, and timestamp
     """
-    return {
-        "status": "healthy",
+    snapshot = data.current
+    status = "healthy" if metrics.loop_lag <= MAX_HEALTHY_LOOP_LAG else "degraded"
+    etag = f'W/"{status}-{snapshot.digest}"'.encode("latin-1")
+    headers = ((b"etag", etag), (b"cache-control", b"no-cache"))
+    if is_not_modified(request, etag):
+        return not_modified_response(headers)
+
+    response = JSONResponse({
+        "status": status,
+        "event_loop_lag_ms": round(metrics.loop_lag * 1000, 3),
+        "content_version": snapshot.digest,
+        "snapshot_age_seconds": round(snapshot.age, 3),
         "timestamp": datetime.utcnow().isoformat()
-    }
\ No newline at end of file
+    })
+    response.raw_headers.extend(headers)
+    return response
+
+# Metrics endpoint
+@app.get("/metrics",
+    response_class=PlainTextResponse,
+    summary="Metrics",
+    description="Returns request counts, statuses and latency histograms in Prometheus text format"
+)
+async def get_metrics() -> Response:
+    """
+    Metrics endpoint for Prometheus.
+    
+    Returns:
+        Response: The metrics of all workers in Prometheus text format
+    """
+    state = metrics.state()
+    body = await asyncio.to_thread(metrics.render, state)
+    return Response(body, media_type=METRICS_CONTENT_TYPE)
@@ -0,0 +1,222 @@
+"""
+Access Logging for the Money Motivation API
+==========================================
+
+Structured (JSON lines) access logging that stays off the request path.
+
+The middleware only times the request, decides whether to sample it and
+puts a small tuple on a bounded queue. A background thread formats the
+records and writes them in batches, so requests never wait for JSON
+encoding or I/O. If the writer falls behind and the queue is full, records
+are dropped and counted instead of slowing requests down.
+
+Sampling rates are set per route template (e.g. "/money_quotes"), so noisy
+endpoints like health checks can be logged at a fraction of their traffic.
+Each record includes the rate it was sampled at, so totals can be
+reconstructed by weighting each record with 1 / sample_rate.
+
+Version: 1.0.0
+License: MIT
+"""
+
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Mapping, Optional
+
+# Maximum number of records waiting to be written
+DEFAULT_QUEUE_SIZE = 10_000
+# Maximum number of records written per batch
+WRITE_BATCH_SIZE = 256
+# Route names used for requests that never reached a route
+UNMATCHED_ROUTE = "<unmatched>"
+RATE_LIMITED_ROUTE = "<rate_limited>"
+
+_STOP = object()
+
+
+def route_label(scope, status: int) -> str:
+    """
+    Name the route that handled a request, for logs and metrics.
+
+    Uses the route template (e.g. "/admin/{kind}") rather than the path, so
+    the number of distinct labels stays bounded.
+    """
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    return RATE_LIMITED_ROUTE if status == 429 else UNMATCHED_ROUTE
+
+
+class AccessLog:
+    """
+    A sampled access log with a background writer.
+
+    Args:
+        path: File to append to, or "-" for standard error
+        sample_rates: Route template -> fraction of requests to log (0-1)
+        default_rate: Sampling rate for routes not in sample_rates
+        queue_size: Maximum number of records waiting to be written
+    """
+
+    def __init__(self, path: str = "-", sample_rates: Optional[Mapping[str, float]] = None,
+                 default_rate: float = 1.0, queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.path = path
+        self.sample_rates = dict(sample_rates or {})
+        self.default_rate = default_rate
+        self.enabled = True
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._pid = 0
+
+        # Counters, per route template
+        self.requests: Dict[str, int] = {}
+        self.dropped: Dict[str, int] = {}
+        self.written = 0
+
+    def _ensure_writer(self) -> None:
+        # Threads don't survive fork, so each worker process starts its own
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._queue = queue.Queue(maxsize=self._queue.maxsize)
+            self._thread = threading.Thread(target=self._write_loop, name="access-log-writer", daemon=True)
+            self._thread.start()
+
+    def record(self, route: str, method: str, path: str, status: int, duration: float,
+               client: Optional[tuple]) -> None:
+        """
+        Count a request and queue a log record if it is sampled.
+
+        Called on the event loop for every request; it never blocks.
+
+        Args:
+            route: The matched route template
+            method: The HTTP method
+            path: The request path
+            status: The response status code
+            duration: Seconds spent handling the request
+            client: The (host, port) of the client, if known
+        """
+        requests = self.requests
+        requests[route] = requests.get(route, 0) + 1
+
+        rate = self.sample_rates.get(route, self.default_rate)
+        if rate < 1.0 and random.random() >= rate:
+            return
+
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait((time.time(), route, method, path, status, duration,
+                                    client[0] if client else None, rate))
+        except queue.Full:
+            self.dropped[route] = self.dropped.get(route, 0) + 1
+
+    def _open(self):
+        if self.path == "-":
+            return sys.stderr, False
+        return open(self.path, "a", encoding="utf-8", buffering=1 << 16), True
+
+    def _write_loop(self) -> None:
+        stream, owned = self._open()
+        q = self._queue
+        try:
+            while True:
+                batch = [q.get()]
+                while len(batch) < WRITE_BATCH_SIZE:
+                    try:
+                        batch.append(q.get_nowait())
+                    except queue.Empty:
+                        break
+
+                stop = any(item is _STOP for item in batch)
+                lines = [format_record(item) for item in batch if item is not _STOP]
+                if lines:
+                    stream.write("".join(lines))
+                    stream.flush()
+                    self.written += len(lines)
+                if stop:
+                    return
+        finally:
+            if owned:
+                stream.close()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Write the queued records and stop the writer thread.
+
+        Args:
+            timeout: Seconds to wait for the writer to finish
+        """
+        if self._thread is None or self._pid != os.getpid():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+        self._thread = None
+        self._pid = 0
+
+    def stats(self) -> dict:
+        """Return the request, drop and write counters"""
+        return {
+            "requests": dict(self.requests),
+            "dropped": dict(self.dropped),
+            "queued": self._queue.qsize(),
+            "written": self.written,
+        }
+
+
+def format_record(item: tuple) -> str:
+    """Format a queued record as one JSON line"""
+    timestamp, route, method, path, status, duration, client, rate = item
+    return json.dumps({
+        "time": datetime.fromtimestamp(timestamp, timezone.utc).isoformat(timespec="milliseconds"),
+        "client": client,
+        "method": method,
+        "path": path,
+        "route": route,
+        "status": status,
+        "duration_ms": round(duration * 1000, 3),
+        "sample_rate": rate,
+    }, separators=(",", ":")) + "\n"
+
+
+class AccessLogMiddleware:
+    """
+    ASGI middleware that feeds an AccessLog.
+
+    Add it last, so it is the outermost middleware and also sees requests
+    that other middleware (like the rate limiter) answer themselves.
+    """
+
+    def __init__(self, app, access_log: AccessLog):
+        self.app = app
+        self.access_log = access_log
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.access_log.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.access_log.record(
+                route_label(scope, status), scope["method"], scope["path"], status,
+                time.perf_counter() - start, scope.get("client"),
+            )
@@ -0,0 +1,430 @@
+"""
+Money Motivation API Benchmark
+=============================
+
+Measures in-process request throughput for the random item endpoints. The
+ASGI app is called directly with a minimal scope, so the numbers reflect the
+framework and handler cost without any client or network overhead.
+
+Suites:
+- "serialization" compares two apps:
+  - "baseline": the original handlers, which build a dict per request and let
+    FastAPI validate it against the response model and JSON-encode it
+  - "current": the real app from Fastapi.py, which serves pre-encoded bodies
+- "rate-limit" runs the real app with the rate limiter disabled and with each
+  backend, using limits high enough that nothing is rejected, and reports the
+  per-request overhead of the limiter
+- "access-log" runs the real app without access logging, with a synchronous
+  logger.info call per request (what the handlers used to do) and with the
+  queued background access log, both writing to a temporary file
+- "metrics" runs the real app with and without the metrics middleware
+- "workers" starts serve.py with an increasing number of worker processes
+  and loads it over real HTTP connections from several client processes,
+  to show how throughput scales with the number of cores used
+- "search" builds quote indexes over synthetic corpora of increasing size
+  and times typical searches on each, to show that search latency stays
+  flat as the corpus grows
+
+Logging, access logging, metrics and rate limiting are disabled unless a suite is
+measuring them, so that the apps are measured on their response path alone.
+
+Usage:
+    python benchmark.py --requests 20000 --concurrency 50
+    python benchmark.py --suite rate-limit
+    python benchmark.py --suite access-log
+    python benchmark.py --suite metrics
+    python benchmark.py --suite workers --workers 1 2 4 --duration 10
+    python benchmark.py --suite search --corpus-sizes 1000 10000 100000 300000
+
+Version: 1.0.0
+License: MIT
+"""
+
+import argparse
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, Sequence, Tuple
+
+from fastapi import FastAPI
+
+import Fastapi
+from loadtest import QUIET_ENV, free_port, wait_for_server
+from rate_limit import MemoryBackend, SQLiteBackend
+from search import QuoteIndex
+
+DEFAULT_PATHS = ("/side_hustles", "/money_quotes")
+# Distinct client addresses used in the rate limit suite
+RATE_LIMIT_CLIENTS = 1_000
+
+
+def build_baseline_app() -> FastAPI:
+    """
+    Build an app with the original per-request serialization.
+
+    Returns:
+        FastAPI: An app serving the same data as Fastapi.app
+    """
+    baseline = FastAPI()
+    snapshot = Fastapi.data.current
+
+    @baseline.get("/side_hustles", response_model=Dict[str, str])
+    async def get_side_hustles() -> Dict[str, str]:
+        return {"side_hustle": random.choice(snapshot.side_hustles)}
+
+    @baseline.get("/money_quotes", response_model=Dict[str, str])
+    async def get_money_quotes() -> Dict[str, str]:
+        return {"money_quote": random.choice(snapshot.money_quotes)}
+
+    return baseline
+
+
+def _request_scope(path: str, client_host: str = "127.0.0.1") -> dict:
+    return {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"bench")],
+        "client": (client_host, 50000),
+        "server": ("bench", 80),
+    }
+
+
+async def call_app(app, scope: dict) -> int:
+    """
+    Run one request through an ASGI app.
+
+    Args:
+        app: The ASGI app
+        scope: The HTTP connection scope
+
+    Returns:
+        int: The response status code
+    """
+    status = 0
+
+    async def receive() -> dict:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(dict(scope), receive, send)
+    return status
+
+
+async def measure_rps(app, paths: Sequence[str], requests: int, concurrency: int,
+                      clients: int = 1) -> float:
+    """
+    Send requests to an ASGI app and measure the throughput.
+
+    Args:
+        app: The ASGI app to benchmark
+        paths: The paths to request, in rotation
+        requests: The total number of requests
+        concurrency: The number of concurrent client tasks
+        clients: The number of distinct client addresses to send from
+
+    Returns:
+        float: Requests per second
+    """
+    scopes = [_request_scope(path, f"10.0.{i // 256}.{i % 256}")
+              for i in range(clients) for path in paths]
+    # Warm up routing and any lazily created state
+    for scope in scopes:
+        status = await call_app(app, scope)
+        if status != 200:
+            raise RuntimeError(f"{scope['path']} returned {status}")
+
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await call_app(app, scopes[remaining % len(scopes)])
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - start)
+
+
+def run_serialization_suite(args) -> None:
+    results = {}
+    for name, app in (("baseline", build_baseline_app()), ("current", Fastapi.app)):
+        results[name] = asyncio.run(measure_rps(app, args.paths, args.requests, args.concurrency))
+        print(f"{name:>8}: {results[name]:10,.0f} req/s")
+    print(f"speedup: {results['current'] / results['baseline']:.2f}x")
+
+
+def run_rate_limit_suite(args) -> None:
+    limiter = Fastapi.rate_limiter
+    limiter.rejected = 0
+    # High enough that no request is rejected; we only measure the overhead
+    limiter.rate = limiter.burst = 1e9
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backends = (
+            ("disabled", None),
+            ("memory", MemoryBackend()),
+            ("sqlite", SQLiteBackend(os.path.join(tmp, "rate_limit.sqlite3"))),
+        )
+        baseline = None
+        for name, backend in backends:
+            limiter.enabled = backend is not None
+            if backend is not None:
+                limiter.backend = backend
+            rps = asyncio.run(measure_rps(Fastapi.app, args.paths, args.requests, args.concurrency,
+                                          clients=RATE_LIMIT_CLIENTS))
+            if baseline is None:
+                baseline = rps
+                print(f"{name:>8}: {rps:10,.0f} req/s")
+            else:
+                overhead = (1 / rps - 1 / baseline) * 1e6
+                print(f"{name:>8}: {rps:10,.0f} req/s  ({overhead:+.1f} µs/request)")
+            if backend is not None:
+                backend.close()
+        print(f"rejected requests: {limiter.rejected}")
+
+
+def sync_logging_app(app, log_path: str):
+    """Wrap an app so every request makes a synchronous logger.info call"""
+    request_logger = logging.getLogger("benchmark.sync")
+    request_logger.propagate = False
+    handler = logging.FileHandler(log_path)
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    request_logger.addHandler(handler)
+    request_logger.setLevel(logging.INFO)
+
+    async def logged(scope, receive, send):
+        request_logger.info("Money quote requested")
+        await app(scope, receive, send)
+
+    return logged
+
+
+def run_access_log_suite(args) -> None:
+    logging.disable(logging.NOTSET)
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline = None
+        for name in ("disabled", "sync", "queued"):
+            app = Fastapi.app
+            if name == "sync":
+                app = sync_logging_app(app, os.path.join(tmp, "sync.log"))
+            elif name == "queued":
+                # The writer thread opens the path when the first record arrives
+                Fastapi.access_log.path = os.path.join(tmp, "access.log")
+                Fastapi.access_log.enabled = True
+
+            rps = asyncio.run(measure_rps(app, args.paths, args.requests, args.concurrency))
+            if baseline is None:
+                baseline = rps
+                print(f"{name:>8}: {rps:10,.0f} req/s")
+            else:
+                overhead = (1 / rps - 1 / baseline) * 1e6
+                print(f"{name:>8}: {rps:10,.0f} req/s  ({overhead:+.1f} µs/request)")
+        Fastapi.access_log.stop()
+        print(f"queued log: {Fastapi.access_log.written:,} written, dropped {Fastapi.access_log.dropped}")
+
+
+def run_metrics_suite(args) -> None:
+    baseline = None
+    for name in ("disabled", "enabled"):
+        Fastapi.metrics.enabled = name == "enabled"
+        rps = asyncio.run(measure_rps(Fastapi.app, args.paths, args.requests, args.concurrency))
+        if baseline is None:
+            baseline = rps
+            print(f"{name:>8}: {rps:10,.0f} req/s")
+        else:
+            overhead = (1 / rps - 1 / baseline) * 1e6
+            print(f"{name:>8}: {rps:10,.0f} req/s  ({overhead:+.1f} µs/request)")
+    counted = sum(Fastapi.metrics.requests.values())
+    print(f"requests counted: {counted:,}")
+
+
+async def _http_connection(port: int, requests: Sequence[bytes], deadline: float) -> Tuple[int, int]:
+    """Send requests over one keep-alive connection until the deadline"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    ok = errors = 0
+    i = 0
+    try:
+        while time.perf_counter() < deadline:
+            writer.write(requests[i % len(requests)])
+            i += 1
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line[:15].lower() == b"content-length:":
+                    length = int(line[15:])
+            await reader.readexactly(length)
+            if head[9:12] == b"200":
+                ok += 1
+            else:
+                errors += 1
+    finally:
+        writer.close()
+    return ok, errors
+
+
+def http_load(port: int, paths: Sequence[str], duration: float, connections: int) -> Tuple[int, int]:
+    """
+    Load a server from one process over several keep-alive connections.
+
+    Uses a minimal HTTP/1.1 client instead of httpx, so a client process can
+    produce several times more requests per second.
+
+    Args:
+        port: The server's port on 127.0.0.1
+        paths: The paths to request, in rotation
+        duration: Seconds to run
+        connections: Number of concurrent connections
+
+    Returns:
+        (successful, failed) request counts
+    """
+    requests = [f"GET {path} HTTP/1.1\r\nHost: bench\r\n\r\n".encode() for path in paths]
+
+    async def run() -> Tuple[int, int]:
+        deadline = time.perf_counter() + duration
+        results = await asyncio.gather(*(_http_connection(port, requests, deadline)
+                                         for _ in range(connections)))
+        return sum(ok for ok, _ in results), sum(errors for _, errors in results)
+
+    return asyncio.run(run())
+
+
+def run_workers_suite(args) -> None:
+    env = dict(os.environ, **QUIET_ENV)
+    serve_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "serve.py")
+    clients = args.client_processes
+    print(f"{os.cpu_count()} CPU cores, {clients} client processes x {args.concurrency} connections")
+
+    baseline = None
+    for workers in args.workers:
+        port = free_port()
+        server = subprocess.Popen(
+            [sys.executable, serve_path, "--workers", str(workers), "--port", str(port)],
+            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_for_server(port)
+            # Give every worker time to finish starting up
+            time.sleep(1 + 0.2 * workers)
+            with multiprocessing.Pool(clients) as pool:
+                results = pool.starmap(http_load, [(port, args.paths, args.duration, args.concurrency)] * clients)
+        finally:
+            server.send_signal(signal.SIGTERM)
+            server.wait()
+
+        ok = sum(result[0] for result in results)
+        errors = sum(result[1] for result in results)
+        rps = ok / args.duration
+        if baseline is None:
+            baseline = rps
+        print(f"{workers:>3} workers: {rps:10,.0f} req/s  ({rps / baseline:.2f}x)"
+              + (f"  {errors} errors" if errors else ""))
+
+
+def synthetic_quotes(count: int, seed: int = 0) -> list:
+    """
+    Generate "text – Author" quotes with a realistic word distribution.
+
+    Word and author frequencies follow Zipf's law, as in real text: a few
+    words (like "money", the most common one) appear in many quotes and
+    most words in few.
+    """
+    rng = random.Random(seed)
+    vocabulary = ["money"] + [f"word{i}" for i in range(1, 20_000)]
+    word_weights = list(itertools.accumulate(1 / rank for rank in range(1, len(vocabulary) + 1)))
+    authors = [f"Author{i} Surname{i % 97}" for i in range(5_000)]
+    author_weights = list(itertools.accumulate(1 / rank for rank in range(1, len(authors) + 1)))
+    quotes = []
+    for _ in range(count):
+        words = rng.choices(vocabulary, cum_weights=word_weights, k=rng.randint(6, 20))
+        author = rng.choices(authors, cum_weights=author_weights)[0]
+        quotes.append(f"{' '.join(words).capitalize()}. – {author}")
+    return quotes
+
+
+# (label, query, author) searched on every corpus in the search suite
+SEARCH_QUERIES = (
+    ("common word", "money", None),
+    ("rare word", "word5000", None),
+    ("two words", "money word10", None),
+    ("author", "", "author3"),
+    ("word + author", "money", "author3"),
+)
+
+
+def run_search_suite(args) -> None:
+    labels = [label for label, _, _ in SEARCH_QUERIES]
+    print(f"{'quotes':>9}{'build s':>9}" + "".join(f"{label:>15}" for label in labels) + "   (µs/search)")
+    for size in args.corpus_sizes:
+        quotes = synthetic_quotes(size)
+        start = time.perf_counter()
+        index = QuoteIndex(quotes)
+        build = time.perf_counter() - start
+
+        timings = []
+        for _, query, author in SEARCH_QUERIES:
+            index.search(query, author)
+            start = time.perf_counter()
+            for _ in range(args.searches):
+                index.search(query, author)
+            timings.append((time.perf_counter() - start) / args.searches * 1e6)
+        print(f"{size:>9,}{build:>9.2f}" + "".join(f"{timing:>15.1f}" for timing in timings))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the Money Motivation API in-process")
+    parser.add_argument("--suite", choices=("serialization", "rate-limit", "access-log", "metrics", "workers", "search"), default="serialization",
+                        help="What to compare")
+    parser.add_argument("--requests", type=int, default=20_000, help="Requests per run")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent client tasks")
+    parser.add_argument("--paths", nargs="+", default=list(DEFAULT_PATHS), help="Paths to request")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4],
+                        help="Worker counts to compare (workers suite)")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per run (workers suite)")
+    parser.add_argument("--client-processes", type=int, default=os.cpu_count() or 1,
+                        help="Load generating processes (workers suite)")
+    parser.add_argument("--corpus-sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 300_000],
+                        help="Numbers of quotes to index (search suite)")
+    parser.add_argument("--searches", type=int, default=2_000, help="Searches per query and corpus (search suite)")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    Fastapi.rate_limiter.enabled = False
+    Fastapi.access_log.enabled = False
+    Fastapi.metrics.enabled = False
+    if args.suite == "serialization":
+        run_serialization_suite(args)
+    elif args.suite == "rate-limit":
+        run_rate_limit_suite(args)
+    elif args.suite == "metrics":
+        run_metrics_suite(args)
+    elif args.suite == "workers":
+        run_workers_suite(args)
+    elif args.suite == "search":
+        run_search_suite(args)
+    else:
+        run_access_log_suite(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+HTTP Caching for the Money Motivation API
+========================================
+
+Serves CacheableBody responses (see snapshot.py) with conditional request
+handling and content negotiation:
+
+- If-None-Match / If-Modified-Since: when the client's copy is still current,
+  a 304 Not Modified is sent without a body. If-None-Match takes precedence,
+  as RFC 9110 requires.
+- Accept-Encoding: the client's preferred coding among the precompressed
+  variants is sent; nothing is compressed per request.
+
+Version: 1.0.0
+License: MIT
+"""
+
+from email.utils import parsedate_to_datetime
+from typing import Optional, Sequence
+
+from starlette.requests import Request
+
+from snapshot import CacheableBody, EncodedBody, PreEncodedResponse, RawHeaders
+
+
+def etag_matches(if_none_match: str, etag: bytes) -> bool:
+    """
+    Check an If-None-Match header against an ETag.
+
+    Uses weak comparison, so W/"x" and "x" match.
+
+    Args:
+        if_none_match: The header value, e.g. 'W/"a1", "b2"' or '*'
+        etag: The current ETag
+
+    Returns:
+        bool: True if the client's copy matches
+    """
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.decode("latin-1").removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def not_modified_since(if_modified_since: str, last_modified: float) -> bool:
+    """
+    Check an If-Modified-Since header against a modification time.
+
+    Args:
+        if_modified_since: The header value, an HTTP date
+        last_modified: When the content last changed (Unix time)
+
+    Returns:
+        bool: True if the content hasn't changed since that date; False
+        if it has or the date can't be parsed
+    """
+    try:
+        since = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+    # HTTP dates have whole-second precision
+    return int(last_modified) <= since
+
+
+def is_not_modified(request: Request, etag: bytes, last_modified: Optional[float] = None) -> bool:
+    """
+    Decide whether a GET can be answered with 304 Not Modified.
+
+    Args:
+        request: The incoming request
+        etag: The current ETag
+        last_modified: When the content last changed, if known
+
+    Returns:
+        bool: True if the client's cached copy is still current
+    """
+    headers = request.headers
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since is not None and last_modified is not None:
+        return not_modified_since(if_modified_since, last_modified)
+    return False
+
+
+def choose_encoding(accept_encoding: str, offered: Sequence[str]) -> Optional[str]:
+    """
+    Pick a content coding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: The header value, e.g. "gzip, deflate, br;q=0.9"
+        offered: The available codings, in the server's order of preference
+
+    Returns:
+        The coding to use, or None to send the body uncompressed
+    """
+    weights = {}
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding.strip()] = q
+
+    best, best_q = None, 0.0
+    wildcard = weights.get("*", 0.0)
+    for coding in offered:
+        q = weights.get(coding, wildcard)
+        # Ties go to the server's preference, which comes first
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def not_modified_response(headers: RawHeaders) -> PreEncodedResponse:
+    """Build a bodiless 304 response with the given validator headers"""
+    return PreEncodedResponse(EncodedBody(b"", headers), status_code=304)
+
+
+def cached_response(request: Request, cacheable: CacheableBody) -> PreEncodedResponse:
+    """
+    Serve a CacheableBody.
+
+    Args:
+        request: The incoming request
+        cacheable: The body and its variants
+
+    Returns:
+        PreEncodedResponse: 304 if the client's copy is current, otherwise the
+        best variant the client accepts
+    """
+    if is_not_modified(request, cacheable.etag, cacheable.last_modified):
+        return not_modified_response(cacheable.not_modified_headers)
+
+    if cacheable.compressed:
+        accept_encoding = request.headers.get("accept-encoding")
+        if accept_encoding:
+            coding = choose_encoding(accept_encoding, [coding for coding, _ in cacheable.compressed])
+            for offered, encoded in cacheable.compressed:
+                if offered == coding:
+                    return PreEncodedResponse(encoded)
+    return PreEncodedResponse(cacheable.identity)
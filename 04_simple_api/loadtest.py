@@ -0,0 +1,394 @@
+"""
+Money Motivation API Load Test
+=============================
+
+Drives the API with concurrent clients for a fixed time and reports the
+throughput and latency percentiles, overall and per endpoint.
+
+Targets:
+- "asgi": the app from Fastapi.py in this process, through httpx's ASGI
+  transport (no network; measures the app and framework)
+- "uvicorn": a uvicorn server started on a free local port (the whole HTTP
+  stack). With --server-workers above 1, serve.py is started instead
+
+Each client task has its own httpx client and keep-alive connection (a
+shared connection pool becomes the bottleneck with many tasks). It picks
+its next path from a weighted request mix, e.g.
+"--mix /=1 /side_hustles=4 /money_quotes=4 /health=1", waits for the
+response and repeats until the test ends. Requests sent during the warm-up
+are not counted.
+
+The results are saved as JSON together with the git commit they were
+measured at. Pass an earlier result file to --compare to see the change;
+with --max-regression the command fails when throughput drops or p99
+latency rises by more than the given percentage, so it can guard CI runs.
+
+Rate limiting, access logging and (for the asgi target) all logging in this
+process are switched off, so they don't skew the numbers.
+
+Usage:
+    python loadtest.py --target asgi --concurrency 20 --duration 10
+    python loadtest.py --target uvicorn --mix /money_quotes=1 --output before.json
+    python loadtest.py --target uvicorn --compare before.json --max-regression 10
+
+Version: 1.0.0
+License: MIT
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import os
+import platform
+import random
+import signal
+import socket
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import AsyncIterator, Callable, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MIX = ("/=1", "/side_hustles=4", "/money_quotes=4", "/health=1")
+RESULTS_DIR = os.path.join(HERE, "loadtest_results")
+PERCENTILES = (50, 95, 99)
+
+ClientFactory = Callable[[], httpx.AsyncClient]
+# Environment that switches off rate limiting and access logging
+QUIET_ENV = {"RATE_LIMIT_PER_SECOND": "1e9", "RATE_LIMIT_BURST": "1000000000", "ACCESS_LOG_SAMPLE_RATE": "0"}
+
+
+def free_port() -> int:
+    """Return a TCP port on 127.0.0.1 that is currently free"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_server(port: int, timeout: float = 30.0) -> None:
+    """
+    Wait until a server accepts connections on 127.0.0.1.
+
+    Raises:
+        RuntimeError: If it doesn't within the timeout
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server on port {port} did not start")
+
+
+def parse_mix(items: Sequence[str]) -> Dict[str, float]:
+    """
+    Parse a request mix.
+
+    Args:
+        items: "path=weight" strings; a path without a weight counts 1.
+            A path with a query string takes its weight after the last
+            parameter, e.g. "/side_hustles?count=5=4"
+
+    Returns:
+        Dict[str, float]: Path -> relative weight
+
+    Raises:
+        ValueError: If a weight isn't a positive number
+    """
+    mix = {}
+    for item in items:
+        path, separator, weight = item.rpartition("=")
+        _, question, query = path.partition("?")
+        if not separator or (question and "=" not in query.rpartition("&")[2]):
+            # No weight: an "=" in the query string joins a parameter to its value
+            path, weight = item, "1"
+        try:
+            mix[path] = float(weight)
+        except ValueError:
+            raise ValueError(f"Weight of {path} must be a number, not {weight!r}")
+        if mix[path] <= 0:
+            raise ValueError(f"Weight of {path} must be positive")
+    return mix
+
+
+def percentile(sorted_values: Sequence[float], p: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: List[float], errors: int, duration: float) -> dict:
+    """
+    Summarize the latencies of one endpoint or of all of them.
+
+    Args:
+        latencies: Seconds per successful request
+        errors: The number of failed requests
+        duration: The measured seconds
+
+    Returns:
+        dict: Request counts, requests per second and latencies in ms
+    """
+    values = sorted(latencies)
+    summary = {
+        "requests": len(values),
+        "errors": errors,
+        "rps": round(len(values) / duration, 1),
+        "latency_ms": {
+            "mean": round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+            "max": round(values[-1] * 1000, 3) if values else 0.0,
+        },
+    }
+    for p in PERCENTILES:
+        summary["latency_ms"][f"p{p}"] = round(percentile(values, p) * 1000, 3)
+    return summary
+
+
+class LoadTest:
+    """
+    Concurrent clients sending a weighted request mix.
+
+    Args:
+        make_client: Creates the client for one task
+        mix: Path -> relative weight
+        concurrency: The number of client tasks
+        seed: Seed for the request mix, so runs send the same sequence
+    """
+
+    def __init__(self, make_client: ClientFactory, mix: Dict[str, float], concurrency: int, seed: int = 0):
+        self.make_client = make_client
+        self.paths = list(mix)
+        total = 0.0
+        self.cum_weights = []
+        for weight in mix.values():
+            total += weight
+            self.cum_weights.append(total)
+        self.concurrency = concurrency
+        self.seed = seed
+
+    async def _client_task(self, index: int, deadline: float, latencies: Dict[str, List[float]],
+                           errors: Dict[str, int]) -> None:
+        rng = random.Random(self.seed * 1_000_003 + index)
+        paths, cum_weights = self.paths, self.cum_weights
+        clock = time.perf_counter
+        async with self.make_client() as client:
+            while clock() < deadline:
+                path = rng.choices(paths, cum_weights=cum_weights)[0]
+                start = clock()
+                try:
+                    response = await client.get(path)
+                    ok = response.status_code < 400
+                except httpx.HTTPError:
+                    ok = False
+                if ok:
+                    latencies[path].append(clock() - start)
+                else:
+                    errors[path] += 1
+
+    async def run(self, duration: float) -> Tuple[Dict[str, List[float]], Dict[str, int], float]:
+        """
+        Send requests for a fixed time.
+
+        Args:
+            duration: Seconds to run
+
+        Returns:
+            The latencies and error counts per path, and the measured seconds
+        """
+        latencies = {path: [] for path in self.paths}
+        errors = {path: 0 for path in self.paths}
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(self._client_task(i, deadline, latencies, errors)
+                               for i in range(self.concurrency)))
+        return latencies, errors, time.perf_counter() - start
+
+
+@asynccontextmanager
+async def asgi_target() -> AsyncIterator[ClientFactory]:
+    """Clients for the app in this process, with its lifespan running"""
+    sys.path.insert(0, HERE)
+    import Fastapi
+
+    # Importing the app configures logging at INFO, and httpx would then log
+    # every request to stderr
+    logging.disable(logging.CRITICAL)
+    Fastapi.rate_limiter.enabled = False
+    Fastapi.access_log.enabled = False
+    async with Fastapi.lifespan(Fastapi.app):
+        transport = httpx.ASGITransport(app=Fastapi.app)
+        yield lambda: httpx.AsyncClient(transport=transport, base_url="http://loadtest")
+
+
+@asynccontextmanager
+async def uvicorn_target(workers: int) -> AsyncIterator[ClientFactory]:
+    """Clients for a uvicorn server started on a free local port"""
+    port = free_port()
+    if workers > 1:
+        command = [sys.executable, os.path.join(HERE, "serve.py"), "--workers", str(workers), "--port", str(port)]
+    else:
+        command = [sys.executable, "-m", "uvicorn", "Fastapi:app", "--port", str(port),
+                   "--no-access-log", "--log-level", "warning"]
+    server = subprocess.Popen(command, cwd=HERE, env=dict(os.environ, **QUIET_ENV),
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        await asyncio.to_thread(wait_for_server, port)
+        yield lambda: httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}")
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait()
+
+
+def git_commit() -> Tuple[Optional[str], bool]:
+    """Return the current commit and whether the work tree has changes"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=HERE, capture_output=True,
+                                text=True, check=True).stdout.strip()
+        status = subprocess.run(["git", "status", "--porcelain", "--", "."], cwd=HERE, capture_output=True,
+                                text=True, check=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+    return commit, bool(status.strip())
+
+
+async def run_load_test(args) -> dict:
+    mix = parse_mix(args.mix)
+    if args.target == "asgi":
+        target = asgi_target()
+    else:
+        target = uvicorn_target(args.server_workers)
+
+    async with target as make_client:
+        test = LoadTest(make_client, mix, args.concurrency, args.seed)
+        if args.warmup > 0:
+            await test.run(args.warmup)
+        latencies, errors, elapsed = await test.run(args.duration)
+
+    commit, dirty = git_commit()
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "dirty": dirty,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": {
+            "target": args.target,
+            "server_workers": args.server_workers if args.target == "uvicorn" else None,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "mix": mix,
+            "seed": args.seed,
+        },
+        "summary": summarize(all_latencies, sum(errors.values()), elapsed),
+        "paths": {path: summarize(latencies[path], errors[path], elapsed) for path in mix},
+    }
+
+
+def print_results(results: dict) -> None:
+    config = results["config"]
+    print(f"target={config['target']} concurrency={config['concurrency']} duration={config['duration']}s "
+          f"commit={(results['commit'] or 'unknown')[:10]}{' (dirty)' if results['dirty'] else ''}")
+    print(f"{'path':<20}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    rows = list(results["paths"].items()) + [("total", results["summary"])]
+    for name, stats in rows:
+        latency = stats["latency_ms"]
+        print(f"{name:<20}{stats['requests']:>10,}{stats['errors']:>8,}{stats['rps']:>10,.0f}"
+              f"{latency['p50']:>9.2f}{latency['p95']:>9.2f}{latency['p99']:>9.2f}")
+
+
+def _change(new: float, old: float) -> float:
+    return (new - old) / old * 100 if old else 0.0
+
+
+def compare_results(results: dict, baseline: dict, max_regression: Optional[float]) -> bool:
+    """
+    Print the change from a baseline result.
+
+    Args:
+        results: The new results
+        baseline: Results saved by an earlier run
+        max_regression: Percentage by which throughput may drop or p99
+            latency may rise; None to only report
+
+    Returns:
+        bool: False if a limit was exceeded
+    """
+    if baseline["config"] != results["config"]:
+        print("warning: the baseline was measured with a different configuration")
+    print(f"\ncompared with {(baseline['commit'] or 'unknown')[:10]} ({baseline['created_at']}):")
+    ok = True
+    names = [name for name in results["paths"] if name in baseline["paths"]] + ["total"]
+    for name in names:
+        new = results["summary"] if name == "total" else results["paths"][name]
+        old = baseline["summary"] if name == "total" else baseline["paths"][name]
+        rps_change = _change(new["rps"], old["rps"])
+        p99_change = _change(new["latency_ms"]["p99"], old["latency_ms"]["p99"])
+        flag = ""
+        if max_regression is not None and (rps_change < -max_regression or p99_change > max_regression):
+            flag = "  REGRESSION"
+            ok = False
+        print(f"{name:<20} req/s {rps_change:+7.1f}%   "
+              f"p50 {_change(new['latency_ms']['p50'], old['latency_ms']['p50']):+7.1f}%   "
+              f"p99 {p99_change:+7.1f}%{flag}")
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the Money Motivation API")
+    parser.add_argument("--target", choices=("asgi", "uvicorn"), default="asgi",
+                        help="Test the app in-process or through a spawned uvicorn server")
+    parser.add_argument("--concurrency", type=int, default=20, help="Concurrent client tasks")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to measure")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Seconds to run before measuring")
+    parser.add_argument("--mix", nargs="+", default=list(DEFAULT_MIX),
+                        help="Request mix as path=weight pairs")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the request mix")
+    parser.add_argument("--server-workers", type=int, default=1, help="Worker processes (uvicorn target)")
+    parser.add_argument("--output", help="Where to save the JSON results "
+                        "(default: loadtest_results/<commit>-<target>.json)")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare with")
+    parser.add_argument("--max-regression", type=float,
+                        help="Fail if req/s drops or p99 rises by more than this percentage (with --compare)")
+    args = parser.parse_args()
+    if args.concurrency < 1 or args.duration <= 0:
+        parser.error("--concurrency and --duration must be positive")
+    try:
+        parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(f"invalid --mix: {str(e)}")
+
+    results = asyncio.run(run_load_test(args))
+    print_results(results)
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        name = (results["commit"] or "unknown")[:10] + ("-dirty" if results["dirty"] else "")
+        output = os.path.join(RESULTS_DIR, f"{name}-{args.target}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+    print(f"\nresults saved to {output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if not compare_results(results, baseline, args.max_regression):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+"""
+Metrics for the Money Motivation API
+===================================
+
+Request metrics in the Prometheus text exposition format:
+
+- http_requests_total: requests by route template, method and status;
+  unknown methods are counted as "other"
+- http_request_duration_seconds: latency histogram by route template
+- http_requests_in_flight: requests currently being handled
+- event_loop_lag_seconds: how late the event loop ran a timer, the usual
+  sign of blocking code or CPU saturation
+
+Counters are plain dict entries updated on the event loop, which is the only
+thread that touches them, so recording a request takes no lock.
+
+With several worker processes, each worker only sees its own requests. When
+a metrics directory is configured, every worker writes its counters to
+<directory>/<pid>.json once per flush interval (and the worker answering a
+scrape writes its own first), and /metrics adds up the files of all workers.
+Counters of workers that have exited are kept, so totals never go backwards;
+gauges are only taken from live workers. Empty the directory before
+starting the server.
+
+Version: 1.0.0
+License: MIT
+"""
+
+import asyncio
+import bisect
+import glob
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from access_log import route_label
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the latency histogram buckets, in seconds
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Seconds between event loop lag probes
+LAG_PROBE_INTERVAL = 0.5
+# Seconds between writes of a worker's counters to the metrics directory
+DEFAULT_FLUSH_INTERVAL = 5.0
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Methods counted under their own name; clients can send any token, so all
+# others share one label
+KNOWN_METHODS = frozenset(("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "CONNECT", "TRACE"))
+OTHER_METHOD = "other"
+
+
+def method_label(method: str) -> str:
+    """Name a request method for metrics, keeping the number of labels bounded"""
+    return method if method in KNOWN_METHODS else OTHER_METHOD
+
+
+class Metrics:
+    """
+    Request counters and latency histograms for one worker process.
+
+    Args:
+        buckets: Upper bounds of the latency histogram buckets, in seconds
+        directory: Where workers share their counters; None for a single process
+        flush_interval: Seconds between writes to the directory
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS, directory: Optional[str] = None,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        self.buckets = tuple(sorted(buckets))
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.enabled = True
+        self._reset()
+
+    def _reset(self) -> None:
+        self._pid = os.getpid()
+        # (route, method, status) -> count
+        self.requests: Dict[Tuple[str, str, int], int] = {}
+        # route -> count per bucket, the last one for +Inf (not cumulative)
+        self.latency: Dict[str, List[int]] = {}
+        self.latency_sum: Dict[str, float] = {}
+        self.in_flight = 0
+        self.loop_lag = 0.0
+
+    def _ensure_process(self) -> None:
+        # A forked worker must not report its parent's counters as its own
+        if self._pid != os.getpid():
+            self._reset()
+
+    def observe(self, route: str, method: str, status: int, duration: float) -> None:
+        """
+        Record a finished request.
+
+        Args:
+            route: The route template
+            method: The HTTP method
+            status: The response status code
+            duration: Seconds spent handling the request
+        """
+        key = (route, method, status)
+        requests = self.requests
+        requests[key] = requests.get(key, 0) + 1
+
+        counts = self.latency.get(route)
+        if counts is None:
+            counts = self.latency[route] = [0] * (len(self.buckets) + 1)
+            self.latency_sum[route] = 0.0
+        counts[bisect.bisect_left(self.buckets, duration)] += 1
+        self.latency_sum[route] += duration
+
+    def state(self) -> dict:
+        """
+        Copy this worker's metrics.
+
+        Call it on the event loop; the copy can then be written or rendered
+        from another thread.
+        """
+        self._ensure_process()
+        return {
+            "pid": self._pid,
+            "requests": [[route, method, status, count]
+                         for (route, method, status), count in self.requests.items()],
+            "latency": {route: [list(counts), self.latency_sum[route]]
+                        for route, counts in self.latency.items()},
+            "in_flight": self.in_flight,
+            "loop_lag": self.loop_lag,
+        }
+
+    def _state_path(self, pid: int) -> str:
+        return os.path.join(self.directory, f"{pid}.json")
+
+    def write_state(self, state: dict) -> None:
+        """Atomically write a worker's state to the metrics directory"""
+        path = self._state_path(state["pid"])
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    def collect(self, state: dict) -> List[Tuple[dict, bool]]:
+        """
+        Gather the states of all workers.
+
+        Args:
+            state: This worker's current state, which replaces its file
+
+        Returns:
+            (state, alive) for every worker
+        """
+        if self.directory is None:
+            return [(state, True)]
+
+        self.write_state(state)
+        states = []
+        for path in glob.glob(os.path.join(self.directory, "*.json")):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    other = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping metrics file {path}: {str(e)}")
+                continue
+            states.append((other, other["pid"] == state["pid"] or _pid_alive(other["pid"])))
+        return states
+
+    def render(self, state: dict) -> str:
+        """
+        Render the metrics of all workers in Prometheus text format.
+
+        Reads the metrics directory, so run it off the event loop.
+
+        Args:
+            state: This worker's current state, from state()
+
+        Returns:
+            str: The exposition text
+        """
+        requests: Dict[Tuple[str, str, int], int] = {}
+        latency: Dict[str, List] = {}
+        in_flight = 0
+        loop_lag = 0.0
+        for worker, alive in self.collect(state):
+            for route, method, status, count in worker["requests"]:
+                key = (route, method, status)
+                requests[key] = requests.get(key, 0) + count
+            for route, (counts, total) in worker["latency"].items():
+                merged = latency.setdefault(route, [[0] * (len(self.buckets) + 1), 0.0])
+                merged[0] = [a + b for a, b in zip(merged[0], counts)]
+                merged[1] += total
+            if alive:
+                in_flight += worker["in_flight"]
+                loop_lag = max(loop_lag, worker["loop_lag"])
+
+        lines = [
+            "# HELP http_requests_total Requests handled, by route, method and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        for (route, method, status), count in sorted(requests.items()):
+            lines.append(f'http_requests_total{{route="{_escape(route)}",method="{method}",status="{status}"}} {count}')
+
+        lines += [
+            "# HELP http_request_duration_seconds Time spent handling requests, by route.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        bounds = [_format_float(bound) for bound in self.buckets] + ["+Inf"]
+        for route, (counts, total) in sorted(latency.items()):
+            label = _escape(route)
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                lines.append(f'http_request_duration_seconds_bucket{{route="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'http_request_duration_seconds_sum{{route="{label}"}} {_format_float(total)}')
+            lines.append(f'http_request_duration_seconds_count{{route="{label}"}} {cumulative}')
+
+        lines += [
+            "# HELP http_requests_in_flight Requests currently being handled.",
+            "# TYPE http_requests_in_flight gauge",
+            f"http_requests_in_flight {in_flight}",
+            "# HELP event_loop_lag_seconds Latest event loop lag of the slowest worker.",
+            "# TYPE event_loop_lag_seconds gauge",
+            f"event_loop_lag_seconds {_format_float(loop_lag)}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    async def run(self) -> None:
+        """
+        Probe the event loop lag and write this worker's state until cancelled.
+
+        The lag is how much later than scheduled a short sleep wakes up.
+        """
+        loop = asyncio.get_running_loop()
+        next_flush = loop.time() + self.flush_interval
+        while True:
+            start = loop.time()
+            await asyncio.sleep(LAG_PROBE_INTERVAL)
+            now = loop.time()
+            self.loop_lag = max(0.0, now - start - LAG_PROBE_INTERVAL)
+            if self.directory is not None and now >= next_flush:
+                next_flush = now + self.flush_interval
+                try:
+                    await asyncio.to_thread(self.write_state, self.state())
+                except OSError as e:
+                    logger.error(f"Could not write metrics: {str(e)}")
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_float(value: float) -> str:
+    return repr(float(value))
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware that feeds a Metrics registry.
+
+    Add it after the rate limiter, so rejected requests are counted too.
+    """
+
+    def __init__(self, app, metrics: Metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        metrics = self.metrics
+        if scope["type"] != "http" or not metrics.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        metrics._ensure_process()
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        metrics.in_flight += 1
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            metrics.in_flight -= 1
+            metrics.observe(route_label(scope, status), method_label(scope["method"]), status,
+                            time.perf_counter() - start)
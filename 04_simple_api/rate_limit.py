@@ -0,0 +1,379 @@
+"""
+Rate Limiting for the Money Motivation API
+=========================================
+
+A token-bucket rate limiter implemented as pure ASGI middleware.
+
+Every client gets a bucket that holds up to `burst` tokens and refills at
+`rate` tokens per second. Each request takes one token; a request that finds
+the bucket empty is answered with 429 Too Many Requests and a Retry-After
+header. Clients that send one of the known API keys in their X-API-Key header
+are identified by that key, and all others by their address, so sending
+made-up keys doesn't get a client fresh buckets.
+
+A bucket only stores its token count and the time it was last updated, and
+the refill is computed from the elapsed time, so each request costs O(1).
+
+Backends:
+- MemoryBackend: buckets in a dict, private to one worker process. Idle
+  buckets are evicted in least-recently-used order, so memory stays bounded.
+- SQLiteBackend: buckets in a SQLite database, shared by every worker
+  process on the machine. Each request is a single atomic UPSERT, run on a
+  worker thread so a busy database never blocks the event loop.
+
+If the backend fails (e.g. the SQLite database stays locked), requests are
+let through rather than failing: the limiter protects the API, it should
+never take it down.
+
+Version: 1.0.0
+License: MIT
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import os
+import sqlite3
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional
+
+from snapshot import EncodedBody, PreEncodedResponse
+
+# Seconds without requests after which a bucket is forgotten
+DEFAULT_IDLE_TTL = 300.0
+# Upper bound on the number of buckets kept by the memory backend
+DEFAULT_MAX_KEYS = 100_000
+# How often (in requests) the SQLite backend deletes idle buckets
+SQLITE_PURGE_INTERVAL = 1_000
+# Log every this many backend errors (the first is always logged)
+ERROR_LOG_INTERVAL = 1_000
+
+logger = logging.getLogger(__name__)
+
+
+class BackendError(Exception):
+    """A rate limit backend could not update a bucket"""
+
+
+def _key_digest(value: bytes) -> str:
+    return hashlib.blake2b(value, digest_size=12).hexdigest()
+
+
+class MemoryBackend:
+    """
+    Token buckets stored in process memory.
+
+    Buckets are kept in least-recently-used order. Each call evicts idle
+    buckets from the front; by the time a bucket has been idle for the TTL it
+    would have refilled completely, so forgetting it changes nothing. When
+    max_keys is reached, the least recently used bucket is evicted early.
+    """
+
+    def __init__(self, idle_ttl: float = DEFAULT_IDLE_TTL, max_keys: int = DEFAULT_MAX_KEYS):
+        self.idle_ttl = idle_ttl
+        self.max_keys = max_keys
+        # key -> [tokens, updated]
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+
+    # consume() is fast enough to call on the event loop
+    blocking = False
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def consume(self, key: str, rate: float, burst: float) -> float:
+        """
+        Take a token from a client's bucket.
+
+        Args:
+            key: The client key
+            rate: Tokens added per second
+            burst: Bucket capacity
+
+        Returns:
+            float: 0 if the request is allowed, otherwise the number of
+            seconds until a token becomes available
+        """
+        now = time.monotonic()
+        buckets = self._buckets
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = [burst, now]
+            self._evict(now)
+        else:
+            buckets.move_to_end(key)
+            bucket[0] = min(burst, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / rate
+
+    def _evict(self, now: float) -> None:
+        buckets = self._buckets
+        cutoff = now - self.idle_ttl
+        while buckets:
+            oldest = next(iter(buckets.values()))
+            if oldest[1] >= cutoff and len(buckets) <= self.max_keys:
+                break
+            buckets.popitem(last=False)
+
+    def close(self) -> None:
+        self._buckets.clear()
+
+
+class SQLiteBackend:
+    """
+    Token buckets stored in a SQLite database shared between processes.
+
+    The refill, the token check and the write happen in a single UPSERT
+    statement, so concurrent workers never lose an update. The connection is
+    opened lazily in each process, which keeps the backend safe to create
+    before forking workers. Idle buckets are purged periodically.
+
+    The middleware calls consume_async(), which runs consume() on a single
+    worker thread per process: waiting for a lock held by another process
+    then blocks that thread, not the event loop, and the connection is only
+    ever used by one thread at a time.
+    """
+
+    blocking = True
+
+    CONSUME_SQL = """
+        INSERT INTO buckets (key, tokens, updated, allowed)
+        VALUES (:key, :burst - 1, :now, 1)
+        ON CONFLICT (key) DO UPDATE SET
+            tokens = CASE
+                WHEN min(:burst, tokens + (:now - updated) * :rate) >= 1
+                THEN min(:burst, tokens + (:now - updated) * :rate) - 1
+                ELSE min(:burst, tokens + (:now - updated) * :rate)
+            END,
+            allowed = min(:burst, tokens + (:now - updated) * :rate) >= 1,
+            updated = :now
+        RETURNING tokens, allowed
+    """
+
+    def __init__(self, path: str, idle_ttl: float = DEFAULT_IDLE_TTL):
+        self.path = path
+        self.idle_ttl = idle_ttl
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = 0
+        self._calls = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_pid = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, isolation_level=None, timeout=1.0,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Losing the last few updates in a crash is harmless for rate limits
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, "
+                "allowed INTEGER NOT NULL) WITHOUT ROWID"
+            )
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def consume(self, key: str, rate: float, burst: float) -> float:
+        """
+        Take a token from a client's bucket.
+
+        Args:
+            key: The client key
+            rate: Tokens added per second
+            burst: Bucket capacity
+
+        Returns:
+            float: 0 if the request is allowed, otherwise the number of
+            seconds until a token becomes available
+
+        Raises:
+            BackendError: If the database can't be read or written
+        """
+        try:
+            conn = self._connect()
+            now = time.time()
+            tokens, allowed = conn.execute(
+                self.CONSUME_SQL, {"key": key, "burst": burst, "now": now, "rate": rate}
+            ).fetchone()
+
+            self._calls += 1
+            if self._calls % SQLITE_PURGE_INTERVAL == 0:
+                conn.execute("DELETE FROM buckets WHERE updated < ?", (now - self.idle_ttl,))
+        except sqlite3.Error as e:
+            raise BackendError(str(e)) from e
+
+        return 0.0 if allowed else (1 - tokens) / rate
+
+    async def consume_async(self, key: str, rate: float, burst: float) -> float:
+        """consume() on this process's database thread"""
+        if self._executor is None or self._executor_pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rate-limit-sqlite")
+            self._executor_pid = os.getpid()
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self.consume, key, rate, burst)
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT count(*) FROM buckets").fetchone()[0]
+
+    def close(self) -> None:
+        if self._executor is not None and self._executor_pid == os.getpid():
+            self._executor.shutdown()
+        self._executor = None
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+
+
+def create_backend(name: str, sqlite_path: str = "rate_limit.sqlite3", idle_ttl: float = DEFAULT_IDLE_TTL):
+    """
+    Create a rate limit backend by name.
+
+    Args:
+        name: "memory" or "sqlite"
+        sqlite_path: The database file for the SQLite backend
+        idle_ttl: Seconds after which idle buckets are forgotten
+
+    Returns:
+        The backend
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    if name == "memory":
+        return MemoryBackend(idle_ttl)
+    if name == "sqlite":
+        return SQLiteBackend(sqlite_path, idle_ttl)
+    raise ValueError(f"Unknown rate limit backend: {name!r}")
+
+
+class RateLimiter:
+    """
+    Rate limit settings plus the backend holding the buckets.
+
+    Args:
+        rate: Requests per second allowed for each client, on average
+        burst: Requests a client can make at once after being idle
+        backend: A MemoryBackend or SQLiteBackend
+        key_header: Header identifying API clients, e.g. "X-API-Key"
+        api_keys: The valid API keys; clients sending any other key are
+            limited by address
+        exempt_paths: Paths that are never limited (health checks, docs)
+    """
+
+    def __init__(self, rate: float, burst: int, backend=None, key_header: str = "X-API-Key",
+                 api_keys: Iterable[str] = (), exempt_paths: Iterable[str] = ()):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        self.rate = rate
+        self.burst = burst
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.key_header = key_header.lower().encode("latin-1")
+        self.api_keys = frozenset(_key_digest(key.encode("latin-1")) for key in api_keys if key)
+        self.exempt_paths = frozenset(exempt_paths)
+        self.enabled = True
+        self.rejected = 0
+        self.backend_errors = 0
+
+    def client_key(self, scope) -> str:
+        """
+        Identify the client of a request.
+
+        Only known API keys get their own bucket; any other key would let a
+        client start over with a full bucket by changing it. API keys are
+        hashed, so they are never stored (or written to the SQLite
+        database) in plain text.
+        """
+        if self.api_keys:
+            for name, value in scope["headers"]:
+                if name == self.key_header:
+                    digest = _key_digest(value)
+                    if digest in self.api_keys:
+                        return "key:" + digest
+                    break
+        client = scope.get("client")
+        return "ip:" + (client[0] if client else "unknown")
+
+    def check(self, scope) -> float:
+        """
+        Count a request against its client's limit.
+
+        Returns:
+            float: 0 if the request is allowed (or the backend failed),
+            otherwise seconds to wait
+        """
+        try:
+            return self.backend.consume(self.client_key(scope), self.rate, self.burst)
+        except BackendError as e:
+            return self._backend_failed(e)
+
+    async def check_async(self, scope) -> float:
+        """Like check(), without blocking the event loop on the backend"""
+        try:
+            if self.backend.blocking:
+                return await self.backend.consume_async(self.client_key(scope), self.rate, self.burst)
+            return self.backend.consume(self.client_key(scope), self.rate, self.burst)
+        except BackendError as e:
+            return self._backend_failed(e)
+
+    def _backend_failed(self, error: BackendError) -> float:
+        # Fail open: let the request through
+        self.backend_errors += 1
+        if self.backend_errors % ERROR_LOG_INTERVAL == 1:
+            logger.warning(f"Rate limit backend error ({self.backend_errors} so far), "
+                           f"allowing the request: {str(error)}")
+        return 0.0
+
+    def close(self) -> None:
+        self.backend.close()
+
+
+def too_many_requests(retry_after: float) -> PreEncodedResponse:
+    """
+    Build a 429 response.
+
+    Args:
+        retry_after: Seconds until the client may retry
+
+    Returns:
+        PreEncodedResponse: The response, with a Retry-After header in whole seconds
+    """
+    seconds = max(1, math.ceil(retry_after))
+    unit = "second" if seconds == 1 else "seconds"
+    encoded = EncodedBody.from_content({"detail": f"Rate limit exceeded. Try again in {seconds} {unit}."})
+    response = PreEncodedResponse(encoded, status_code=429)
+    response.raw_headers.append((b"retry-after", str(seconds).encode("latin-1")))
+    return response
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware that enforces a RateLimiter.
+
+    Written as plain ASGI rather than with BaseHTTPMiddleware, so an allowed
+    request costs one bucket update and nothing else.
+    """
+
+    def __init__(self, app, limiter: RateLimiter):
+        self.app = app
+        self.limiter = limiter
+
+    async def __call__(self, scope, receive, send):
+        limiter = self.limiter
+        if scope["type"] != "http" or not limiter.enabled or scope["path"] in limiter.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = await limiter.check_async(scope)
+        if retry_after:
+            limiter.rejected += 1
+            await too_many_requests(retry_after)(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
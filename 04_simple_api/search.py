@@ -0,0 +1,628 @@
+"""
+Quote Search for the Money Motivation API
+========================================
+
+An in-memory full-text index over the money quotes. Each data snapshot has
+its own index; when entries are added or removed, the new snapshot's index
+is derived from the previous one instead of being rebuilt.
+
+Quotes are stored as "text – Author" strings. Each one is split at the last
+"–" into its text and author. The words of both are indexed, so a search for
+"buffett" finds Warren Buffett's quotes, and the author is also indexed on
+its own for filtering (?author=buffett).
+
+Index layout, chosen so that a query costs about the same at a hundred
+quotes and at hundreds of thousands:
+- Each word has a posting list of the quotes containing it, sorted by quote
+  id, with the word's BM25 weight in each quote (the score without the
+  word's idf, which is applied at query time). The lists are typed arrays,
+  not Python objects, so large corpora stay compact.
+- Each word also has its quotes sorted by weight (impact order), so the
+  first page of a one-word search is a slice, however many quotes contain
+  the word.
+- A multi-word search walks all its words' lists in impact order and stops
+  as soon as no quote it hasn't seen can make it onto the requested page
+  (the threshold algorithm), and in any case after MAX_EXAMINED entries.
+  When the rarest word's list is short, its quotes are simply all scored
+  and the total is exact; otherwise the total is estimated. Common words
+  ("the", "and", ...) are not indexed at all.
+- The author index maps each author to their quotes, and each word of an
+  author's name to the authors containing it.
+
+Updates copy only the posting lists of the words in the added and removed
+quotes; every other list is shared with the previous index, which stays
+valid for requests still using the previous snapshot. Weights use the
+average quote length of the last full build, and a full build happens
+once the changes since then add up to REBUILD_FRACTION of the collection.
+
+Version: 1.0.0
+License: MIT
+"""
+
+import copy
+import heapq
+import math
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
+# Separates a quote from its author, e.g. "Money often costs too much. – Ralph Waldo Emerson"
+AUTHOR_SEPARATOR = "–"
+
+# BM25 parameters: term frequency saturation and length normalization
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Searches whose candidates (the quotes containing the rarest word, or by the
+# author) are at most this many score them all and count matches exactly
+COUNT_LIMIT = 500
+# Posting list entries a search examines at most; bounds the work per query
+MAX_EXAMINED = 500
+# Updates are applied incrementally until the quotes added and removed since
+# the last full build exceed this share of the collection (or the minimum)
+REBUILD_FRACTION = 0.1
+REBUILD_MIN_CHANGES = 100
+# Quotes compared at once when matching a changed collection to the old one
+DIFF_BLOCK = 256
+
+TOKEN_RE = re.compile(r"[^\W_]+")
+# Words too common to be worth indexing
+STOPWORDS = frozenset("""
+    a an and are as at be but by for from has have i if in is it its not of on
+    or so that the their they this to was were will with you your
+""".split())
+
+
+@dataclass(frozen=True)
+class Quote:
+    """A quote split into its text and author"""
+    text: str
+    author: Optional[str]
+
+
+def parse_quote(quote: str) -> Quote:
+    """
+    Split a "text – Author" string.
+
+    Args:
+        quote: The quote as stored
+
+    Returns:
+        Quote: The text and the author, or None as the author if the quote
+        has no separator
+    """
+    text, separator, author = quote.rpartition(AUTHOR_SEPARATOR)
+    text, author = text.strip(), author.strip()
+    if not separator or not text or not author:
+        return Quote(quote.strip(), None)
+    return Quote(text, author)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase words, without stopwords.
+
+    Apostrophes are dropped, so "don't" and "dont" are the same word.
+    """
+    text = text.casefold().replace("'", "").replace("’", "")
+    return [token for token in TOKEN_RE.findall(text) if token not in STOPWORDS]
+
+
+def normalize_author(author: str) -> str:
+    """Normalize an author's name for matching (P.T. Barnum -> p t barnum)"""
+    return " ".join(TOKEN_RE.findall(author.casefold().replace("'", "").replace("’", "")))
+
+
+@dataclass(frozen=True)
+class SearchResults:
+    """One page of search results"""
+    total: int
+    # (quote id, score) pairs, best first
+    hits: Tuple[Tuple[int, float], ...]
+    # False if total is an estimate
+    total_exact: bool = True
+
+
+def _f32(value: float) -> float:
+    """A float rounded the way a float32 array stores it"""
+    return array("f", (value,))[0]
+
+
+def _term_weight(tf: int, length: int, average_length: float) -> float:
+    """The BM25 weight of a word in a quote, without the word's idf"""
+    norm = 1 - BM25_B + BM25_B * length / average_length if average_length else 1.0
+    return _f32(tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm))
+
+
+def _quote_terms(quote: Quote) -> Tuple[Counter, int]:
+    """The words of a quote with their counts, and its length in words"""
+    tokens = tokenize(quote.text)
+    if quote.author:
+        tokens += tokenize(quote.author)
+    return Counter(tokens), len(tokens)
+
+
+class _Postings:
+    """The quotes containing one word"""
+    __slots__ = ("ids", "weights", "ranked", "ranked_keys")
+
+    def __init__(self, ids: array, weights: array, ranked: array, ranked_keys: array):
+        # Quote ids in ascending order, and the word's weight in each
+        self.ids = ids
+        self.weights = weights
+        # The same by descending weight (ties by ascending id), with the
+        # weights negated so that the list is ascending and bisect works
+        self.ranked = ranked
+        self.ranked_keys = ranked_keys
+
+    @classmethod
+    def empty(cls) -> "_Postings":
+        return cls(array("i"), array("f"), array("i"), array("f"))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def copy(self) -> "_Postings":
+        return _Postings(array("i", self.ids), array("f", self.weights),
+                         array("i", self.ranked), array("f", self.ranked_keys))
+
+    def add(self, quote_id: int, weight: float) -> None:
+        """Add a quote with a higher id than any in the list"""
+        self.ids.append(quote_id)
+        self.weights.append(weight)
+        # After the equal weights, which all have lower ids
+        i = bisect_right(self.ranked_keys, -weight)
+        self.ranked.insert(i, quote_id)
+        self.ranked_keys.insert(i, -weight)
+
+    def remove(self, quote_id: int, weight: float) -> None:
+        """Remove a quote, given its weight"""
+        i = bisect_left(self.ids, quote_id)
+        del self.ids[i]
+        del self.weights[i]
+        low = bisect_left(self.ranked_keys, -weight)
+        high = bisect_right(self.ranked_keys, -weight, low)
+        i = bisect_left(self.ranked, quote_id, low, high)
+        del self.ranked[i]
+        del self.ranked_keys[i]
+
+
+class QuoteIndex:
+    """
+    A search index over a collection of quotes.
+
+    Search results identify quotes by their position in the collection.
+    Internally each quote has an id that never changes while the index is
+    updated: added quotes get new ids, and removed quotes' ids are not
+    reused, so positions are ids minus the removed ids before them.
+
+    Args:
+        quotes: The quotes, as "text – Author" strings
+    """
+
+    def __init__(self, quotes: Sequence[str]):
+        self._texts: Tuple[str, ...] = tuple(quotes)
+        self.quotes: Tuple[Quote, ...] = tuple(parse_quote(quote) for quote in self._texts)
+        # Quotes by internal id; None once removed
+        self._docs: List[Optional[Quote]] = list(self.quotes)
+        # Removed internal ids, ascending
+        self._removed = array("i")
+        self._live = len(self._docs)
+        # Quotes added or removed since this full build
+        self._changes = 0
+
+        # Words of each quote, with their counts
+        term_counts = [_quote_terms(quote) for quote in self.quotes]
+        doc_count = len(self.quotes)
+        # Kept until the next full build, so that weights never change
+        self._average_length = (sum(length for _, length in term_counts) / doc_count) if doc_count else 0.0
+
+        # word -> [(quote id, weight)], in quote id order
+        occurrences: Dict[str, List[Tuple[int, float]]] = {}
+        for quote_id, (counts, length) in enumerate(term_counts):
+            for term, tf in counts.items():
+                occurrences.setdefault(term, []).append((quote_id, _term_weight(tf, length, self._average_length)))
+
+        self._postings: Dict[str, _Postings] = {}
+        for term, entries in occurrences.items():
+            ranked = sorted(entries, key=lambda entry: (-entry[1], entry[0]))
+            self._postings[term] = _Postings(
+                array("i", (quote_id for quote_id, _ in entries)), array("f", (weight for _, weight in entries)),
+                array("i", (quote_id for quote_id, _ in ranked)), array("f", (-weight for _, weight in ranked)))
+
+        # Author index: author -> quote ids, and author name word -> authors
+        self._author_names: List[str] = []
+        self._author_ids: Dict[str, int] = {}
+        self._author_quotes: List[array] = []
+        self._quote_authors = array("i")
+        for quote_id, quote in enumerate(self.quotes):
+            author_id = -1
+            if quote.author:
+                key = normalize_author(quote.author)
+                author_id = self._author_ids.get(key, -1)
+                if author_id < 0:
+                    author_id = self._author_ids[key] = len(self._author_names)
+                    self._author_names.append(quote.author)
+                    self._author_quotes.append(array("i"))
+                self._author_quotes[author_id].append(quote_id)
+            self._quote_authors.append(author_id)
+
+        words: Dict[str, set] = {}
+        for key, author_id in self._author_ids.items():
+            for word in key.split():
+                words.setdefault(word, set()).add(author_id)
+        self._author_words: Dict[str, FrozenSet[int]] = {word: frozenset(ids) for word, ids in words.items()}
+
+    def __len__(self) -> int:
+        return len(self.quotes)
+
+    # -------------------------------------------------------------------------
+    # Updates
+    # -------------------------------------------------------------------------
+    def updated(self, quotes: Sequence[str]) -> "QuoteIndex":
+        """
+        Index a changed collection, reusing this index where possible.
+
+        When the new collection is this one with some quotes removed and
+        others appended (what adding and removing entries does), only the
+        changed quotes are indexed, in a copy that shares every unchanged
+        posting list with this index, which stays valid for the snapshot
+        still using it. Otherwise, or once the changes since the last full
+        build exceed REBUILD_FRACTION of the collection, the index is built
+        from scratch.
+
+        Args:
+            quotes: The new collection, as "text – Author" strings
+
+        Returns:
+            QuoteIndex: An index over quotes
+        """
+        quotes = tuple(quotes)
+        budget = max(REBUILD_MIN_CHANGES, int(REBUILD_FRACTION * len(quotes))) - self._changes
+        diff = self._diff(quotes, budget)
+        if diff is None:
+            return QuoteIndex(quotes)
+        removed_positions, added = diff
+        if not removed_positions and not added:
+            return self
+
+        index = copy.copy(self)
+        index._apply(quotes, removed_positions, added)
+        return index
+
+    def _diff(self, quotes: Tuple[str, ...], budget: int) -> Optional[Tuple[List[int], Tuple[str, ...]]]:
+        """
+        Match the new collection against this one.
+
+        Returns:
+            The positions of the removed quotes and the appended quotes, or
+            None if the change isn't removals plus appends within the budget
+        """
+        old = self._texts
+        if quotes[:len(old)] == old:
+            added = quotes[len(old):]
+            return ([], added) if len(added) <= budget else None
+
+        removed = []
+        i = j = 0
+        while i < len(old) and j < len(quotes):
+            # Skip runs of unchanged quotes a block at a time
+            block = old[i:i + DIFF_BLOCK]
+            if len(block) == DIFF_BLOCK and block == quotes[j:j + DIFF_BLOCK]:
+                i += DIFF_BLOCK
+                j += DIFF_BLOCK
+                continue
+            if old[i] == quotes[j]:
+                j += 1
+            else:
+                removed.append(i)
+                if len(removed) > budget:
+                    return None
+            i += 1
+        removed.extend(range(i, len(old)))
+        added = quotes[j:]
+        if len(removed) + len(added) > budget:
+            return None
+        return removed, added
+
+    def _internal_id(self, position: int) -> int:
+        # The id with `position` live ids before it
+        quote_id = position
+        while True:
+            shifted = position + bisect_right(self._removed, quote_id)
+            if shifted == quote_id:
+                return quote_id
+            quote_id = shifted
+
+    def _position(self, quote_id: int) -> int:
+        return quote_id - bisect_left(self._removed, quote_id)
+
+    def _apply(self, quotes: Tuple[str, ...], removed_positions: List[int], added: Tuple[str, ...]) -> None:
+        """Apply a diff to this (shallow) copy, copying whatever it changes"""
+        removed_ids = [self._internal_id(position) for position in removed_positions]
+        postings = self._postings = dict(self._postings)
+        copied: Dict[str, _Postings] = {}
+
+        def mutable(term: str) -> _Postings:
+            posting = copied.get(term)
+            if posting is None:
+                original = postings.get(term)
+                posting = copied[term] = original.copy() if original is not None else _Postings.empty()
+                postings[term] = posting
+            return posting
+
+        docs = self._docs = list(self._docs)
+        author_quotes = self._author_quotes = list(self._author_quotes)
+        self._author_ids = dict(self._author_ids)
+        self._author_names = list(self._author_names)
+        self._author_words = dict(self._author_words)
+        copied_authors = set()
+
+        def mutable_author(author_id: int) -> array:
+            if author_id not in copied_authors:
+                author_quotes[author_id] = array("i", author_quotes[author_id])
+                copied_authors.add(author_id)
+            return author_quotes[author_id]
+
+        for quote_id in removed_ids:
+            quote = docs[quote_id]
+            counts, length = _quote_terms(quote)
+            for term, tf in counts.items():
+                posting = mutable(term)
+                posting.remove(quote_id, _term_weight(tf, length, self._average_length))
+                if not posting:
+                    del postings[term]
+            author_id = self._quote_authors[quote_id]
+            if author_id >= 0:
+                quotes_by_author = mutable_author(author_id)
+                del quotes_by_author[bisect_left(quotes_by_author, quote_id)]
+            docs[quote_id] = None
+
+        new_quotes = [parse_quote(text) for text in added]
+        self._quote_authors = array("i", self._quote_authors)
+        for quote in new_quotes:
+            quote_id = len(docs)
+            docs.append(quote)
+            counts, length = _quote_terms(quote)
+            for term, tf in counts.items():
+                mutable(term).add(quote_id, _term_weight(tf, length, self._average_length))
+            self._quote_authors.append(self._add_author_quote(quote, quote_id, mutable_author))
+
+        self._removed = array("i", sorted((*self._removed, *removed_ids)))
+        remaining = list(self.quotes)
+        for position in reversed(removed_positions):
+            del remaining[position]
+        self.quotes = tuple(remaining + new_quotes)
+        self._texts = quotes
+        self._live = len(self.quotes)
+        self._changes += len(removed_ids) + len(new_quotes)
+
+    def _add_author_quote(self, quote: Quote, quote_id: int, mutable_author) -> int:
+        """Record an added quote's author; returns the author id (-1 for none)"""
+        if not quote.author:
+            return -1
+        key = normalize_author(quote.author)
+        author_id = self._author_ids.get(key, -1)
+        if author_id < 0:
+            author_id = self._author_ids[key] = len(self._author_names)
+            self._author_names.append(quote.author)
+            self._author_quotes.append(array("i"))
+            for word in key.split():
+                self._author_words[word] = self._author_words.get(word, frozenset()) | {author_id}
+        mutable_author(author_id).append(quote_id)
+        return author_id
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+    def authors(self) -> List[Tuple[str, int]]:
+        """
+        List the authors with their number of quotes.
+
+        Returns:
+            (author, count) pairs, most quoted first
+        """
+        counts = [(name, len(quote_ids)) for name, quote_ids in zip(self._author_names, self._author_quotes)
+                  if quote_ids]
+        return sorted(counts, key=lambda item: (-item[1], item[0].casefold()))
+
+    def match_authors(self, author: str) -> FrozenSet[int]:
+        """
+        Find the authors whose names contain all words of a query.
+
+        Args:
+            author: A full or partial name, e.g. "warren buffett" or "buffett"
+
+        Returns:
+            The matching author ids
+        """
+        words = normalize_author(author).split()
+        if not words:
+            return frozenset()
+        matches = self._author_words.get(words[0], frozenset())
+        for word in words[1:]:
+            matches = matches & self._author_words.get(word, frozenset())
+        return matches
+
+    def _idf(self, posting: _Postings) -> float:
+        df = len(posting)
+        return math.log(1 + (self._live - df + 0.5) / (df + 0.5))
+
+    def search(self, query: str = "", author: Optional[str] = None,
+               offset: int = 0, limit: int = 10) -> SearchResults:
+        """
+        Find quotes containing every word of a query, best matches first.
+
+        Args:
+            query: The words to search for; may be empty when an author is given
+            author: Only return quotes by authors matching this name
+            offset: The number of results to skip
+            limit: The maximum number of results to return
+
+        Returns:
+            SearchResults: The total number of matches (estimated for large
+            multi-word results) and the requested page. Without a query, an
+            author's quotes are returned in stored order with a score of 0.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        author_ids = self.match_authors(author) if author else None
+        if (query and not terms) or author_ids == frozenset():
+            # Only stopwords, or no such author
+            return SearchResults(0, ())
+
+        if not terms:
+            return self._author_page(author_ids, offset, limit)
+
+        postings = []
+        for term in terms:
+            posting = self._postings.get(term)
+            if posting is None:
+                return SearchResults(0, ())
+            postings.append(posting)
+        postings.sort(key=len)
+        idfs = [self._idf(posting) for posting in postings]
+
+        if author_ids is not None:
+            author_total = sum(len(self._author_quotes[a]) for a in author_ids)
+            if author_total <= min(len(postings[0]), COUNT_LIMIT):
+                # Scoring every quote by the author is cheapest
+                quote_ids = (quote_id for a in author_ids for quote_id in self._author_quotes[a])
+                return self._rank_all(self._score_all(quote_ids, postings, idfs), offset, limit)
+
+        if len(postings) == 1 and author_ids is None:
+            # The ranked list is the answer
+            posting, idf = postings[0], idfs[0]
+            end = offset + limit
+            hits = tuple((self._position(quote_id), -key * idf)
+                         for quote_id, key in zip(posting.ranked[offset:end], posting.ranked_keys[offset:end]))
+            return SearchResults(len(posting), hits)
+
+        if len(postings[0]) <= COUNT_LIMIT:
+            # Few enough candidates to score them all and count exactly
+            quote_ids = postings[0].ids
+            if author_ids is not None:
+                quote_authors = self._quote_authors
+                quote_ids = (quote_id for quote_id in quote_ids if quote_authors[quote_id] in author_ids)
+            return self._rank_all(self._score_all(quote_ids, postings, idfs), offset, limit)
+
+        return self._top_matches(postings, idfs, author_ids, offset, limit)
+
+    @staticmethod
+    def _score_all(quote_ids: Iterable[int], postings: List[_Postings],
+                   idfs: List[float]) -> Iterable[Tuple[float, int]]:
+        """Yield (score, quote id) for the quotes that match all postings"""
+        lists = [(posting.ids, posting.weights, len(posting), idf) for posting, idf in zip(postings, idfs)]
+        for quote_id in quote_ids:
+            total = 0.0
+            for ids, weights, end, idf in lists:
+                j = bisect_left(ids, quote_id)
+                if j == end or ids[j] != quote_id:
+                    break
+                total += idf * weights[j]
+            else:
+                yield total, quote_id
+
+    def _rank_all(self, matches: Iterable[Tuple[float, int]], offset: int, limit: int) -> SearchResults:
+        matches = list(matches)
+        best = heapq.nsmallest(offset + limit, matches, key=lambda item: (-item[0], item[1]))
+        return SearchResults(len(matches), tuple((self._position(quote_id), score)
+                                                 for score, quote_id in best[offset:]))
+
+    def _top_matches(self, postings: List[_Postings], idfs: List[float], author_ids: Optional[FrozenSet[int]],
+                     offset: int, limit: int) -> SearchResults:
+        """
+        Rank the quotes matching all postings, stopping as early as possible.
+
+        The threshold algorithm: walks all posting lists from their
+        highest-weighted quotes down, in turn, and scores each quote when
+        it is first seen (looking its other words up by binary search). A
+        quote not seen yet can score at most the sum of the weights at the
+        current position of every list (the threshold); once the page is
+        full of quotes scoring more than that, the rest can't change it.
+        Ties with the threshold are settled by quote id, as in the final
+        order.
+
+        The walk also stops after MAX_EXAMINED entries, which bounds the
+        work for any query; the page then holds the best quotes among those
+        examined. Unless the shortest list was walked to its end, the total
+        is estimated from the share of its entries that matched.
+        """
+        quote_authors = self._quote_authors
+        wanted = offset + limit
+        ends = [len(posting) for posting in postings]
+        positions = [0] * len(postings)
+        # Min-heap of the best matches so far: (score, -quote id)
+        best: List[Tuple[float, int]] = []
+        # Quote id -> whether it matches
+        seen: Dict[int, bool] = {}
+        matches = 0
+        shortest_matches = 0
+        examined = 0
+        while examined < MAX_EXAMINED:
+            for i, posting in enumerate(postings):
+                p = positions[i]
+                if p == ends[i]:
+                    # Every match contains this list's word, so all have been seen
+                    return SearchResults(matches, self._page(best, offset))
+                quote_id = posting.ranked[p]
+                positions[i] = p + 1
+                examined += 1
+                matched = seen.get(quote_id)
+                if matched is None:
+                    matched = False
+                    if author_ids is None or quote_authors[quote_id] in author_ids:
+                        total = 0.0
+                        for other, idf in zip(postings, idfs):
+                            if other is posting:
+                                total += idf * -posting.ranked_keys[p]
+                                continue
+                            ids = other.ids
+                            j = bisect_left(ids, quote_id)
+                            if j == len(ids) or ids[j] != quote_id:
+                                break
+                            total += idf * other.weights[j]
+                        else:
+                            matched = True
+                            matches += 1
+                            item = (total, -quote_id)
+                            if len(best) < wanted:
+                                heapq.heappush(best, item)
+                            elif item > best[0]:
+                                heapq.heapreplace(best, item)
+                    seen[quote_id] = matched
+                if i == 0 and matched:
+                    shortest_matches += 1
+
+            if len(best) == wanted:
+                threshold = 0.0
+                next_id = -1
+                for posting, idf, p, end in zip(postings, idfs, positions, ends):
+                    if p == end:
+                        # Exact; returned at the start of the next round
+                        break
+                    threshold += idf * -posting.ranked_keys[p]
+                    next_id = max(next_id, posting.ranked[p])
+                else:
+                    worst_score, worst_negative_id = best[0]
+                    # An unseen quote scoring exactly the threshold has every
+                    # list's next weight, so an id at least that entry's
+                    if worst_score > threshold or (worst_score == threshold and -worst_negative_id < next_id):
+                        break
+
+        shortest_examined = positions[0]
+        estimate = max(matches, round(shortest_matches / shortest_examined * len(postings[0])))
+        return SearchResults(estimate, self._page(best, offset), total_exact=False)
+
+    def _page(self, best: List[Tuple[float, int]], offset: int) -> Tuple[Tuple[int, float], ...]:
+        ranked = sorted(best, reverse=True)
+        return tuple((self._position(-negative_id), score) for score, negative_id in ranked[offset:])
+
+    def _author_page(self, author_ids: FrozenSet[int], offset: int, limit: int) -> SearchResults:
+        lists = [self._author_quotes[a] for a in sorted(author_ids)]
+        total = sum(len(quote_ids) for quote_ids in lists)
+        merged = lists[0] if len(lists) == 1 else heapq.merge(*lists)
+        return SearchResults(total, tuple((self._position(quote_id), 0.0)
+                                          for quote_id in islice(merged, offset, offset + limit)))
@@ -0,0 +1,225 @@
+"""
+Production Server for the Money Motivation API
+=============================================
+
+Runs the API in several uvicorn worker processes that share one listening
+socket, so it can use every CPU core.
+
+The app is imported once, in the parent process, before the workers are
+forked. The content snapshot with all of its pre-encoded and compressed
+bodies is therefore built once and shared by every worker through
+copy-on-write memory instead of being rebuilt in each. The garbage
+collector is frozen before forking, so collections in the workers don't
+write to (and copy) those shared pages.
+
+On SIGTERM or SIGINT every worker stops accepting connections, finishes the
+requests in flight (for up to --graceful-timeout seconds), runs the app's
+lifespan shutdown and exits. A worker that dies unexpectedly is replaced.
+
+Platforms without fork (Windows) fall back to uvicorn's own worker manager,
+which imports the app separately in each worker.
+
+Usage:
+    python serve.py --workers 4
+    python serve.py --workers 4 --host 0.0.0.0 --port 8000
+
+Version: 1.0.0
+License: MIT
+"""
+
+import argparse
+import gc
+import logging
+import os
+import shutil
+import signal
+import socket
+import tempfile
+import time
+from typing import Dict
+
+import uvicorn
+
+from rate_limit import MemoryBackend
+
+logger = logging.getLogger("serve")
+
+# Workers that die within this many seconds of starting are not restarted,
+# since they would most likely fail again
+MIN_WORKER_UPTIME = 5.0
+
+
+def create_socket(host: str, port: int, backlog: int) -> socket.socket:
+    """
+    Open the listening socket shared by all workers.
+
+    Args:
+        host: The address to bind
+        port: The port to bind
+        backlog: The maximum number of pending connections
+
+    Returns:
+        socket.socket: The bound, listening socket
+    """
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    # The protocol must be given explicitly: asyncio only disables Nagle's
+    # algorithm (TCP_NODELAY) on accepted sockets whose proto is IPPROTO_TCP,
+    # and without it each response waits ~40 ms for a delayed ACK
+    sock = socket.socket(family, socket.SOCK_STREAM, socket.IPPROTO_TCP)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(app, sock: socket.socket, args) -> None:
+    """Serve requests on the shared socket until told to stop (runs in a child)"""
+    config = uvicorn.Config(
+        app,
+        lifespan="on",
+        # The app writes its own access log (see access_log.py)
+        access_log=False,
+        backlog=args.backlog,
+        timeout_graceful_shutdown=args.graceful_timeout,
+    )
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def spawn_worker(app, sock: socket.socket, args) -> int:
+    """
+    Fork a worker process.
+
+    Returns:
+        int: The worker's process id
+    """
+    pid = os.fork()
+    if pid == 0:
+        # Leave the terminal's process group, so Ctrl+C reaches only the
+        # parent, which then stops each worker exactly once (a second signal
+        # makes uvicorn exit without draining)
+        os.setpgrp()
+        # Let uvicorn install its own handlers for a graceful shutdown
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        try:
+            run_worker(app, sock, args)
+        except BaseException:
+            logger.exception("Worker crashed")
+            os._exit(1)
+        os._exit(0)
+    return pid
+
+
+def serve(args) -> None:
+    """Preload the app, fork the workers and supervise them until shutdown"""
+    metrics_dir = args.metrics_dir or os.getenv("METRICS_DIR")
+    owns_metrics_dir = False
+    if args.workers > 1 and not metrics_dir:
+        # Workers need a shared directory for /metrics to cover all of them
+        metrics_dir = tempfile.mkdtemp(prefix="api-metrics-")
+        owns_metrics_dir = True
+    if metrics_dir:
+        # Counters from a previous run would be added to the new ones
+        shutil.rmtree(metrics_dir, ignore_errors=True)
+        os.makedirs(metrics_dir, exist_ok=True)
+        os.environ["METRICS_DIR"] = metrics_dir
+
+    # Preload: build the content snapshot and everything else once (after
+    # METRICS_DIR is set, since the app reads it on import)
+    import Fastapi
+    if args.workers > 1 and isinstance(Fastapi.rate_limiter.backend, MemoryBackend):
+        logger.warning("Each worker keeps its own rate limits; set RATE_LIMIT_BACKEND=sqlite to share them")
+
+    sock = create_socket(args.host, args.port, args.backlog)
+    logger.info(f"Listening on http://{args.host}:{args.port} with {args.workers} workers")
+
+    # Objects that exist now are never collected, so collections in the
+    # workers leave the shared pages untouched
+    gc.collect()
+    gc.freeze()
+
+    stopping = False
+
+    def stop(signum, frame) -> None:
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    # pid -> start time
+    workers: Dict[int, float] = {}
+    for _ in range(args.workers):
+        workers[spawn_worker(Fastapi.app, sock, args)] = time.monotonic()
+
+    try:
+        while workers and not stopping:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                time.sleep(0.2)
+                continue
+            started = workers.pop(pid, None)
+            if started is None:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            if time.monotonic() - started < MIN_WORKER_UPTIME:
+                logger.error(f"Worker {pid} exited with {code} during startup; not restarting it")
+            else:
+                logger.warning(f"Worker {pid} exited with {code}; starting a replacement")
+                workers[spawn_worker(Fastapi.app, sock, args)] = time.monotonic()
+
+        # Graceful shutdown: each worker drains its connections and exits
+        logger.info("Shutting down workers...")
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + args.graceful_timeout + 5
+        while workers and time.monotonic() < deadline:
+            pid, _ = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                time.sleep(0.1)
+            else:
+                workers.pop(pid, None)
+        for pid in workers:
+            logger.warning(f"Worker {pid} did not stop in time; killing it")
+            os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+    finally:
+        sock.close()
+        if owns_metrics_dir:
+            shutil.rmtree(metrics_dir, ignore_errors=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the Money Motivation API with several worker processes")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind")
+    parser.add_argument("--port", type=int, default=8000, help="Port to bind")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes (default: one per CPU core)")
+    parser.add_argument("--graceful-timeout", type=int, default=30,
+                        help="Seconds each worker may spend finishing requests on shutdown")
+    parser.add_argument("--backlog", type=int, default=2048, help="Maximum number of pending connections")
+    parser.add_argument("--metrics-dir", help="Directory the workers share metrics in "
+                        "(default: $METRICS_DIR, or a temporary directory)")
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    if not hasattr(os, "fork"):
+        logger.warning("fork is not available; workers will each load the app themselves")
+        uvicorn.run("Fastapi:app", host=args.host, port=args.port, workers=args.workers,
+                    access_log=False, backlog=args.backlog,
+                    timeout_graceful_shutdown=args.graceful_timeout)
+        return
+    serve(args)
+
+
+if __name__ == "__main__":
+    main()
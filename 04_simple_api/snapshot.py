@@ -0,0 +1,350 @@
+"""
+Data Snapshots for the Money Motivation API
+==========================================
+
+The API serves a small, fixed set of strings, so every possible response body
+can be encoded once instead of on every request. A Snapshot holds one version
+of the data together with its pre-encoded JSON bodies and response headers.
+
+Snapshots are immutable. Publishing new data builds a complete new snapshot
+first and then replaces the reference in a single assignment, so a request
+always sees either the old or the new data set, never a mix of both, and
+readers never need a lock.
+
+Bodies that are worth compressing (like the full lists) are also compressed
+once per snapshot, with gzip and with brotli when the brotli package is
+installed, and carry an ETag and Last-Modified date for conditional requests
+(see http_cache.py). The money quotes are also indexed for search once per
+snapshot (see search.py).
+
+Version: 1.0.0
+License: MIT
+"""
+
+import gzip
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+try:
+    import brotli
+except ImportError:  # Optional: without it, only gzip is offered
+    brotli = None
+
+from fastapi.routing import APIRoute
+from starlette.background import BackgroundTask
+from starlette.requests import Request
+from starlette.responses import Response
+
+from search import QuoteIndex
+
+JSON_MEDIA_TYPE = "application/json"
+
+# Raw ASGI header list: (name, value) byte pairs
+RawHeaders = Tuple[Tuple[bytes, bytes], ...]
+
+# Random picks must never be served from a cache
+NO_STORE: RawHeaders = ((b"cache-control", b"no-store"),)
+# Bodies smaller than this gain too little from compression to be worth it
+MIN_COMPRESS_SIZE = 512
+
+# Content codings in order of preference. Compression runs once per snapshot,
+# so the slowest, strongest settings are used
+COMPRESSORS: Dict[str, Callable[[bytes], bytes]] = {}
+if brotli is not None:
+    COMPRESSORS["br"] = lambda body: brotli.compress(body, quality=11)
+COMPRESSORS["gzip"] = lambda body: gzip.compress(body, compresslevel=9, mtime=0)
+
+
+def encode_json(content) -> bytes:
+    """
+    Encode a value exactly as FastAPI's default JSONResponse does.
+
+    Args:
+        content: Any JSON-serializable value
+
+    Returns:
+        bytes: The compact UTF-8 JSON encoding
+    """
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+@dataclass(frozen=True)
+class EncodedBody:
+    """A pre-encoded response body and the headers that go with it"""
+    body: bytes
+    raw_headers: RawHeaders
+
+    @classmethod
+    def from_content(cls, content, media_type: str = JSON_MEDIA_TYPE,
+                     headers: RawHeaders = ()) -> "EncodedBody":
+        return cls.from_bytes(encode_json(content), media_type, headers)
+
+    @classmethod
+    def from_bytes(cls, body: bytes, media_type: str = JSON_MEDIA_TYPE,
+                   headers: RawHeaders = ()) -> "EncodedBody":
+        raw_headers = (
+            (b"content-length", str(len(body)).encode("latin-1")),
+            (b"content-type", media_type.encode("latin-1")),
+        ) + tuple(headers)
+        return cls(body, raw_headers)
+
+
+def http_date(timestamp: float) -> str:
+    """Format a Unix timestamp as an HTTP date (e.g. Sun, 06 Nov 1994 08:49:37 GMT)"""
+    return time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(timestamp))
+
+
+def content_digest(*parts: bytes) -> str:
+    """A short hash identifying some content, for use in ETags"""
+    h = hashlib.blake2b(digest_size=8)
+    for part in parts:
+        h.update(part)
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+@dataclass(frozen=True)
+class CacheableBody:
+    """
+    A pre-encoded body with cache validators and precompressed variants.
+
+    ETags are weak: the compressed variants share the ETag of the
+    uncompressed body, since they represent the same content.
+    """
+    etag: bytes
+    last_modified: float
+    identity: EncodedBody
+    # (content coding, body) pairs, in order of preference
+    compressed: Tuple[Tuple[str, EncodedBody], ...]
+    # Headers sent with a 304 Not Modified response
+    not_modified_headers: RawHeaders
+
+    @classmethod
+    def build(cls, body: bytes, cache_control: str, last_modified: float,
+              media_type: str = JSON_MEDIA_TYPE) -> "CacheableBody":
+        """
+        Compute the validators of a body and compress it.
+
+        Args:
+            body: The encoded body
+            cache_control: The Cache-Control header value
+            last_modified: When the content last changed (Unix time)
+            media_type: The body's media type
+
+        Returns:
+            CacheableBody: The body and its variants
+        """
+        etag = f'W/"{content_digest(body)}"'.encode("latin-1")
+        headers = (
+            (b"etag", etag),
+            (b"last-modified", http_date(last_modified).encode("latin-1")),
+            (b"cache-control", cache_control.encode("latin-1")),
+        )
+        compressed = []
+        if len(body) >= MIN_COMPRESS_SIZE:
+            headers += ((b"vary", b"accept-encoding"),)
+            for coding, compress in COMPRESSORS.items():
+                compressed_body = compress(body)
+                if len(compressed_body) < len(body):
+                    compressed.append((coding, EncodedBody.from_bytes(
+                        compressed_body, media_type,
+                        ((b"content-encoding", coding.encode("latin-1")),) + headers,
+                    )))
+        return cls(
+            etag=etag,
+            last_modified=last_modified,
+            identity=EncodedBody.from_bytes(body, media_type, headers),
+            compressed=tuple(compressed),
+            not_modified_headers=headers,
+        )
+
+
+class PreEncodedResponse(Response):
+    """
+    A response that sends an EncodedBody as-is.
+
+    Skips JSON encoding, response model validation and header rendering. The
+    header list is copied, so middleware can still add headers safely.
+    """
+
+    def __init__(self, encoded: EncodedBody, status_code: int = 200,
+                 background: Optional[BackgroundTask] = None) -> None:
+        self.status_code = status_code
+        self.background = background
+        self.body = encoded.body
+        self.raw_headers = list(encoded.raw_headers)
+
+
+class PreEncodedRoute(APIRoute):
+    """
+    A route whose endpoint is called with the raw Request.
+
+    FastAPI's default handler resolves dependencies, validates parameters and
+    serializes the return value on every request, which costs more than
+    picking a pre-encoded body. Endpoints on this route take the Request as
+    their only argument and return a Response. They still appear in the
+    OpenAPI docs with their response model.
+    """
+
+    def get_route_handler(self) -> Callable:
+        endpoint = self.endpoint
+
+        async def handler(request: Request) -> Response:
+            return await endpoint(request)
+
+        return handler
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """One immutable version of the API's data and its encoded responses"""
+    version: int
+    created_at: float
+    # When the content last changed, e.g. the content file's modification time
+    modified_at: float
+    # Identifies the content; unlike version, it is the same in every worker
+    digest: str
+    side_hustles: Tuple[str, ...]
+    money_quotes: Tuple[str, ...]
+    side_hustle_bodies: Tuple[EncodedBody, ...]
+    money_quote_bodies: Tuple[EncodedBody, ...]
+    # Each item encoded as a JSON string, for assembling batch responses
+    side_hustle_json: Tuple[bytes, ...]
+    money_quote_json: Tuple[bytes, ...]
+    # The full lists, for the /all endpoints
+    side_hustle_list: CacheableBody
+    money_quote_list: CacheableBody
+    # Search index over the money quotes, and their authors with quote counts
+    quote_index: QuoteIndex
+    money_quote_authors: CacheableBody
+
+    @property
+    def age(self) -> float:
+        """Seconds since this snapshot was built"""
+        return time.time() - self.created_at
+
+
+# Cache-Control for the full lists: shared caches may keep them briefly
+LIST_CACHE_CONTROL = "public, max-age=60"
+
+
+def build_snapshot(side_hustles: Iterable[str], money_quotes: Iterable[str],
+                   version: int = 1, modified_at: Optional[float] = None,
+                   previous: Optional[Snapshot] = None) -> Snapshot:
+    """
+    Build a snapshot and pre-encode every response body it can produce.
+
+    Args:
+        side_hustles: The side hustle ideas
+        money_quotes: The money quotes
+        version: The snapshot version number
+        modified_at: When the content last changed; defaults to now
+        previous: The snapshot being replaced; its search index is updated
+            rather than rebuilt when only a few quotes changed
+
+    Returns:
+        Snapshot: The new snapshot
+
+    Raises:
+        ValueError: If either collection is empty
+    """
+    side_hustles = tuple(side_hustles)
+    money_quotes = tuple(money_quotes)
+    if not side_hustles or not money_quotes:
+        raise ValueError("Side hustles and money quotes must not be empty")
+
+    created_at = time.time()
+    if modified_at is None:
+        modified_at = created_at
+    side_hustle_json = tuple(encode_json(item) for item in side_hustles)
+    money_quote_json = tuple(encode_json(item) for item in money_quotes)
+    quote_index = previous.quote_index.updated(money_quotes) if previous else QuoteIndex(money_quotes)
+    return Snapshot(
+        version=version,
+        created_at=created_at,
+        modified_at=modified_at,
+        digest=content_digest(*side_hustle_json, b"", *money_quote_json),
+        side_hustles=side_hustles,
+        money_quotes=money_quotes,
+        side_hustle_bodies=tuple(EncodedBody.from_content({"side_hustle": item}, headers=NO_STORE)
+                                 for item in side_hustles),
+        money_quote_bodies=tuple(EncodedBody.from_content({"money_quote": item}, headers=NO_STORE)
+                                 for item in money_quotes),
+        side_hustle_json=side_hustle_json,
+        money_quote_json=money_quote_json,
+        side_hustle_list=CacheableBody.build(
+            join_batch("side_hustles", side_hustle_json), LIST_CACHE_CONTROL, modified_at),
+        money_quote_list=CacheableBody.build(
+            join_batch("money_quotes", money_quote_json), LIST_CACHE_CONTROL, modified_at),
+        quote_index=quote_index,
+        money_quote_authors=CacheableBody.build(
+            encode_json({"authors": [{"author": author, "count": count}
+                                     for author, count in quote_index.authors()]}),
+            LIST_CACHE_CONTROL, modified_at),
+    )
+
+
+def join_batch(key: str, items_json: Sequence[bytes]) -> bytes:
+    """Join pre-encoded items into a {key: [items]} JSON body"""
+    return b'{"%s":[%s]}' % (key.encode(), b",".join(items_json))
+
+
+def encode_batch(key: str, items_json: Sequence[bytes]) -> EncodedBody:
+    """
+    Assemble a {key: [items]} JSON body from pre-encoded items.
+
+    Args:
+        key: The top-level key, e.g. "money_quotes"
+        items_json: The items, each already encoded as a JSON string
+
+    Returns:
+        EncodedBody: The batch response body
+    """
+    return EncodedBody.from_bytes(join_batch(key, items_json), headers=NO_STORE)
+
+
+class SnapshotHolder:
+    """
+    Holds the current snapshot and publishes new ones atomically.
+
+    Reading `holder.current` is a single attribute lookup. Request handlers
+    should read it once and use that snapshot for the whole request. Only
+    writers take a lock, so concurrent publishes get distinct versions.
+    """
+
+    def __init__(self, side_hustles: Sequence[str], money_quotes: Sequence[str],
+                 modified_at: Optional[float] = None):
+        self.current: Snapshot = build_snapshot(side_hustles, money_quotes, modified_at=modified_at)
+        self._publish_lock = threading.Lock()
+
+    def publish(self, side_hustles: Sequence[str], money_quotes: Sequence[str],
+                modified_at: Optional[float] = None) -> Snapshot:
+        """
+        Replace the data set.
+
+        The new snapshot is fully built before it becomes visible. If building
+        it fails, the current snapshot stays in place.
+
+        Args:
+            side_hustles: The new side hustle ideas
+            money_quotes: The new money quotes
+            modified_at: When the content last changed; defaults to now
+
+        Returns:
+            Snapshot: The newly published snapshot
+        """
+        with self._publish_lock:
+            snapshot = build_snapshot(side_hustles, money_quotes, self.current.version + 1, modified_at,
+                                      previous=self.current)
+            self.current = snapshot
+        return snapshot
@@ -0,0 +1,206 @@
+"""
+Content Store for the Money Motivation API
+=========================================
+
+Keeps the side hustles and money quotes in a JSON file instead of in code:
+
+    {"side_hustles": ["..."], "money_quotes": ["..."]}
+
+The file is loaded into an immutable snapshot at startup. A background task
+polls the file's modification time and size and publishes a new snapshot
+when it changes, so the content can be edited without a redeploy. Admin
+writes go through the store: the file is rewritten atomically and the new
+snapshot is published immediately.
+
+Request handlers only ever read `holder.current`, which is replaced in a
+single assignment, so they never take a lock or see a half-loaded list.
+
+Version: 1.0.0
+License: MIT
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from snapshot import Snapshot, SnapshotHolder
+
+logger = logging.getLogger(__name__)
+
+CONTENT_KINDS = ("side_hustles", "money_quotes")
+# Seconds between checks for changes to the content file
+DEFAULT_POLL_INTERVAL = 2.0
+
+# (modification time in ns, size) of the content file
+FileSignature = Tuple[int, int]
+
+
+class ContentError(Exception):
+    """Raised when the content file is missing or malformed"""
+
+
+class ContentStore:
+    """
+    A JSON content file published as API snapshots.
+
+    Args:
+        path: The content file
+        poll_interval: Seconds between checks for changes
+    """
+
+    def __init__(self, path: str, poll_interval: float = DEFAULT_POLL_INTERVAL):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._write_lock = threading.Lock()
+        content, self._signature = self._read()
+        self.holder = SnapshotHolder(content["side_hustles"], content["money_quotes"],
+                                     modified_at=self._signature[0] / 1e9)
+
+    @property
+    def current(self) -> Snapshot:
+        """The snapshot currently being served"""
+        return self.holder.current
+
+    def _stat(self) -> FileSignature:
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _read(self) -> Tuple[Dict[str, List[str]], FileSignature]:
+        """
+        Read and validate the content file.
+
+        Raises:
+            ContentError: If the file can't be read or has the wrong shape
+        """
+        try:
+            signature = self._stat()
+            with open(self.path, "r", encoding="utf-8") as f:
+                content = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ContentError(f"Could not load {self.path}: {str(e)}") from e
+
+        if not isinstance(content, dict):
+            raise ContentError(f"{self.path} must contain a JSON object")
+        for kind in CONTENT_KINDS:
+            items = content.get(kind)
+            if not isinstance(items, list) or not items or not all(isinstance(i, str) and i for i in items):
+                raise ContentError(f"{self.path}: {kind} must be a non-empty list of strings")
+        return content, signature
+
+    def reload_if_changed(self) -> Optional[Snapshot]:
+        """
+        Publish a new snapshot if the content file changed on disk.
+
+        A file that fails to load is logged once and skipped; the current
+        snapshot stays in place until the file is fixed.
+
+        Returns:
+            The new snapshot, or None if nothing changed
+        """
+        # Hold the write lock throughout, so a concurrent admin write can't be
+        # overwritten by content read before it
+        with self._write_lock:
+            try:
+                signature = self._stat()
+                if signature == self._signature:
+                    return None
+                content, signature = self._read()
+            except (OSError, ContentError) as e:
+                logger.error(f"Content reload failed: {str(e)}")
+                # Don't retry until the file changes again
+                if isinstance(e, ContentError):
+                    self._signature = signature
+                return None
+            snapshot = self.holder.publish(content["side_hustles"], content["money_quotes"],
+                                           modified_at=signature[0] / 1e9)
+            self._signature = signature
+        logger.info(f"Content reloaded from {self.path} (version {snapshot.version})")
+        return snapshot
+
+    async def watch(self) -> None:
+        """
+        Poll the content file until cancelled.
+
+        Loading and encoding run in a worker thread, so a large file never
+        blocks the event loop.
+        """
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            await asyncio.to_thread(self.reload_if_changed)
+
+    def _write(self, content: Dict[str, List[str]]) -> Snapshot:
+        """Atomically rewrite the content file and publish it (lock held)"""
+        for kind in CONTENT_KINDS:
+            if not content[kind]:
+                raise ValueError(f"{kind} must not be empty")
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({kind: content[kind] for kind in CONTENT_KINDS}, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        os.replace(tmp_path, self.path)
+        self._signature = self._stat()
+        return self.holder.publish(content["side_hustles"], content["money_quotes"],
+                                   modified_at=self._signature[0] / 1e9)
+
+    def add(self, kind: str, text: str) -> Snapshot:
+        """
+        Add an entry and publish the new content.
+
+        Args:
+            kind: "side_hustles" or "money_quotes"
+            text: The entry to add
+
+        Returns:
+            Snapshot: The new snapshot
+
+        Raises:
+            ValueError: If the entry already exists
+        """
+        with self._write_lock:
+            # Start from the file, so edits made on disk aren't lost
+            content, _ = self._read()
+            if text in content[kind]:
+                raise ValueError(f"Entry already exists in {kind}")
+            content[kind].append(text)
+            return self._write(content)
+
+    def remove(self, kind: str, text: str) -> Snapshot:
+        """
+        Remove an entry and publish the new content.
+
+        Args:
+            kind: "side_hustles" or "money_quotes"
+            text: The entry to remove
+
+        Returns:
+            Snapshot: The new snapshot
+
+        Raises:
+            KeyError: If the entry doesn't exist
+            ValueError: If it is the last entry of its kind
+        """
+        with self._write_lock:
+            content, _ = self._read()
+            if text not in content[kind]:
+                raise KeyError(text)
+            if len(content[kind]) == 1:
+                raise ValueError(f"Cannot remove the last entry in {kind}")
+            content[kind].remove(text)
+            return self._write(content)
+
+    def replace(self, side_hustles: List[str], money_quotes: List[str]) -> Snapshot:
+        """
+        Replace all content and publish it.
+
+        Args:
+            side_hustles: The new side hustle ideas
+            money_quotes: The new money quotes
+
+        Returns:
+            Snapshot: The new snapshot
+        """
+        with self._write_lock:
+            return self._write({"side_hustles": list(side_hustles), "money_quotes": list(money_quotes)})
@@ -0,0 +1,35 @@
+"""
+Tests for loadtest.py
+
+Run with: python -m unittest test_loadtest
+"""
+
+import unittest
+
+from loadtest import parse_mix
+
+
+class ParseMixTest(unittest.TestCase):
+    def test_weights(self):
+        self.assertEqual(parse_mix(["/=1", "/side_hustles=4", "/health=0.5"]),
+                         {"/": 1.0, "/side_hustles": 4.0, "/health": 0.5})
+
+    def test_path_without_weight_counts_one(self):
+        self.assertEqual(parse_mix(["/money_quotes"]), {"/money_quotes": 1.0})
+
+    def test_query_string_without_weight(self):
+        self.assertEqual(parse_mix(["/side_hustles?count=5"]), {"/side_hustles?count=5": 1.0})
+        self.assertEqual(parse_mix(["/money_quotes/search?q=money&limit=10"]),
+                         {"/money_quotes/search?q=money&limit=10": 1.0})
+
+    def test_query_string_with_weight(self):
+        self.assertEqual(parse_mix(["/side_hustles?count=5=4"]), {"/side_hustles?count=5": 4.0})
+
+    def test_invalid_weights(self):
+        for item in ("/side_hustles=0", "/side_hustles=-1", "/side_hustles=four", "/side_hustles?count=5=x"):
+            with self.subTest(item=item), self.assertRaises(ValueError):
+                parse_mix([item])
+
+
+if __name__ == "__main__":
+    unittest.main()
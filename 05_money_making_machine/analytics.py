@@ -0,0 +1,363 @@
+"""
+Transaction Log Analytics for the Money Making Machine
+=====================================================
+
+Daily and hourly totals, counts, percentiles and moving averages over the
+transaction log (see transaction_log.py) and its rotated archives, however
+large they get.
+
+- Parsing: files are memory-mapped and scanned in chunks with one compiled
+  regular expression. Matching lines are counted by (day, hour, value) with
+  a Counter, so the Python-level work per chunk depends on how many distinct
+  hours and amounts it holds, not on its number of lines. Nothing is loaded
+  into memory whole.
+- Caching: the results for each file are cached, with how far into the file
+  they count, in logs/analytics_cache.json. Archives don't change, so they
+  are scanned once. For the current log only the bytes appended since the
+  last scan are read. When the log is rotated, its archive is recognized by
+  its first bytes, so it isn't scanned again either.
+- Cold scans (no cache yet, or new archives) can be split over several
+  processes with workers > 1.
+
+Version: 1.0.0
+License: MIT
+"""
+
+import bisect
+import copy
+import glob
+import hashlib
+import json
+import logging
+import mmap
+import os
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from transaction_log import DEFAULT_DIRECTORY, DEFAULT_FILENAME, QUOTE_EVENT, SIDE_HUSTLE_EVENT
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILENAME = "analytics_cache.json"
+# Bytes matched per regex call (bounds the memory used for match results)
+CHUNK_SIZE = 16 * 1024 * 1024
+# Cold scans with several workers split files into ranges of about this size
+PARALLEL_RANGE_SIZE = 64 * 1024 * 1024
+# Bytes at the start of a file that identify it across renames
+HEAD_SIZE = 4096
+
+# "2025-04-24 18:30:05, 250", "..., side_hustle" or "..., quote"
+LINE_RE = re.compile(rb"^(\d{4}-\d\d-\d\d) (\d\d):\d\d:\d\d, ?(\d+|side_hustle|quote)\r?$", re.MULTILINE)
+_SIDE_HUSTLE = SIDE_HUSTLE_EVENT.encode()
+_QUOTE = QUOTE_EVENT.encode()
+
+# Per-period values: [money total, money count, side hustles, quotes]
+TOTAL, COUNT, SIDE_HUSTLES, QUOTES = range(4)
+
+
+@dataclass
+class Aggregates:
+    """Totals of a log segment, mergeable with those of other segments"""
+    # "YYYY-MM-DD" -> [money total, money count, side hustles, quotes]
+    daily: Dict[str, List[int]] = field(default_factory=dict)
+    # "YYYY-MM-DD HH" -> the same
+    hourly: Dict[str, List[int]] = field(default_factory=dict)
+    # amount -> number of times generated, for exact percentiles
+    amounts: Dict[int, int] = field(default_factory=dict)
+
+    def add_counts(self, counts: Dict[Tuple[bytes, bytes, bytes], int]) -> None:
+        """Add (day, hour, value) -> count from LINE_RE matches"""
+        daily, hourly, amounts = self.daily, self.hourly, self.amounts
+        for (day, hour, value), n in counts.items():
+            day = day.decode()
+            day_values = daily.get(day)
+            if day_values is None:
+                day_values = daily[day] = [0, 0, 0, 0]
+            hour_key = f"{day} {hour.decode()}"
+            hour_values = hourly.get(hour_key)
+            if hour_values is None:
+                hour_values = hourly[hour_key] = [0, 0, 0, 0]
+            if value == _SIDE_HUSTLE:
+                day_values[SIDE_HUSTLES] += n
+                hour_values[SIDE_HUSTLES] += n
+            elif value == _QUOTE:
+                day_values[QUOTES] += n
+                hour_values[QUOTES] += n
+            else:
+                amount = int(value)
+                day_values[TOTAL] += amount * n
+                day_values[COUNT] += n
+                hour_values[TOTAL] += amount * n
+                hour_values[COUNT] += n
+                amounts[amount] = amounts.get(amount, 0) + n
+
+    def merge(self, other: "Aggregates") -> None:
+        """Add another segment's totals to these"""
+        for mine, theirs in ((self.daily, other.daily), (self.hourly, other.hourly)):
+            for key, values in theirs.items():
+                current = mine.get(key)
+                if current is None:
+                    mine[key] = list(values)
+                else:
+                    for i, value in enumerate(values):
+                        current[i] += value
+        for amount, n in other.amounts.items():
+            self.amounts[amount] = self.amounts.get(amount, 0) + n
+
+    def totals(self) -> List[int]:
+        """[money total, money count, side hustles, quotes] over everything"""
+        return [sum(values[i] for values in self.daily.values()) for i in range(4)]
+
+    def percentiles(self, qs: Sequence[float]) -> List[Optional[int]]:
+        """
+        Exact percentiles of the generated amounts (nearest rank).
+
+        Args:
+            qs: Percentiles between 0 and 100
+
+        Returns:
+            The amount at each percentile, or None if there are no amounts
+        """
+        if not self.amounts:
+            return [None for _ in qs]
+        values = sorted(self.amounts)
+        cumulative = []
+        running = 0
+        for value in values:
+            running += self.amounts[value]
+            cumulative.append(running)
+        results = []
+        for q in qs:
+            rank = max(1, -(-q * running // 100))
+            results.append(values[bisect.bisect_left(cumulative, rank)])
+        return results
+
+    def to_json(self) -> dict:
+        return {"daily": self.daily, "hourly": self.hourly,
+                "amounts": {str(amount): n for amount, n in self.amounts.items()}}
+
+    @classmethod
+    def from_json(cls, data: dict) -> "Aggregates":
+        return cls(data["daily"], data["hourly"], {int(amount): n for amount, n in data["amounts"].items()})
+
+
+def moving_average(values: Sequence[float], window: int) -> List[float]:
+    """
+    Trailing moving average.
+
+    Args:
+        values: Evenly spaced values, e.g. one per day
+        window: The number of values averaged; fewer at the start
+
+    Returns:
+        The average ending at each position
+    """
+    averages = []
+    running = 0.0
+    for i, value in enumerate(values):
+        running += value
+        if i >= window:
+            running -= values[i - window]
+        averages.append(running / min(i + 1, window))
+    return averages
+
+
+def complete_end(path: str, start: int, size: int) -> int:
+    """The offset just after the last complete line before size"""
+    if size <= start:
+        return start
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return mm.rfind(b"\n", start, size) + 1 or start
+
+
+def scan_range(path: str, start: int, end: int) -> Aggregates:
+    """
+    Aggregate the lines of a file between two offsets.
+
+    Both offsets must be at line starts (0, or just after a newline).
+
+    Args:
+        path: The log file
+        start: The first byte to read
+        end: The byte after the last one to read
+
+    Returns:
+        Aggregates: The totals of those lines
+    """
+    aggregates = Aggregates()
+    if end <= start:
+        return aggregates
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = start
+        while pos < end:
+            chunk_end = min(end, pos + CHUNK_SIZE)
+            if chunk_end < end:
+                # Stop at a line boundary
+                chunk_end = mm.rfind(b"\n", pos, chunk_end) + 1 or end
+            aggregates.add_counts(Counter(LINE_RE.findall(mm, pos, chunk_end)))
+            pos = chunk_end
+    return aggregates
+
+
+def split_ranges(path: str, start: int, end: int, size: int) -> List[Tuple[str, int, int]]:
+    """Split a file's byte range into line-aligned ranges of about size bytes"""
+    ranges = []
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        while start < end:
+            stop = min(end, start + size)
+            if stop < end:
+                stop = mm.rfind(b"\n", start, stop) + 1 or end
+            ranges.append((path, start, stop))
+            start = stop
+    return ranges
+
+
+def _scan_task(task: Tuple[str, int, int]) -> Aggregates:
+    return scan_range(*task)
+
+
+def _head_digest(path: str, length: int) -> str:
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(length), digest_size=16).hexdigest()
+
+
+class LogAnalyzer:
+    """
+    Incrementally maintained aggregates over a transaction log and its archives.
+
+    Thread safe; one instance can serve every session.
+
+    Args:
+        directory: Where the log and its archives are
+        filename: The name of the current log file
+        cache_path: Where to keep the per-file cache; defaults to
+            <directory>/analytics_cache.json
+    """
+
+    def __init__(self, directory: str = DEFAULT_DIRECTORY, filename: str = DEFAULT_FILENAME,
+                 cache_path: Optional[str] = None):
+        self.directory = directory
+        self.path = os.path.join(directory, filename)
+        self.cache_path = cache_path or os.path.join(directory, CACHE_FILENAME)
+        # path -> {"offset", "size", "mtime_ns", "head_length", "head", "aggregates": Aggregates}
+        self._entries: Dict[str, dict] = self._load_cache()
+        self._total: Optional[Aggregates] = None
+        self._lock = threading.Lock()
+
+    def _load_cache(self) -> Dict[str, dict]:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+            for entry in entries.values():
+                entry["aggregates"] = Aggregates.from_json(entry["aggregates"])
+            return entries
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning(f"Ignoring unreadable analytics cache {self.cache_path}: {str(e)}")
+            return {}
+
+    def _save_cache(self) -> None:
+        data = {path: {**entry, "aggregates": entry["aggregates"].to_json()} for path, entry in self._entries.items()}
+        tmp_path = f"{self.cache_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.error(f"Error saving analytics cache: {str(e)}")
+
+    def files(self) -> List[str]:
+        """The archives, oldest first, then the current log"""
+        archives = sorted(glob.glob(glob.escape(self.path) + ".*"))
+        return archives + ([self.path] if os.path.exists(self.path) else [])
+
+    def _reusable(self, path: str, size: int, candidates: List[dict]) -> Optional[dict]:
+        # A cached entry still describes this file if the file begins with the
+        # same bytes and hasn't shrunk. An empty file's entry has no bytes to
+        # compare (every file begins with them), so it is never reused
+        for entry in candidates:
+            if 0 < entry["head_length"] <= size and entry["offset"] <= size and \
+                    _head_digest(path, entry["head_length"]) == entry["head"]:
+                return entry
+        return None
+
+    def refresh(self, workers: int = 1) -> Aggregates:
+        """
+        Bring the cache up to date and return the totals over all files.
+
+        Args:
+            workers: Processes to use for scanning; only worth it for large
+                cold scans
+
+        Returns:
+            Aggregates: The totals of every complete line in every file;
+            don't modify them, they are reused until the files change
+        """
+        with self._lock:
+            return self._refresh_locked(workers)
+
+    def _refresh_locked(self, workers: int) -> Aggregates:
+        old_entries = self._entries
+        files = self.files()
+
+        entries: Dict[str, dict] = {}
+        stats = {}
+        for path in files:
+            stat = stats[path] = os.stat(path)
+            cached = old_entries.get(path)
+            if cached is not None and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+                entries[path] = cached
+        # Cached entries of files that no longer exist under their name, e.g.
+        # the current log before it was rotated
+        orphans = [entry for path, entry in old_entries.items()
+                   if (path not in files or path == self.path) and path not in entries]
+        # Ids of the old entries reused so far; each describes at most one file
+        claimed = set()
+
+        tasks: List[Tuple[str, int, int]] = []
+        changed = set(old_entries) - set(files)
+        for path in files:
+            if path in entries:
+                continue
+            stat = stats[path]
+            cached = old_entries.get(path)
+            changed.add(path)
+            candidates = [entry for entry in ([cached] if cached else []) + orphans if id(entry) not in claimed]
+            entry = self._reusable(path, stat.st_size, candidates)
+            if entry is None:
+                entry = {"offset": 0, "aggregates": Aggregates()}
+            else:
+                claimed.add(id(entry))
+                # Copied, so the old entry's totals never change
+                entry = dict(entry, aggregates=copy.deepcopy(entry["aggregates"]))
+            end = complete_end(path, entry["offset"], stat.st_size)
+            head_length = min(stat.st_size, HEAD_SIZE)
+            entry.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns, head_length=head_length,
+                         head=_head_digest(path, head_length))
+            if end > entry["offset"]:
+                if workers > 1:
+                    tasks += split_ranges(path, entry["offset"], end, PARALLEL_RANGE_SIZE)
+                else:
+                    entry["aggregates"].merge(scan_range(path, entry["offset"], end))
+                entry["offset"] = end
+            entries[path] = entry
+
+        if tasks:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                for (path, _, _), aggregates in zip(tasks, pool.map(_scan_task, tasks)):
+                    entries[path]["aggregates"].merge(aggregates)
+
+        self._entries = entries
+        if changed:
+            self._save_cache()
+        if changed or self._total is None:
+            total = Aggregates()
+            for entry in entries.values():
+                total.merge(entry["aggregates"])
+            self._total = total
+        return self._total
@@ -0,0 +1,253 @@
+"""
+API Client for the Money Making Machine
+======================================
+
+A process-wide HTTP client for the Money Motivation API:
+
+- Keep-alive: requests go through one pooled requests.Session, so clicks
+  reuse open connections instead of connecting every time.
+- Retries: failed connections and 429/5xx responses are retried a few
+  times with exponential backoff. Timed-out reads are not retried, so a slow
+  API costs one timeout, not several.
+- Circuit breaker: after several failed calls in a row the API is treated as
+  down. Calls then fail immediately (and the app shows its fallback content)
+  while a background thread probes /health until the API answers again.
+
+Streamlit reruns the script on every interaction, so create the client once
+with st.cache_resource (see main.py).
+
+Version: 1.0.0
+License: MIT
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for a connection and for a response
+CONNECT_TIMEOUT = 2.0
+READ_TIMEOUT = 5.0
+# Retries after the first attempt, and the backoff factor between them
+# (0.2s, 0.4s, ...)
+MAX_RETRIES = 2
+BACKOFF_FACTOR = 0.2
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Connections kept open to the API
+POOL_SIZE = 10
+# Failed calls in a row that open the circuit
+FAILURE_THRESHOLD = 3
+# Seconds between health probes while the circuit is open
+PROBE_INTERVAL = 5.0
+PROBE_TIMEOUT = 2.0
+
+
+def item_key(endpoint: str) -> str:
+    """
+    The key of a single item in an endpoint's response.
+
+    /side_hustles returns {"side_hustle": ...} and /money_quotes returns
+    {"money_quote": ...}; with ?count=N they return a list under the
+    endpoint name instead.
+    """
+    return endpoint[:-1] if endpoint.endswith("s") else endpoint
+
+
+class ApiError(Exception):
+    """The API could not be reached or gave an unusable response"""
+
+
+class CircuitOpenError(ApiError):
+    """The API is considered down, so the call was not attempted"""
+
+
+class CircuitBreaker:
+    """
+    Tracks consecutive failures and stops calls to a failing service.
+
+    The circuit is closed while the service works. After failure_threshold
+    failures in a row it opens: allow() returns False and a background
+    thread calls probe() every probe_interval seconds until it returns True,
+    which closes the circuit again.
+
+    Args:
+        probe: Checks whether the service is back; must not raise
+        failure_threshold: Failures in a row that open the circuit
+        probe_interval: Seconds between probes while open
+    """
+
+    def __init__(self, probe: Callable[[], bool], failure_threshold: int = FAILURE_THRESHOLD,
+                 probe_interval: float = PROBE_INTERVAL):
+        self.probe = probe
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._open = False
+        self._closed_event = threading.Event()
+        self._closed_event.set()
+
+    @property
+    def is_open(self) -> bool:
+        return self._open
+
+    def allow(self) -> bool:
+        """Check whether a call may be made"""
+        return not self._open
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._open or self._failures < self.failure_threshold:
+                return
+            self._open = True
+            self._closed_event.clear()
+        logger.warning(f"Circuit opened after {self._failures} failures in a row; probing in the background")
+        threading.Thread(target=self._probe_until_closed, name="circuit-probe", daemon=True).start()
+
+    def wait_closed(self, timeout: Optional[float] = None) -> bool:
+        """Block until the circuit is closed; returns False on timeout"""
+        return self._closed_event.wait(timeout)
+
+    def _probe_until_closed(self) -> None:
+        while not self._closed_event.wait(self.probe_interval):
+            if self.probe():
+                with self._lock:
+                    self._failures = 0
+                    self._open = False
+                    self._closed_event.set()
+                logger.info("Circuit closed; the service is reachable again")
+
+
+class ApiClient:
+    """
+    Pooled, retrying and circuit-broken client for the Money Motivation API.
+
+    Safe to share between threads, and so between Streamlit sessions.
+
+    Args:
+        base_url: The API's base URL, e.g. http://127.0.0.1:8000
+        pool_size: Connections kept open to the API
+        max_retries: Retries of failed connections and 429/5xx responses
+        failure_threshold: Failed calls in a row that open the circuit
+        probe_interval: Seconds between health probes while the circuit is open
+    """
+
+    def __init__(self, base_url: str, pool_size: int = POOL_SIZE, max_retries: int = MAX_RETRIES,
+                 failure_threshold: int = FAILURE_THRESHOLD, probe_interval: float = PROBE_INTERVAL):
+        self.base_url = base_url.rstrip("/")
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            # A timed-out read is not retried: the API is slow, not down, and
+            # retrying would multiply the wait
+            read=0,
+            status=max_retries,
+            backoff_factor=BACKOFF_FACTOR,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.breaker = CircuitBreaker(self._probe, failure_threshold, probe_interval)
+
+    def get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        GET an API endpoint and decode its JSON response.
+
+        Args:
+            path: The endpoint path, e.g. "side_hustles"
+            params: Query parameters
+
+        Returns:
+            The decoded response
+
+        Raises:
+            CircuitOpenError: If the API is considered down
+            ApiError: If the request failed after retries, or the response
+                wasn't a 200 with valid JSON
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError("API unavailable")
+        try:
+            response = self.session.get(f"{self.base_url}/{path.lstrip('/')}", params=params,
+                                        timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+            if response.status_code != 200:
+                raise ApiError(f"API returned status code {response.status_code}")
+            data = response.json()
+        except ApiError:
+            self.breaker.record_failure()
+            raise
+        except (requests.exceptions.RequestException, ValueError) as e:
+            # ValueError: the body wasn't valid JSON
+            self.breaker.record_failure()
+            raise ApiError(str(e)) from e
+        self.breaker.record_success()
+        return data
+
+    def fetch(self, endpoint: str, fallback: Any) -> Any:
+        """
+        Fetch an item from an endpoint that returns one, e.g. /side_hustles
+        returns {"side_hustle": item}.
+
+        Args:
+            endpoint: The API endpoint, e.g. "money_quotes"
+            fallback: Returned if the API is unavailable or the call fails
+
+        Returns:
+            The item or the fallback
+        """
+        try:
+            data = self.get_json(endpoint)
+        except CircuitOpenError:
+            return fallback
+        except ApiError as e:
+            logger.error(f"Error fetching data from API: {str(e)}")
+            return fallback
+        if not isinstance(data, dict):
+            return fallback
+        return data.get(item_key(endpoint), fallback)
+
+    def fetch_batch(self, endpoint: str, count: int) -> List[Any]:
+        """
+        Fetch several distinct items from an endpoint that supports ?count=N.
+
+        Args:
+            endpoint: The API endpoint, e.g. "side_hustles"
+            count: The number of items wanted; fewer are returned if the
+                API has fewer
+
+        Returns:
+            The items
+
+        Raises:
+            ApiError: If the API is unavailable or the call fails
+        """
+        data = self.get_json(endpoint, params={"count": count, "unique": "true"})
+        items = data.get(endpoint) if isinstance(data, dict) else None
+        if not isinstance(items, list):
+            raise ApiError(f"Unexpected response from /{endpoint}")
+        return items
+
+    def _probe(self) -> bool:
+        try:
+            response = self.session.get(f"{self.base_url}/health", timeout=PROBE_TIMEOUT)
+        except requests.exceptions.RequestException:
+            return False
+        return response.status_code == 200
+
+    def close(self) -> None:
+        self.session.close()
@@ -0,0 +1,146 @@
+"""
+Concurrent API Fetches for the Money Making Machine
+==================================================
+
+Fetches several API resources at once, so a view that needs N of them waits
+for the slowest, not for the sum of all of them.
+
+An AsyncApiClient owns an event loop running in a background thread and an
+httpx.AsyncClient with a keep-alive connection pool on that loop. Streamlit
+code, which is synchronous, hands it a batch of calls with fetch_all_sync();
+coroutines can await fetch_all() on the client's loop directly.
+
+Each call has its own deadline: a call that misses it returns its fallback
+without holding up the others. Calls share the circuit breaker of the
+synchronous ApiClient, so while the API is down they return their fallbacks
+without trying.
+
+Version: 1.0.0
+License: MIT
+"""
+
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import httpx
+
+from api_client import CONNECT_TIMEOUT, POOL_SIZE, READ_TIMEOUT, ApiError, CircuitBreaker, item_key
+
+logger = logging.getLogger(__name__)
+
+# Seconds a call may take before its fallback is used
+DEFAULT_DEADLINE = 5.0
+
+
+@dataclass(frozen=True)
+class Call:
+    """
+    One API call in a batch.
+
+    The endpoint must return a single item under its singular name, like
+    /side_hustles ({"side_hustle": item}) and /money_quotes
+    ({"money_quote": item}) do.
+    """
+    endpoint: str
+    fallback: Any = None
+    params: Optional[Dict[str, Any]] = None
+    deadline: float = DEFAULT_DEADLINE
+
+
+class AsyncApiClient:
+    """
+    Runs batches of API calls concurrently over a shared connection pool.
+
+    Safe to share between threads, and so between Streamlit sessions.
+
+    Args:
+        base_url: The API's base URL, e.g. http://127.0.0.1:8000
+        breaker: A circuit breaker to respect and update, usually the
+            ApiClient's
+        pool_size: Connections kept open to the API
+    """
+
+    def __init__(self, base_url: str, breaker: Optional[CircuitBreaker] = None, pool_size: int = POOL_SIZE):
+        self.base_url = base_url.rstrip("/")
+        self.breaker = breaker
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="async-api", daemon=True)
+        self._thread.start()
+        self._client = asyncio.run_coroutine_threadsafe(self._open(pool_size), self._loop).result()
+
+    async def _open(self, pool_size: int) -> httpx.AsyncClient:
+        # The client must be created on the loop that will use it
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            timeout=httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT),
+        )
+
+    async def fetch(self, call: Call) -> Any:
+        """
+        Make one call.
+
+        Returns:
+            The item, or the call's fallback if the API is unavailable, the
+            call fails or it misses its deadline
+        """
+        breaker = self.breaker
+        if breaker is not None and not breaker.allow():
+            return call.fallback
+        try:
+            async with asyncio.timeout(call.deadline):
+                response = await self._client.get(f"/{call.endpoint}", params=call.params)
+            if response.status_code != 200:
+                raise ApiError(f"API returned status code {response.status_code}")
+            data = response.json()
+        except TimeoutError:
+            # Only this caller's deadline was missed; the API may be fine
+            logger.warning(f"/{call.endpoint} missed its {call.deadline}s deadline")
+            return call.fallback
+        except (httpx.HTTPError, ValueError, ApiError) as e:
+            if breaker is not None:
+                breaker.record_failure()
+            logger.error(f"Error fetching data from API: {str(e)}")
+            return call.fallback
+        if breaker is not None:
+            breaker.record_success()
+        if not isinstance(data, dict):
+            return call.fallback
+        return data.get(item_key(call.endpoint), call.fallback)
+
+    async def fetch_all(self, calls: Dict[str, Call]) -> Dict[str, Any]:
+        """
+        Make several calls concurrently. Run it on this client's loop.
+
+        Args:
+            calls: The calls, by name
+
+        Returns:
+            Dict[str, Any]: Each call's item or fallback, by name
+        """
+        results = await asyncio.gather(*(self.fetch(call) for call in calls.values()))
+        return dict(zip(calls, results))
+
+    def fetch_all_sync(self, calls: Dict[str, Call]) -> Dict[str, Any]:
+        """
+        Make several calls concurrently, from synchronous code.
+
+        Blocks for as long as the slowest call, at most its deadline.
+
+        Args:
+            calls: The calls, by name
+
+        Returns:
+            Dict[str, Any]: Each call's item or fallback, by name
+        """
+        return asyncio.run_coroutine_threadsafe(self.fetch_all(calls), self._loop).result()
+
+    def close(self) -> None:
+        """Close the connections and stop the event loop"""
+        asyncio.run_coroutine_threadsafe(self._client.aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
@@ -0,0 +1,144 @@
+"""
+Money Making Machine Benchmark
+=============================
+
+Compares fetching several API resources one after another (the synchronous
+ApiClient) with fetching them concurrently (AsyncApiClient.fetch_all_sync).
+
+The API is replaced by a local stub server that answers in the real API's
+shapes after a fixed delay per endpoint: {"side_hustle": "..."} for
+/side_hustles (the singular item key), or {"side_hustles": [...]} with
+?count=N. The numbers show the cost of waiting and not the speed of the
+real API. Sequential fetches should
+take about the sum of the delays, concurrent ones about the largest.
+
+Usage:
+    python benchmark.py
+    python benchmark.py --delays side_hustles=0.1 money_quotes=0.15 --calls 2 4 8 --rounds 10
+
+Version: 1.0.0
+License: MIT
+"""
+
+import argparse
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Sequence, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from api_client import ApiClient, item_key
+from async_client import AsyncApiClient, Call
+
+DEFAULT_DELAYS = ("side_hustles=0.1", "money_quotes=0.15")
+
+
+def start_stub_server(delays: Dict[str, float]) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Start a stub API in a background thread.
+
+    Args:
+        delays: Seconds to wait before answering, by endpoint
+
+    Returns:
+        The server and its base URL
+    """
+
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body are written separately; without this each
+        # response would wait for a delayed ACK
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            endpoint = url.path.strip("/")
+            time.sleep(delays.get(endpoint, 0.0))
+            # The real API's shapes: a list under the endpoint name for
+            # ?count=N, otherwise one item under its singular name
+            count = parse_qs(url.query).get("count")
+            if count:
+                payload = {endpoint: [f"stub {endpoint} {i}" for i in range(int(count[0]))]}
+            else:
+                payload = {item_key(endpoint): f"stub {endpoint}"}
+            body = json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    class StubServer(ThreadingHTTPServer):
+        daemon_threads = True
+        # The default backlog of 5 drops connections when many calls
+        # connect at once
+        request_queue_size = 128
+
+    server = StubServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+def parse_delays(items: Sequence[str]) -> Dict[str, float]:
+    """Parse endpoint=seconds pairs"""
+    delays = {}
+    for item in items:
+        endpoint, _, seconds = item.partition("=")
+        delays[endpoint] = float(seconds)
+    return delays
+
+
+def time_rounds(fetch, rounds: int) -> float:
+    """Run fetch() rounds times and return the mean seconds per round"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fetch()
+    return (time.perf_counter() - start) / rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark sequential and concurrent API fetches against a stub API")
+    parser.add_argument("--delays", nargs="+", default=list(DEFAULT_DELAYS),
+                        help="Stub response delay per endpoint, as endpoint=seconds")
+    parser.add_argument("--calls", type=int, nargs="+", default=[2, 4, 8],
+                        help="Numbers of calls per round; the endpoints are used in turn")
+    parser.add_argument("--rounds", type=int, default=10, help="Rounds per measurement")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    delays = parse_delays(args.delays)
+    endpoints = list(delays)
+    server, base_url = start_stub_server(delays)
+    sync_client = ApiClient(base_url)
+    async_client = AsyncApiClient(base_url, breaker=sync_client.breaker)
+    try:
+        print(f"Stub delays: {', '.join(f'/{e} {d * 1000:.0f} ms' for e, d in delays.items())}")
+        print(f"{'calls':>6} {'sequential ms':>14} {'concurrent ms':>14} {'speedup':>8}")
+        for count in args.calls:
+            names = [endpoints[i % len(endpoints)] for i in range(count)]
+            calls = {f"{name}-{i}": Call(name) for i, name in enumerate(names)}
+
+            # Open the connections first (idle ones expire, so just before
+            # each measurement)
+            if sync_client.fetch(endpoints[0], None) is None:
+                raise SystemExit(f"/{endpoints[0]} returned no item; the timings would only measure fallbacks")
+            sequential = time_rounds(lambda: [sync_client.fetch(name, None) for name in names], args.rounds)
+            missing = [name for name, item in async_client.fetch_all_sync(calls).items() if item is None]
+            if missing:
+                raise SystemExit(f"No item for {', '.join(missing)}; the timings would only measure fallbacks")
+            concurrent = time_rounds(lambda: async_client.fetch_all_sync(calls), args.rounds)
+            print(f"{count:>6} {sequential * 1000:>14.1f} {concurrent * 1000:>14.1f} {sequential / concurrent:>7.1f}x")
+    finally:
+        async_client.close()
+        sync_client.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -13,12 +13,14 @@ Version: 1.0.0
 import streamlit as st
 import random as rd
 import time 
-import requests
 import logging
 from typing import Dict, Any, Optional, List
-import json
-import os
-from datetime import datetime
+from functools import partial
+
+from api_client import ApiClient
+from async_client import AsyncApiClient, Call
+from prefetch import PrefetchBuffer
+from transaction_log import TransactionLog
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -30,6 +32,8 @@ DEFAULT_SIDE_HUSTLE = "Freelancing"
 DEFAULT_QUOTE = "Money is the root of all evil!"
 MAX_MONEY_AMOUNT = 1000
 MIN_MONEY_AMOUNT = 1
+# Seconds "Generate All" waits for fresh items before using buffered ones
+GENERATE_ALL_DEADLINE = 2.0
 
 # Set page configuration
 st.set_page_config(
@@ -48,74 +52,120 @@ def generate_money() -> int:
     """
     return rd.randint(MIN_MONEY_AMOUNT, MAX_MONEY_AMOUNT)
 
-def fetch_data_from_api(endpoint: str, fallback: str) -> str:
+@st.cache_resource
+def get_api_client() -> ApiClient:
     """
-    Fetch data from the API with error handling.
-    
-    Args:
-        endpoint: The API endpoint to fetch from
-        fallback: The fallback value if the API call fails
-        
+    Get the shared API client.
+
+    Cached as a resource, so all sessions and reruns share one connection
+    pool and one circuit breaker.
+
+    Returns:
+        ApiClient: The client for API_BASE_URL
+    """
+    return ApiClient(API_BASE_URL)
+
+@st.cache_resource
+def get_prefetch_buffers() -> Dict[str, PrefetchBuffer]:
+    """
+    Get the shared prefetch buffers, one per API endpoint.
+
     Returns:
-        str: The fetched data or fallback value
-    """
-    try:
-        response = requests.get(f"{API_BASE_URL}/{endpoint}", timeout=5)
-        if response.status_code == 200:
-            data = response.json()
-            return data.get(endpoint, fallback)
-        else:
-            logger.warning(f"API returned status code {response.status_code}")
-            return fallback
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Error fetching data from API: {str(e)}")
-        return fallback
-    except json.JSONDecodeError as e:
-        logger.error(f"Error decoding JSON response: {str(e)}")
-        return fallback
-    except Exception as e:
-        logger.error(f"Unexpected error: {str(e)}")
-        return fallback
+        Dict[str, PrefetchBuffer]: The buffers for side hustles and money quotes
+    """
+    client = get_api_client()
+    return {
+        endpoint: PrefetchBuffer(partial(client.fetch_batch, endpoint), fallback, name=endpoint)
+        for endpoint, fallback in (("side_hustles", DEFAULT_SIDE_HUSTLE), ("money_quotes", DEFAULT_QUOTE))
+    }
 
 def fetch_side_hustle() -> str:
     """
-    Fetch a side hustle idea from the API.
+    Get a side hustle idea, from the prefetch buffer.
     
     Returns:
         str: A side hustle idea or the default value
     """
-    return fetch_data_from_api("side_hustles", DEFAULT_SIDE_HUSTLE)
+    get_transaction_log().record_side_hustle()
+    return get_prefetch_buffers()["side_hustles"].get()
 
 def fetch_money_quote() -> str:
     """
-    Fetch a money-related quote from the API.
+    Get a money-related quote, from the prefetch buffer.
     
     Returns:
         str: A money quote or the default value
     """
-    return fetch_data_from_api("money_quotes", DEFAULT_QUOTE)
+    get_transaction_log().record_quote()
+    return get_prefetch_buffers()["money_quotes"].get()
+
+@st.cache_resource
+def get_async_client() -> AsyncApiClient:
+    """
+    Get the shared client for concurrent API calls.
+
+    It shares the circuit breaker of the synchronous client.
+
+    Returns:
+        AsyncApiClient: The client for API_BASE_URL
+    """
+    return AsyncApiClient(API_BASE_URL, breaker=get_api_client().breaker)
+
+def generate_all() -> Dict[str, Any]:
+    """
+    Generate money, a side hustle and a quote in one round.
+    
+    The side hustle and the quote are fetched fresh and concurrently, so this
+    takes as long as the slower of the two calls. Items that don't arrive
+    within GENERATE_ALL_DEADLINE come from the prefetch buffers instead.
+    
+    Returns:
+        Dict[str, Any]: The amount ("money"), "side_hustle" and "quote"
+    """
+    results = get_async_client().fetch_all_sync({
+        endpoint: Call(endpoint, deadline=GENERATE_ALL_DEADLINE)
+        for endpoint in ("side_hustles", "money_quotes")
+    })
+    buffers = get_prefetch_buffers()
+    for endpoint, item in results.items():
+        if item is None:
+            results[endpoint] = buffers[endpoint].get()
+    
+    amount = generate_money()
+    save_transaction(amount)
+    transaction_log = get_transaction_log()
+    transaction_log.record_side_hustle()
+    transaction_log.record_quote()
+    return {"money": amount, "side_hustle": results["side_hustles"], "quote": results["money_quotes"]}
+
+@st.cache_resource
+def get_transaction_log() -> TransactionLog:
+    """
+    Get the shared transaction log.
+
+    Returns:
+        TransactionLog: The log in logs/, with its running totals
+    """
+    return TransactionLog()
 
 def save_transaction(amount: int) -> None:
     """
-    Save a transaction to a log file.
+    Save a transaction to the transaction log.
+    
+    The record is buffered and written within a second.
     
     Args:
         amount: The amount of money generated
     """
-    try:
-        log_dir = "logs"
-        if not os.path.exists(log_dir):
-            os.makedirs(log_dir)
-            
-        log_file = os.path.join(log_dir, "transactions.log")
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-        with open(log_file, "a") as f:
-            f.write(f"{timestamp}, {amount}\n")
-            
-        logger.info(f"Transaction logged: ${amount} at {timestamp}")
-    except Exception as e:
-        logger.error(f"Error saving transaction: {str(e)}")
+    get_transaction_log().record_money(amount)
+    logger.info(f"Transaction logged: ${amount}")
+
+def show_statistics() -> None:
+    """Show the transaction log's running totals"""
+    stats = get_transaction_log().stats()
+    st.metric("Total Money Generated", f"${stats.total_money:,}")
+    st.metric("Side Hustles Generated", f"{stats.side_hustles:,}")
+    st.metric("Quotes Generated", f"{stats.quotes:,}")
 
 def main():
     """Main application function"""
@@ -137,11 +187,18 @@ def main():
         """)
         
         st.header("Statistics")
-        st.metric("Total Money Generated", "$0")
-        st.metric("Side Hustles Generated", "0")
-        st.metric("Quotes Generated", "0")
+        # Filled in last, so the totals include this run's clicks
+        statistics = st.container()
+        
+        if get_api_client().breaker.is_open:
+            st.warning("The API is unavailable, so default content is shown. Retrying in the background.")
     
     # Main content
+    everything = None
+    if st.button("Generate All", help="Money, a side hustle and a quote at once"):
+        with st.spinner("Generating everything..."):
+            everything = generate_all()
+    
     col1, col2, col3 = st.columns(3)
     
     with col1:
@@ -152,20 +209,28 @@ def main():
                 amount = generate_money()
                 save_transaction(amount)
                 st.success(f"You made ${amount}!")
+        elif everything:
+            st.success(f"You made ${everything['money']}!")
     
     with col2:
         st.subheader("Side Hustle Ideas")
         if st.button("Generate Hustle"):
-            with st.spinner("Finding the perfect side hustle..."):
-                idea = fetch_side_hustle()
-                st.success(idea)
+            # Served from the prefetch buffer, so there's nothing to wait for
+            idea = fetch_side_hustle()
+            st.success(idea)
+        elif everything:
+            st.success(everything["side_hustle"])
     
     with col3:
         st.subheader("Money-Making Motivation")
         if st.button("Generate Quote"):
-            with st.spinner("Finding the perfect quote..."):
-                quote = fetch_money_quote()
-                st.info(quote)
+            quote = fetch_money_quote()
+            st.info(quote)
+        elif everything:
+            st.info(everything["quote"])
+    
+    with statistics:
+        show_statistics()
     
     # Footer
     st.markdown("---")
@@ -0,0 +1,114 @@
+"""
+Money Making Machine - Analytics
+
+A Streamlit page with statistics over the transaction log: totals, amount
+percentiles, and daily or hourly totals with a moving average.
+
+The aggregates are maintained incrementally by analytics.LogAnalyzer, so a
+rerun only reads what was appended to the log since the last one.
+
+License: MIT
+Version: 1.0.0
+"""
+
+import os
+
+import pandas as pd
+import streamlit as st
+
+from analytics import Aggregates, LogAnalyzer, moving_average
+
+PERCENTILES = (50, 90, 99)
+
+st.set_page_config(page_title="Money Making Machine - Analytics", page_icon="📊", layout="wide")
+
+
+@st.cache_resource
+def get_analyzer() -> LogAnalyzer:
+    """
+    Get the shared log analyzer.
+
+    Returns:
+        LogAnalyzer: The analyzer for logs/transactions.log and its archives
+    """
+    return LogAnalyzer()
+
+
+def period_frame(periods: dict, index_format: str) -> pd.DataFrame:
+    """
+    Build a frame of per-period values.
+
+    Args:
+        periods: Period key -> [money total, money count, side hustles, quotes]
+        index_format: How the keys are formatted, for parsing them as dates
+
+    Returns:
+        pd.DataFrame: One row per period, oldest first
+    """
+    frame = pd.DataFrame.from_dict(periods, orient="index",
+                                   columns=["Total", "Transactions", "Side Hustles", "Quotes"])
+    frame.index = pd.to_datetime(frame.index, format=index_format)
+    return frame.sort_index()
+
+
+def show_summary(aggregates: Aggregates) -> None:
+    """Show the overall totals and the amount percentiles"""
+    total, count, side_hustles, quotes = aggregates.totals()
+    columns = st.columns(4)
+    columns[0].metric("Total Money Generated", f"${total:,}")
+    columns[1].metric("Transactions", f"{count:,}")
+    columns[2].metric("Side Hustles Generated", f"{side_hustles:,}")
+    columns[3].metric("Quotes Generated", f"{quotes:,}")
+
+    columns = st.columns(len(PERCENTILES) + 1)
+    columns[0].metric("Average Amount", f"${total / count:,.2f}" if count else "-")
+    for column, q, value in zip(columns[1:], PERCENTILES, aggregates.percentiles(PERCENTILES)):
+        column.metric(f"P{q} Amount", f"${value:,}" if value is not None else "-")
+
+
+def main():
+    """Analytics page"""
+    st.title("📊 Transaction Analytics")
+
+    with st.sidebar:
+        st.header("Options")
+        granularity = st.radio("Period", ["Daily", "Hourly"])
+        window = st.slider("Moving average window (periods)", 1, 60, 7)
+        workers = st.number_input("Processes for the first scan", 1, os.cpu_count() or 1, 1,
+                                  help="Splits the first scan of large log archives over several processes")
+        if st.button("Refresh"):
+            st.rerun()
+
+    analyzer = get_analyzer()
+    with st.spinner("Reading the transaction log..."):
+        aggregates = analyzer.refresh(workers=int(workers))
+    if not aggregates.daily:
+        st.info("No transactions yet. Generate some money on the main page first!")
+        return
+
+    show_summary(aggregates)
+
+    if granularity == "Daily":
+        # Days without transactions count as zero in the moving average
+        frame = period_frame(aggregates.daily, "%Y-%m-%d").asfreq("D", fill_value=0)
+    else:
+        frame = period_frame(aggregates.hourly, "%Y-%m-%d %H").asfreq("h", fill_value=0)
+    frame["Moving Average"] = moving_average(frame["Total"].tolist(), window)
+
+    st.subheader(f"{granularity} Totals")
+    st.line_chart(frame[["Total", "Moving Average"]])
+    st.subheader(f"{granularity} Events")
+    st.bar_chart(frame[["Transactions", "Side Hustles", "Quotes"]])
+
+    st.subheader("By Hour of Day")
+    hourly = period_frame(aggregates.hourly, "%Y-%m-%d %H")
+    by_hour = hourly.groupby(hourly.index.hour).sum()
+    by_hour.index.name = "Hour"
+    st.bar_chart(by_hour["Total"])
+
+    with st.expander("Data"):
+        st.dataframe(frame)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Prefetch Buffer for the Money Making Machine
+===========================================
+
+Keeps a supply of side hustles and quotes in memory, so a click is answered
+from the buffer instead of waiting for the API.
+
+A background thread fetches items in batches. Whenever a click leaves fewer
+than low_water fresh items, the thread fetches another batch, while clicks
+keep being served from what is left. Items older than the TTL are dropped
+unserved. If the buffer runs dry, because the API is down or slower than the
+clicks, a random item from the last successful batch is served instead, and
+before any batch has arrived, the fallback. Nothing is fetched while nobody
+clicks, and failed refills are retried at most every RETRY_INTERVAL seconds.
+
+Version: 1.0.0
+License: MIT
+"""
+
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Items fetched per API call
+DEFAULT_BATCH_SIZE = 20
+# Fewer fresh items than this triggers a refill
+DEFAULT_LOW_WATER = 5
+# Seconds before a buffered item is considered stale
+DEFAULT_TTL = 300.0
+# Seconds to wait before retrying a failed refill
+RETRY_INTERVAL = 5.0
+
+
+class PrefetchBuffer:
+    """
+    An in-memory buffer of items, refilled in batches by a background thread.
+
+    Thread safe; one buffer can serve every Streamlit session.
+
+    Args:
+        fetch_batch: Fetches up to n items; may raise on failure
+        fallback: Served when no item has ever been fetched
+        batch_size: Items fetched per call
+        low_water: Fewer fresh items than this triggers a refill
+        ttl: Seconds before a buffered item is dropped as stale
+        name: Used in log messages and the thread name
+    """
+
+    def __init__(self, fetch_batch: Callable[[int], List[Any]], fallback: Any,
+                 batch_size: int = DEFAULT_BATCH_SIZE, low_water: int = DEFAULT_LOW_WATER,
+                 ttl: float = DEFAULT_TTL, name: str = "items"):
+        self.fetch_batch = fetch_batch
+        self.fallback = fallback
+        self.batch_size = batch_size
+        self.low_water = low_water
+        self.ttl = ttl
+        self.name = name
+        # (fetched at, item), oldest first
+        self._items: Deque[Tuple[float, Any]] = deque()
+        self._last_known: List[Any] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"prefetch-{name}", daemon=True)
+        self._thread.start()
+
+    def __len__(self) -> int:
+        """The number of fresh items buffered"""
+        with self._lock:
+            self._expire(time.monotonic())
+            return len(self._items)
+
+    def get(self) -> Any:
+        """
+        Take an item without waiting for the API.
+
+        Returns:
+            A fresh buffered item if there is one, otherwise one from the last
+            successful batch, otherwise the fallback
+        """
+        with self._lock:
+            self._expire(time.monotonic())
+            # Refill if fewer than low_water items remain after this one
+            if len(self._items) <= self.low_water:
+                self._wake.set()
+            if self._items:
+                return self._items.popleft()[1]
+            last_known = self._last_known
+        return random.choice(last_known) if last_known else self.fallback
+
+    def close(self) -> None:
+        """Stop the background thread"""
+        self._stop.set()
+        self._wake.set()
+
+    def _expire(self, now: float) -> None:
+        # Call with the lock held
+        items = self._items
+        while items and now - items[0][0] > self.ttl:
+            items.popleft()
+
+    def _run(self) -> None:
+        # Fill the buffer once at start, then whenever a click asks for it
+        self._wake.set()
+        while True:
+            self._wake.wait()
+            if self._stop.is_set():
+                return
+            self._wake.clear()
+            try:
+                batch = self.fetch_batch(self.batch_size)
+            except Exception as e:
+                logger.warning(f"Could not prefetch {self.name}: {str(e)}")
+                # Retry when a click asks again, but not more often than this
+                self._stop.wait(RETRY_INTERVAL)
+                continue
+            if not batch:
+                continue
+            now = time.monotonic()
+            with self._lock:
+                self._items.extend((now, item) for item in batch)
+                self._last_known = list(batch)
+                self._expire(now)
+                short = len(self._items) < self.low_water
+            if short and len(batch) == self.batch_size:
+                # Clicks outpaced the refill. (A short batch means the API
+                # has no more distinct items to give, so don't ask again.)
+                self._wake.set()
@@ -0,0 +1,63 @@
+"""
+Tests for analytics.LogAnalyzer
+
+Run with: python -m unittest test_analytics
+"""
+
+import os
+import tempfile
+import unittest
+
+from analytics import CACHE_FILENAME, LogAnalyzer
+from transaction_log import DEFAULT_FILENAME
+
+
+class LogAnalyzerTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+        self.directory = self._tmp.name
+        self.path = os.path.join(self.directory, DEFAULT_FILENAME)
+
+    def append(self, path, amounts):
+        with open(path, "a", encoding="utf-8") as f:
+            for amount in amounts:
+                f.write(f"2025-04-24 18:30:05, {amount}\n")
+
+    def rotate(self, archive_name):
+        os.rename(self.path, os.path.join(self.directory, archive_name))
+        open(self.path, "w").close()
+
+    def test_rotation_after_refreshing_an_empty_log(self):
+        # Right after a rotation or first start the log is empty; its cached
+        # entry must not be reused for the archive and the new log
+        open(self.path, "w").close()
+        analyzer = LogAnalyzer(self.directory)
+        self.assertEqual(analyzer.refresh().totals(), [0, 0, 0, 0])
+
+        self.append(self.path, [10] * 9 + [15])
+        self.rotate(f"{DEFAULT_FILENAME}.2025-04-24")
+        self.append(self.path, [5])
+        self.assertEqual(analyzer.refresh().totals(), [110, 11, 0, 0])
+
+        # The saved cache holds the same totals
+        reloaded = LogAnalyzer(self.directory)
+        self.assertTrue(os.path.exists(os.path.join(self.directory, CACHE_FILENAME)))
+        self.assertEqual(reloaded.refresh().totals(), [110, 11, 0, 0])
+
+    def test_rotated_log_is_not_rescanned_or_shared(self):
+        analyzer = LogAnalyzer(self.directory)
+        self.append(self.path, [100, 200])
+        self.assertEqual(analyzer.refresh().totals(), [300, 2, 0, 0])
+
+        self.append(self.path, [300])
+        self.rotate(f"{DEFAULT_FILENAME}.2025-04-24")
+        self.append(self.path, [1])
+        self.assertEqual(analyzer.refresh().totals(), [601, 4, 0, 0])
+
+        self.append(self.path, [2])
+        self.assertEqual(analyzer.refresh().totals(), [603, 5, 0, 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,260 @@
+"""
+Transaction Log for the Money Making Machine
+===========================================
+
+Appends every generated amount, side hustle and quote to logs/transactions.log
+and keeps running totals for the sidebar.
+
+Log format, one event per line:
+
+    2025-04-24 18:30:05, 250          money generated (the amount)
+    2025-04-24 18:30:09, side_hustle  a side hustle idea was shown
+    2025-04-24 18:30:12, quote        a quote was shown
+
+Money lines are unchanged from earlier versions, so older logs still parse.
+
+- The file stays open, and records are buffered and written by a background
+  thread once per flush interval (and on rotation and exit). A crash loses
+  at most the last interval.
+- The file is rotated when it would exceed max_bytes and when the date
+  changes. Archives are named transactions.log.<date>, then
+  transactions.log.<date>.1 and so on.
+- The totals over all files are kept in memory and saved with every flush to
+  a small checkpoint file, along with how far into the current file they
+  count. At startup only the part of the log after that offset is read, so
+  the totals never require rereading the whole log. Without a usable
+  checkpoint, all log files are scanned once.
+
+Version: 1.0.0
+License: MIT
+"""
+
+import atexit
+import glob
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass
+from datetime import date, datetime
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIRECTORY = "logs"
+DEFAULT_FILENAME = "transactions.log"
+CHECKPOINT_FILENAME = "transactions.checkpoint.json"
+# Rotate the log before it grows past this many bytes
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+# Seconds between writes of buffered records
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+SIDE_HUSTLE_EVENT = "side_hustle"
+QUOTE_EVENT = "quote"
+
+
+@dataclass
+class TransactionStats:
+    """Running totals over the whole transaction log"""
+    total_money: int = 0
+    money_count: int = 0
+    side_hustles: int = 0
+    quotes: int = 0
+
+    def add_line(self, line: bytes) -> None:
+        """Count one log line; malformed lines are ignored"""
+        _, separator, value = line.partition(b",")
+        if not separator:
+            return
+        value = value.strip()
+        if value == b"side_hustle":
+            self.side_hustles += 1
+        elif value == b"quote":
+            self.quotes += 1
+        else:
+            try:
+                amount = int(value)
+            except ValueError:
+                return
+            self.total_money += amount
+            self.money_count += 1
+
+
+def scan_log(path: str, stats: TransactionStats, offset: int = 0) -> int:
+    """
+    Add the complete lines of a log file, from an offset, to the totals.
+
+    Args:
+        path: The log file
+        stats: The totals to add to
+        offset: Where to start reading
+
+    Returns:
+        int: The offset after the last complete line
+    """
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                # Still being written
+                break
+            stats.add_line(line)
+            offset += len(line)
+    return offset
+
+
+class TransactionLog:
+    """
+    Buffered, rotating transaction log with running totals.
+
+    Thread safe; one instance should serve the whole process.
+
+    Args:
+        directory: Where the log, its archives and the checkpoint live
+        filename: The name of the current log file
+        max_bytes: Rotate before the file grows past this size
+        flush_interval: Seconds between writes of buffered records
+    """
+
+    def __init__(self, directory: str = DEFAULT_DIRECTORY, filename: str = DEFAULT_FILENAME,
+                 max_bytes: int = DEFAULT_MAX_BYTES, flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        self.directory = directory
+        self.filename = filename
+        self.path = os.path.join(directory, filename)
+        self.checkpoint_path = os.path.join(directory, CHECKPOINT_FILENAME)
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._pending: List[bytes] = []
+
+        os.makedirs(directory, exist_ok=True)
+        self._stats = self._load_stats()
+        self._file = open(self.path, "ab")
+        self._size = self._file.tell()
+        self._file_date = (datetime.fromtimestamp(os.path.getmtime(self.path)).date()
+                           if self._size else date.today())
+
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="transaction-log", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _load_stats(self) -> TransactionStats:
+        size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        try:
+            with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+                checkpoint = json.load(f)
+            stats = TransactionStats(**checkpoint["stats"])
+            offset = checkpoint["offset"]
+        except FileNotFoundError:
+            checkpoint = None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.checkpoint_path}: {str(e)}")
+            checkpoint = None
+
+        if checkpoint is not None and offset <= size:
+            if offset < size:
+                scan_log(self.path, stats, offset)
+            return stats
+
+        # No usable checkpoint: count everything once
+        stats = TransactionStats()
+        for archive in self._archives():
+            scan_log(archive, stats)
+        if size:
+            scan_log(self.path, stats)
+        logger.info(f"Rebuilt transaction totals from {self.directory}")
+        return stats
+
+    def _archives(self) -> List[str]:
+        return sorted(glob.glob(glob.escape(self.path) + ".*"))
+
+    def stats(self) -> TransactionStats:
+        """The running totals, including records not yet written"""
+        with self._lock:
+            return TransactionStats(**asdict(self._stats))
+
+    def record_money(self, amount: int) -> None:
+        """Record a generated amount"""
+        self._record(str(amount))
+
+    def record_side_hustle(self) -> None:
+        """Record that a side hustle idea was shown"""
+        self._record(SIDE_HUSTLE_EVENT)
+
+    def record_quote(self) -> None:
+        """Record that a quote was shown"""
+        self._record(QUOTE_EVENT)
+
+    def _record(self, value: str, now: Optional[datetime] = None) -> None:
+        now = now or datetime.now()
+        line = f"{now:%Y-%m-%d %H:%M:%S}, {value}\n".encode("utf-8")
+        with self._lock:
+            if self._file.closed:
+                logger.warning("Transaction log is closed; record dropped")
+                return
+            if now.date() != self._file_date or (self._size and self._size + len(line) > self.max_bytes):
+                self._rotate_locked(now.date())
+            self._pending.append(line)
+            self._size += len(line)
+            self._stats.add_line(line)
+
+    def flush(self) -> None:
+        """Write buffered records and save the checkpoint"""
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if not self._pending or self._file.closed:
+            return
+        try:
+            self._file.write(b"".join(self._pending))
+            self._file.flush()
+        except OSError as e:
+            logger.error(f"Error saving transactions: {str(e)}")
+            return
+        self._pending.clear()
+        self._save_checkpoint_locked()
+
+    def _save_checkpoint_locked(self) -> None:
+        # Written after the log, so a crash in between leaves the checkpoint
+        # behind the log, and the gap is read at the next start
+        checkpoint = {"offset": self._size, "stats": asdict(self._stats)}
+        tmp_path = f"{self.checkpoint_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(checkpoint, f)
+            os.replace(tmp_path, self.checkpoint_path)
+        except OSError as e:
+            logger.error(f"Error saving transaction checkpoint: {str(e)}")
+
+    def _rotate_locked(self, today: date) -> None:
+        self._flush_locked()
+        self._file.close()
+        archive = f"{self.path}.{self._file_date.isoformat()}"
+        n = 0
+        while os.path.exists(archive if n == 0 else f"{archive}.{n}"):
+            n += 1
+        archive = archive if n == 0 else f"{archive}.{n}"
+        try:
+            os.replace(self.path, archive)
+            logger.info(f"Rotated transaction log to {archive}")
+        except OSError as e:
+            logger.error(f"Error rotating transaction log: {str(e)}")
+        self._file = open(self.path, "ab")
+        self._size = self._file.tell()
+        self._file_date = today
+        self._save_checkpoint_locked()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def close(self) -> None:
+        """Write buffered records and close the file"""
+        self._stop.set()
+        with self._lock:
+            if self._file.closed:
+                return
+            self._flush_locked()
+            self._file.close()
@@ -12,11 +12,20 @@ Version: 1.0.0
 """
 
 import streamlit as st
-from datetime import datetime
-from zoneinfo import ZoneInfo
+from datetime import datetime, timedelta
+from datetime import time as dt_time
 import logging
+import time
 from typing import List, Optional
 
+import pandas as pd
+
+from meeting_planner import (DEFAULT_MIN_MINUTES, EVERY_DAY, WEEKDAYS, Participant, PlannerError,
+                             find_meeting_slots)
+from tz_engine import get_zone
+from world_clock import WorldClock, all_zones
+from zone_search import INDEX_PATH, ZoneSearchIndex
+
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -35,6 +44,19 @@ TIME_ZONES: List[str] = [
     "Asia/Kolkata",
 ]
 
+# Key of the time zone multiselect in the session state
+SELECTED_ZONES_KEY = "selected_timezones"
+# Search results shown per query
+SEARCH_RESULTS = 5
+
+# Days planned by default, starting today
+DEFAULT_PLAN_DAYS = 14
+
+# Seconds between clock updates
+CLOCK_REFRESH_INTERVAL = 1
+# Offset groups per row of the world clock
+WORLD_CLOCK_COLUMNS = 6
+
 # Set page configuration
 st.set_page_config(
     page_title="Time Zone Converter",
@@ -54,7 +76,7 @@ def get_current_time(timezone: str) -> str:
         Formatted time string
     """
     try:
-        return datetime.now(ZoneInfo(timezone)).strftime("%Y-%m-%d %I:%M:%S %p")
+        return datetime.now(get_zone(timezone)).strftime("%Y-%m-%d %I:%M:%S %p")
     except Exception as e:
         logger.error(f"Error getting time for {timezone}: {str(e)}")
         return "Error retrieving time"
@@ -72,12 +94,166 @@ def convert_time(time: datetime.time, from_tz: str, to_tz: str) -> Optional[str]
         Formatted converted time string or None if error occurs
     """
     try:
-        dt = datetime.combine(datetime.today(), time, tzinfo=ZoneInfo(from_tz))
-        return dt.astimezone(ZoneInfo(to_tz)).strftime("%Y-%m-%d %I:%M:%S %p")
+        dt = datetime.combine(datetime.today(), time, tzinfo=get_zone(from_tz))
+        return dt.astimezone(get_zone(to_tz)).strftime("%Y-%m-%d %I:%M:%S %p")
     except Exception as e:
         logger.error(f"Error converting time from {from_tz} to {to_tz}: {str(e)}")
         return None
 
+@st.cache_resource
+def get_world_clock() -> WorldClock:
+    """
+    Get the shared world clock over all IANA time zones.
+
+    Returns:
+        WorldClock: The clock, built once per process
+    """
+    return WorldClock()
+
+@st.cache_resource
+def get_zone_search() -> ZoneSearchIndex:
+    """
+    Get the shared time zone search index.
+
+    Returns:
+        ZoneSearchIndex: The index, loaded from (or saved to) .zone_index.json
+        once per process
+    """
+    return ZoneSearchIndex.load_or_build(INDEX_PATH)
+
+@st.cache_data
+def get_all_zones() -> List[str]:
+    """
+    Get every IANA time zone.
+
+    Returns:
+        List[str]: The zone names, sorted
+    """
+    return all_zones()
+
+def add_timezone(zone: str) -> None:
+    """
+    Add a zone to the selected time zones.
+
+    Args:
+        zone: The zone to add
+    """
+    selected = st.session_state.get(SELECTED_ZONES_KEY, [])
+    if zone not in selected:
+        st.session_state[SELECTED_ZONES_KEY] = [*selected, zone]
+
+def show_zone_search() -> None:
+    """Search time zones by city, country, abbreviation or zone name"""
+    query = st.text_input("Find a time zone", placeholder="e.g. Mumbai, Pakistan, PST, new york",
+                          help="Typos are fine: 'londn' finds London")
+    if not query:
+        return
+    matches = get_zone_search().search(query, limit=SEARCH_RESULTS)
+    if not matches:
+        st.caption("No matching time zones")
+        return
+    for match in matches:
+        col1, col2 = st.columns([4, 1])
+        label = match.zone if match.matched == match.zone else f"{match.zone} ({match.matched})"
+        col1.markdown(label)
+        col2.button("Add", key=f"add_{match.zone}", on_click=add_timezone, args=(match.zone,),
+                    disabled=match.zone in st.session_state.get(SELECTED_ZONES_KEY, []))
+
+@st.fragment(run_every=CLOCK_REFRESH_INTERVAL)
+def show_current_times(timezones: List[str]) -> None:
+    """
+    Show the current time in the selected timezones.
+    
+    Runs as a fragment, so only these metrics are redrawn every second.
+    
+    Args:
+        timezones: The timezones to show
+    """
+    if not timezones:
+        return
+    cols = st.columns(min(3, len(timezones)))
+    for i, tz in enumerate(timezones):
+        col_idx = i % len(cols)
+        with cols[col_idx]:
+            current_time = get_current_time(tz)
+            st.metric(tz, current_time)
+
+@st.fragment(run_every=CLOCK_REFRESH_INTERVAL)
+def show_world_clock() -> None:
+    """
+    Show the current time for every UTC offset in use.
+    
+    Runs as a fragment, so only the clock cells are redrawn every second.
+    The offsets come from the shared WorldClock and are only recomputed when
+    a zone changes offset.
+    """
+    now = time.time()
+    groups = get_world_clock().groups(now)
+    for start in range(0, len(groups), WORLD_CLOCK_COLUMNS):
+        cols = st.columns(WORLD_CLOCK_COLUMNS)
+        for col, group in zip(cols, groups[start:start + WORLD_CLOCK_COLUMNS]):
+            local = group.local_time(now)
+            col.metric(group.label, time.strftime("%H:%M:%S", local),
+                       delta=time.strftime("%a %d %b", local), delta_color="off",
+                       help=f"{len(group.zones)} zones, e.g. {', '.join(group.zones[:3])}")
+
+def show_meeting_planner() -> None:
+    """Find times when every participant is within their working hours"""
+    if "participants" not in st.session_state:
+        st.session_state["participants"] = pd.DataFrame({
+            "Name": ["Me", "Colleague"],
+            "Time zone": ["Asia/Karachi", "Europe/London"],
+            "Start": [dt_time(9), dt_time(9)],
+            "End": [dt_time(17), dt_time(17)],
+        })
+    zones = get_all_zones()
+    participants = st.data_editor(
+        st.session_state["participants"],
+        num_rows="dynamic",
+        use_container_width=True,
+        column_config={
+            "Name": st.column_config.TextColumn(required=True),
+            "Time zone": st.column_config.SelectboxColumn(options=zones, required=True),
+            "Start": st.column_config.TimeColumn("Work starts", format="HH:mm", required=True),
+            "End": st.column_config.TimeColumn("Work ends", format="HH:mm", required=True),
+        },
+    )
+
+    col1, col2, col3 = st.columns(3)
+    today = datetime.now().date()
+    with col1:
+        days = st.date_input("Dates", value=(today, today + timedelta(days=DEFAULT_PLAN_DAYS - 1)))
+    with col2:
+        min_minutes = st.number_input("Shortest slot (minutes)", min_value=15, max_value=480,
+                                      value=DEFAULT_MIN_MINUTES, step=15)
+    with col3:
+        show_in = st.selectbox("Show times in", sorted(set(participants["Time zone"].dropna())) or ["UTC"])
+    weekends = st.checkbox("Include weekends")
+
+    if not st.button("Find Meeting Times"):
+        return
+    if len(days) != 2:
+        st.warning("Pick the last day of the range")
+        return
+    people = [Participant(str(row["Name"]), row["Time zone"], row["Start"], row["End"],
+                          EVERY_DAY if weekends else WEEKDAYS)
+              for _, row in participants.dropna().iterrows()]
+    try:
+        slots = find_meeting_slots(people, days[0], days[1], min_minutes=int(min_minutes))
+    except PlannerError as e:
+        st.error(str(e))
+        return
+    if not slots:
+        st.info("No time works for everyone. Try a shorter slot or longer working hours.")
+        return
+    rows = []
+    for slot in slots:
+        start, end = slot.local_times(show_in)
+        rows.append({"Day": start.strftime("%a %d %b %Y"), "Start": start.strftime("%I:%M %p"),
+                     "End": end.strftime("%I:%M %p %Z"), "Length": f"{slot.minutes // 60}h {slot.minutes % 60:02d}m"})
+    st.success(f"Found {len(slots)} times that work for everyone")
+    st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+
 def main():
     """Main application function"""
     st.title("⏰ Time Zone Converter")
@@ -90,7 +266,10 @@ def main():
         
         **Features:**
         - View current time in multiple time zones
+        - Find time zones by city, country or abbreviation
+        - World clock across all time zones
         - Convert time between different time zones
+        - Find meeting times across time zones
         
         **Contributions welcome!** Visit our [GitHub repository](https://github.com/yourusername/time-zone-app) to contribute.
         """)
@@ -98,26 +277,33 @@ def main():
         st.header("Documentation")
         st.markdown("""
         ### How to use:
-        1. Select time zones to view current times
+        1. Search or select time zones to view current times
         2. Use the converter to change time between zones
+        3. Add participants to the meeting planner to find common working hours
         """)
     
     # Main content
     st.subheader("Current Time in Selected Timezones")
+    show_zone_search()
+    if SELECTED_ZONES_KEY not in st.session_state:
+        st.session_state[SELECTED_ZONES_KEY] = ["UTC", "Asia/Karachi"]
     selected_timezone = st.multiselect(
         "Select Timezones", 
-        TIME_ZONES, 
-        default=["UTC", "Asia/Karachi"],
+        get_all_zones(), 
+        key=SELECTED_ZONES_KEY,
         help="Choose one or more time zones to display current time"
     )
     
     # Display current time in selected timezones
-    cols = st.columns(min(3, len(selected_timezone)))
-    for i, tz in enumerate(selected_timezone):
-        col_idx = i % len(cols)
-        with cols[col_idx]:
-            current_time = get_current_time(tz)
-            st.metric(tz, current_time)
+    show_current_times(selected_timezone)
+    
+    # World clock over every time zone
+    st.subheader("World Clock")
+    if st.toggle("Show all time zones", help="The current time for every UTC offset in use"):
+        show_world_clock()
+        with st.expander("Time zones by offset"):
+            for group in get_world_clock().groups():
+                st.markdown(f"**{group.label}**: {', '.join(group.zones)}")
     
     # Time conversion section
     st.subheader("Convert Time Between Timezones")
@@ -139,6 +325,10 @@ def main():
         else:
             st.error("Failed to convert time. Please try again.")
     
+    # Meeting planner
+    st.subheader("Plan a Meeting")
+    show_meeting_planner()
+    
     # Footer
     st.markdown("---")
     st.markdown("""
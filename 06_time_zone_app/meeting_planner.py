@@ -0,0 +1,185 @@
+"""
+Meeting Planner
+===============
+
+Finds the times when every participant of a meeting is at work.
+
+Each participant has a time zone, daily working hours and working days
+(Monday to Friday by default). Over a range of dates:
+
+1. Each participant's working hours on each of their local dates are turned
+   into UTC intervals, all days at once, with the tz_engine offset tables.
+   The start and the end of each day are converted separately, so a day on
+   which the clocks change (or a range spanning a DST change) gets the right
+   offsets.
+2. All intervals are swept in time order, counting how many participants
+   are at work: +1 at each start, -1 at each end. Wherever the count equals
+   the number of participants, everyone is available.
+
+Both steps are NumPy array operations, so 50 participants over 90 days
+(4,500 intervals) take a few milliseconds.
+
+Version: 1.0.0
+License: MIT
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, time
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from tz_engine import SECONDS_PER_DAY, get_zone, wall_to_utc
+
+logger = logging.getLogger(__name__)
+
+WEEKDAYS = (0, 1, 2, 3, 4)
+EVERY_DAY = (0, 1, 2, 3, 4, 5, 6)
+DEFAULT_MIN_MINUTES = 30
+# The longest date range planned at once
+MAX_DAYS = 366
+
+
+class PlannerError(ValueError):
+    """Invalid meeting planner input"""
+
+
+@dataclass(frozen=True)
+class Participant:
+    """
+    Someone who has to attend.
+
+    Args:
+        name: Shown in the results
+        zone: Their IANA time zone
+        start: When their working day starts, local time
+        end: When it ends; an end at or before the start means the
+            working day runs past midnight (e.g. 22:00 to 06:00)
+        days: Their working days, 0 = Monday
+    """
+    name: str
+    zone: str
+    start: time = time(9)
+    end: time = time(17)
+    days: Tuple[int, ...] = WEEKDAYS
+
+
+@dataclass(frozen=True)
+class MeetingSlot:
+    """A time when every participant is at work, as Unix timestamps"""
+    start: int
+    end: int
+
+    @property
+    def minutes(self) -> int:
+        return (self.end - self.start) // 60
+
+    def local_times(self, zone: str) -> Tuple[datetime, datetime]:
+        """The start and end of the slot in a zone"""
+        tz = get_zone(zone)
+        return datetime.fromtimestamp(self.start, tz), datetime.fromtimestamp(self.end, tz)
+
+
+def _seconds(value: time) -> int:
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+def working_intervals(participant: Participant, first_day: date, last_day: date) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    A participant's working hours as UTC intervals.
+
+    Args:
+        participant: The participant
+        first_day: The first local date
+        last_day: The last local date (inclusive)
+
+    Returns:
+        Two arrays of Unix timestamps: the starts and the ends, in time
+        order and not overlapping
+    """
+    days = np.arange(np.datetime64(first_day, "D"), np.datetime64(last_day, "D") + 1).astype(np.int64)
+    # 1970-01-01 was a Thursday
+    days = days[np.isin((days + 3) % 7, participant.days)]
+    start = _seconds(participant.start)
+    end = _seconds(participant.end)
+    if end <= start:
+        end += SECONDS_PER_DAY
+    wall_days = days * SECONDS_PER_DAY
+    # A start in a DST gap is read with the offset before it (02:30 becomes
+    # 03:30), and an end with the offset after it (02:30 becomes 01:30), so
+    # the interval only covers times that exist
+    starts = wall_to_utc(wall_days + start, participant.zone, fold=0)
+    ends = wall_to_utc(wall_days + end, participant.zone, fold=1)
+    keep = ends > starts
+    starts, ends = starts[keep], ends[keep]
+    if starts.size < 2:
+        return starts, ends
+    # A 24-hour day starting in a repeated hour (01:30 to 01:30 when the
+    # clocks go back) runs into the next day's start; merge overlapping and
+    # touching days, so the sweep counts the participant at most once
+    reach = np.maximum.accumulate(ends)
+    first = np.concatenate(([True], starts[1:] > reach[:-1]))
+    last = np.concatenate((first[1:], [True]))
+    return starts[first], reach[last]
+
+
+def find_meeting_slots(participants: Sequence[Participant], first_day: date, last_day: date,
+                       min_minutes: int = DEFAULT_MIN_MINUTES) -> List[MeetingSlot]:
+    """
+    Find every time when all participants are at work.
+
+    Args:
+        participants: Who has to attend
+        first_day: The first date of the range, in each participant's zone
+        last_day: The last date (inclusive)
+        min_minutes: Leave out slots shorter than this
+
+    Returns:
+        The slots, in time order
+
+    Raises:
+        PlannerError: If there are no participants, a zone is unknown or the
+            date range is empty or too long
+    """
+    if not participants:
+        raise PlannerError("Add at least one participant")
+    if last_day < first_day:
+        raise PlannerError("The last day is before the first day")
+    if (last_day - first_day).days >= MAX_DAYS:
+        raise PlannerError(f"Plan at most {MAX_DAYS} days at a time")
+    for participant in participants:
+        try:
+            get_zone(participant.zone)
+        except Exception:
+            raise PlannerError(f"Unknown time zone for {participant.name}: {participant.zone}")
+
+    starts, ends = zip(*(working_intervals(p, first_day, last_day) for p in participants))
+    starts = np.concatenate(starts)
+    ends = np.concatenate(ends)
+
+    # The sweep: at equal times, starts sort before ends (a stable sort of
+    # starts followed by ends), so back-to-back intervals never dip
+    times = np.concatenate((starts, ends))
+    steps = np.concatenate((np.ones(starts.size, dtype=np.int64), -np.ones(ends.size, dtype=np.int64)))
+    order = np.argsort(times, kind="stable")
+    times = times[order]
+    at_work = np.cumsum(steps[order])
+
+    # Everyone is at work from an event that brings the count to the total
+    # until the next event
+    everyone = np.flatnonzero(at_work[:-1] == len(participants))
+    slots: List[MeetingSlot] = []
+    for i in everyone:
+        start, end = int(times[i]), int(times[i + 1])
+        if end <= start:
+            continue
+        if slots and slots[-1].end == start:
+            # Join windows split by a participant's back-to-back shifts
+            slots[-1] = MeetingSlot(slots[-1].start, end)
+        else:
+            slots.append(MeetingSlot(start, end))
+    slots = [slot for slot in slots if slot.end - slot.start >= min_minutes * 60]
+    logger.info(f"Found {len(slots)} meeting slots for {len(participants)} participants "
+                f"from {first_day} to {last_day}")
+    return slots
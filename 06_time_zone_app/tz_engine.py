@@ -0,0 +1,366 @@
+"""
+Time Zone Conversion Engine
+===========================
+
+Converts large numbers of timestamps between time zones at once.
+
+Converting one datetime at a time with astimezone() costs a Python call and
+a datetime object per value. Here, each zone's UTC offsets are laid out as a
+table of intervals (the UTC instants at which the offset changes, and the
+offset from each on), and whole NumPy arrays of timestamps are converted
+with one binary search (np.searchsorted) per array.
+
+- Zones and their offset tables are cached, so repeated conversions only
+  pay for the lookups. Tables are built per calendar year, on demand.
+- Wall times that fall into a DST gap or overlap are resolved the way
+  datetime does (PEP 495): with fold=0, the offset in effect before the
+  transition is used, with fold=1 the one after it. So 01:30 on the night
+  the clocks fall back is the first 01:30 with fold=0 and the second with
+  fold=1, and 02:30 on the night they spring forward (a time that doesn't
+  exist) becomes 03:30 with fold=0 and 01:30 with fold=1, as with datetime.
+- Offsets are found by sampling each zone once a day and narrowing every
+  change down to the second, which finds every transition except pairs less
+  than a day apart (none exist in current tz data).
+
+Timestamps are whole seconds, either Unix time (UTC) or "wall" seconds: the
+local date and time read as if it were UTC, which is what NumPy's
+datetime64 holds for naive times.
+
+Also a command line tool that streams a CSV file through the engine:
+
+    python tz_engine.py events.csv --column timestamp --from America/New_York --to UTC > events_utc.csv
+
+Version: 1.0.0
+License: MIT
+"""
+
+import argparse
+import csv
+import sys
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Iterator, List, Optional, TextIO, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+SECONDS_PER_DAY = 86_400
+# Rows converted at a time by the command line tool
+DEFAULT_CHUNK_ROWS = 65_536
+
+
+@lru_cache(maxsize=None)
+def get_zone(name: str) -> ZoneInfo:
+    """
+    Get a time zone, creating it only once.
+
+    Args:
+        name: An IANA zone name, e.g. "Asia/Karachi"
+
+    Raises:
+        zoneinfo.ZoneInfoNotFoundError: If there is no such zone
+    """
+    return ZoneInfo(name)
+
+
+def _offset_at(zone: ZoneInfo, utc_seconds: int) -> int:
+    return int(datetime.fromtimestamp(utc_seconds, zone).utcoffset().total_seconds())
+
+
+@lru_cache(maxsize=8192)
+def year_transitions(name: str, year: int) -> Tuple[int, Tuple[Tuple[int, int], ...]]:
+    """
+    Find a zone's offset changes during one year (UTC).
+
+    Args:
+        name: The zone name
+        year: The calendar year
+
+    Returns:
+        The offset at the start of the year, and (UTC instant, new offset)
+        for each change during it, in seconds
+    """
+    zone = get_zone(name)
+    start = int(datetime(year, 1, 1, tzinfo=timezone.utc).timestamp())
+    end = int(datetime(year + 1, 1, 1, tzinfo=timezone.utc).timestamp())
+    first = previous = _offset_at(zone, start)
+    changes = []
+    low = start
+    for high in range(start + SECONDS_PER_DAY, end + SECONDS_PER_DAY, SECONDS_PER_DAY):
+        high = min(high, end)
+        offset = _offset_at(zone, high)
+        if offset != previous:
+            # The change happened in (low, high]: find the exact second
+            lo, hi = low, high
+            while hi - lo > 1:
+                mid = (lo + hi) // 2
+                if _offset_at(zone, mid) == previous:
+                    lo = mid
+                else:
+                    hi = mid
+            if hi < end:
+                changes.append((hi, offset))
+            previous = offset
+        low = high
+    return first, tuple(changes)
+
+
+class OffsetTable:
+    """
+    A zone's UTC offsets over a range of years, as sorted NumPy arrays.
+
+    Args:
+        name: The zone name
+        first_year: The first year covered
+        last_year: The last year covered
+    """
+
+    def __init__(self, name: str, first_year: int, last_year: int):
+        self.name = name
+        self.first_year = first_year
+        self.last_year = last_year
+        # Interval i starts at starts[i] (UTC) and has offsets[i]
+        starts: List[int] = [np.iinfo(np.int64).min]
+        offsets: List[int] = []
+        for year in range(first_year, last_year + 1):
+            first, changes = year_transitions(name, year)
+            if not offsets:
+                offsets.append(first)
+            for instant, offset in changes:
+                if offset != offsets[-1]:
+                    starts.append(instant)
+                    offsets.append(offset)
+        self.starts = np.array(starts, dtype=np.int64)
+        self.offsets = np.array(offsets, dtype=np.int64)
+
+        # Wall times at which the new offset takes over: for fold=0 once
+        # the wall time is past both readings of the transition (so gaps
+        # and overlaps keep the old offset), for fold=1 as soon as it
+        # reaches either (they get the new one)
+        previous = self.offsets[:-1]
+        current = self.offsets[1:]
+        transitions = self.starts[1:]
+        self.wall_starts = (
+            np.concatenate((self.starts[:1], transitions + np.maximum(previous, current))),
+            np.concatenate((self.starts[:1], transitions + np.minimum(previous, current))),
+        )
+
+    def utc_offsets(self, utc_seconds: np.ndarray) -> np.ndarray:
+        """The offset in effect at each UTC instant"""
+        return self.offsets[np.searchsorted(self.starts, utc_seconds, side="right") - 1]
+
+    def wall_offsets(self, wall_seconds: np.ndarray, fold: int = 0) -> np.ndarray:
+        """The offset that applies to each wall time (see the module docs for fold)"""
+        return self.offsets[np.searchsorted(self.wall_starts[fold], wall_seconds, side="right") - 1]
+
+
+@lru_cache(maxsize=1024)
+def offset_table(name: str, first_year: int, last_year: int) -> OffsetTable:
+    """Get a cached OffsetTable"""
+    return OffsetTable(name, first_year, last_year)
+
+
+def _table_for(name: str, seconds: np.ndarray) -> OffsetTable:
+    # A day of margin covers wall times near New Year in far-off zones
+    if seconds.size == 0:
+        year = datetime.now(timezone.utc).year
+        return offset_table(name, year, year)
+    low = datetime.fromtimestamp(int(seconds.min()) - SECONDS_PER_DAY, timezone.utc).year
+    high = datetime.fromtimestamp(int(seconds.max()) + SECONDS_PER_DAY, timezone.utc).year
+    return offset_table(name, low, high)
+
+
+def utc_to_wall(utc_seconds: np.ndarray, zone: str) -> np.ndarray:
+    """
+    Convert Unix timestamps to wall times in a zone.
+
+    Args:
+        utc_seconds: Unix timestamps in seconds (int64)
+        zone: The zone name
+
+    Returns:
+        np.ndarray: The wall times, as seconds
+    """
+    utc_seconds = np.asarray(utc_seconds, dtype=np.int64)
+    return utc_seconds + _table_for(zone, utc_seconds).utc_offsets(utc_seconds)
+
+
+def wall_to_utc(wall_seconds: np.ndarray, zone: str, fold: int = 0) -> np.ndarray:
+    """
+    Convert wall times in a zone to Unix timestamps.
+
+    Args:
+        wall_seconds: Wall times, as seconds (int64)
+        zone: The zone name
+        fold: How to resolve wall times in a DST gap or overlap: 0 for the
+            offset before the transition, 1 for the one after
+
+    Returns:
+        np.ndarray: The Unix timestamps
+    """
+    wall_seconds = np.asarray(wall_seconds, dtype=np.int64)
+    return wall_seconds - _table_for(zone, wall_seconds).wall_offsets(wall_seconds, fold)
+
+
+def convert_wall_times(wall_seconds: np.ndarray, from_zone: str, to_zone: str, fold: int = 0) -> np.ndarray:
+    """
+    Convert wall times from one zone to another.
+
+    Args:
+        wall_seconds: Wall times in from_zone, as seconds (int64)
+        from_zone: The source zone name
+        to_zone: The target zone name
+        fold: How to resolve source times in a DST gap or overlap (see
+            wall_to_utc)
+
+    Returns:
+        np.ndarray: The wall times in to_zone
+    """
+    return utc_to_wall(wall_to_utc(wall_seconds, from_zone, fold), to_zone)
+
+
+def parse_timestamps(values: List[str], fmt: Optional[str] = None) -> np.ndarray:
+    """
+    Parse timestamps into seconds.
+
+    Args:
+        values: ISO 8601 strings like "2025-04-24 18:30:05" (fast), or
+            strings in fmt
+        fmt: A strptime format, for other layouts (slower)
+
+    Returns:
+        np.ndarray: The timestamps as int64 seconds
+
+    Raises:
+        ValueError: If a value can't be parsed
+    """
+    if fmt is None:
+        return np.array(values, dtype="datetime64[s]").astype(np.int64)
+    epoch = datetime(1970, 1, 1)
+    return np.array([int((datetime.strptime(value, fmt) - epoch).total_seconds()) for value in values],
+                    dtype=np.int64)
+
+
+def format_timestamps(seconds: np.ndarray, fmt: Optional[str] = None) -> List[str]:
+    """
+    Format seconds as timestamps.
+
+    Args:
+        seconds: int64 seconds
+        fmt: A strftime format; defaults to "YYYY-MM-DD HH:MM:SS" (fast)
+
+    Returns:
+        The formatted timestamps
+    """
+    if fmt is None:
+        return [value.replace("T", " ") for value in np.datetime_as_string(seconds.astype("datetime64[s]"))]
+    epoch = datetime(1970, 1, 1)
+    return [(epoch + timedelta(seconds=int(value))).strftime(fmt) for value in seconds]
+
+
+def convert_csv(source: TextIO, target: TextIO, column: str, from_zone: str, to_zone: str,
+                output_column: Optional[str] = None, fold: int = 0, in_format: Optional[str] = None,
+                out_format: Optional[str] = None, chunk_rows: int = DEFAULT_CHUNK_ROWS) -> int:
+    """
+    Stream a CSV file, converting one column between zones.
+
+    Rows are read and written in chunks, so files of any size use little
+    memory. Empty cells are left empty.
+
+    Args:
+        source: The input CSV, with a header row
+        target: Where to write the output CSV
+        column: The column holding wall times in from_zone
+        from_zone: The source zone name
+        to_zone: The target zone name
+        output_column: Add the converted times as a new column with this
+            name, instead of replacing the original values
+        fold: How to resolve times in a DST gap or overlap (see wall_to_utc)
+        in_format: strptime format of the input times (default ISO 8601)
+        out_format: strftime format of the output times (default ISO 8601)
+        chunk_rows: Rows converted at a time
+
+    Returns:
+        int: The number of rows converted
+
+    Raises:
+        ValueError: If the column is missing or a time can't be parsed
+    """
+    reader = csv.reader(source)
+    writer = csv.writer(target, lineterminator="\n")
+    try:
+        header = next(reader)
+    except StopIteration:
+        return 0
+    if column not in header:
+        raise ValueError(f"Column {column!r} not found; the columns are {', '.join(header)}")
+    index = header.index(column)
+    writer.writerow(header + [output_column] if output_column else header)
+
+    count = 0
+    for rows in _chunks(reader, chunk_rows):
+        present = [i for i, row in enumerate(rows) if index < len(row) and row[index]]
+        values = [rows[i][index] for i in present]
+        converted = format_timestamps(
+            convert_wall_times(parse_timestamps(values, in_format), from_zone, to_zone, fold), out_format)
+        results = [""] * len(rows)
+        for i, value in zip(present, converted):
+            results[i] = value
+        for row, value in zip(rows, results):
+            if output_column:
+                row.append(value)
+            elif index < len(row):
+                row[index] = value
+        writer.writerows(rows)
+        count += len(values)
+    return count
+
+
+def _chunks(reader: Iterator[List[str]], size: int) -> Iterator[List[List[str]]]:
+    chunk = []
+    for row in reader:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Convert a CSV column of timestamps between time zones")
+    parser.add_argument("input", nargs="?", default="-", help="Input CSV file (default: standard input)")
+    parser.add_argument("--column", required=True, help="Name of the column to convert")
+    parser.add_argument("--from", dest="from_zone", required=True, help="Zone of the input times, e.g. Asia/Karachi")
+    parser.add_argument("--to", dest="to_zone", required=True, help="Zone to convert to, e.g. UTC")
+    parser.add_argument("--output", "-o", default="-", help="Output CSV file (default: standard output)")
+    parser.add_argument("--output-column", help="Write the converted times to a new column with this name")
+    parser.add_argument("--fold", type=int, choices=(0, 1), default=0,
+                        help="For times in a DST gap or overlap: 0 = offset before the change, 1 = after")
+    parser.add_argument("--in-format", help="strptime format of the input times (default: ISO 8601)")
+    parser.add_argument("--out-format", help="strftime format of the output times (default: YYYY-MM-DD HH:MM:SS)")
+    args = parser.parse_args()
+
+    try:
+        get_zone(args.from_zone)
+        get_zone(args.to_zone)
+    except Exception as e:
+        parser.error(f"Unknown time zone: {str(e)}")
+
+    source = sys.stdin if args.input == "-" else open(args.input, "r", newline="", encoding="utf-8")
+    target = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        count = convert_csv(source, target, args.column, args.from_zone, args.to_zone,
+                            args.output_column, args.fold, args.in_format, args.out_format)
+    except ValueError as e:
+        parser.exit(1, f"error: {str(e)}\n")
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+    print(f"Converted {count} timestamps", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+World Clock
+===========
+
+The current time in every IANA time zone, grouped by UTC offset.
+
+Zones only change offset at their DST transitions, so each zone's offset is
+looked up once (from the tz_engine offset tables) together with the instant
+of its next transition. Until then, rendering the clock is just "now plus
+offset" for each offset group; when a transition passes, only the zones it
+affects are looked up again.
+
+Version: 1.0.0
+License: MIT
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from zoneinfo import available_timezones
+
+import numpy as np
+
+from tz_engine import get_zone, offset_table
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ClockGroup:
+    """Zones sharing a UTC offset"""
+    offset: int
+    zones: Tuple[str, ...]
+
+    @property
+    def label(self) -> str:
+        return format_offset(self.offset)
+
+    def local_time(self, now: float) -> time.struct_time:
+        """The wall time in these zones at a Unix time"""
+        return time.gmtime(now + self.offset)
+
+
+def format_offset(offset: int) -> str:
+    """Format an offset in seconds, e.g. 19800 -> UTC+05:30"""
+    sign = "+" if offset >= 0 else "-"
+    hours, remainder = divmod(abs(offset), 3600)
+    minutes = remainder // 60
+    return f"UTC{sign}{hours:02d}:{minutes:02d}"
+
+
+def all_zones() -> List[str]:
+    """Every loadable IANA zone, sorted"""
+    zones = []
+    for name in sorted(available_timezones()):
+        try:
+            get_zone(name)
+        except Exception:
+            # e.g. "localtime" or files that aren't zones
+            continue
+        zones.append(name)
+    return zones
+
+
+def _current_offset(zone: str, now: int) -> Tuple[int, int]:
+    # (offset now, Unix time of the next transition) from this year's and
+    # next year's table
+    year = datetime.fromtimestamp(now, timezone.utc).year
+    table = offset_table(zone, year, year + 1)
+    i = int(np.searchsorted(table.starts, now, side="right")) - 1
+    if i + 1 < len(table.starts):
+        return int(table.offsets[i]), int(table.starts[i + 1])
+    # No transition before the table ends: valid until then
+    return int(table.offsets[i]), int(datetime(year + 2, 1, 1, tzinfo=timezone.utc).timestamp())
+
+
+class WorldClock:
+    """
+    Offsets of many zones, kept current across DST transitions.
+
+    Thread safe; one instance can serve every Streamlit session.
+
+    Args:
+        zones: The zones to show; all IANA zones by default
+    """
+
+    def __init__(self, zones: Optional[Iterable[str]] = None):
+        self.zones = list(zones) if zones is not None else all_zones()
+        self._lock = threading.Lock()
+        # zone -> (offset, valid until)
+        self._offsets: Dict[str, Tuple[int, int]] = {}
+        self._groups: Tuple[ClockGroup, ...] = ()
+        self._valid_until = 0
+
+    def groups(self, now: Optional[float] = None) -> Tuple[ClockGroup, ...]:
+        """
+        The zones grouped by their offset at a time, smallest offset first.
+
+        Recomputed only when a zone's offset changes.
+
+        Args:
+            now: A Unix time; the current time by default
+        """
+        now = int(now if now is not None else time.time())
+        with self._lock:
+            if now >= self._valid_until:
+                self._refresh(now)
+            return self._groups
+
+    def _refresh(self, now: int) -> None:
+        stale = [zone for zone in self.zones if self._offsets.get(zone, (0, 0))[1] <= now]
+        for zone in stale:
+            self._offsets[zone] = _current_offset(zone, now)
+        by_offset: Dict[int, List[str]] = {}
+        for zone in self.zones:
+            by_offset.setdefault(self._offsets[zone][0], []).append(zone)
+        self._groups = tuple(ClockGroup(offset, tuple(zones)) for offset, zones in sorted(by_offset.items()))
+        self._valid_until = min(until for _, until in self._offsets.values())
+        logger.info(f"Updated the offsets of {len(stale)} zones; next change at "
+                    f"{datetime.fromtimestamp(self._valid_until, timezone.utc):%Y-%m-%d %H:%M:%S} UTC")
@@ -0,0 +1,336 @@
+"""
+Time Zone Search
+================
+
+Finds IANA time zones by what people actually type: a zone name
+("Asia/Kolkata", "kolkata"), a major city that isn't in any zone name
+("Mumbai", "San Francisco"), a country ("Pakistan", "Japan") or an
+abbreviation ("PST", "IST", "CET").
+
+The index is built once and can be saved to and loaded from a JSON file:
+
+- Every alias is normalized (lowercase, no accents or punctuation) and
+  stored in a sorted list of keys, both as a whole phrase and word by word,
+  so that "new y" and "york" both find New York. A prefix is found by binary
+  search over the keys.
+- For typo tolerance, each key word is also stored with each of its letters
+  deleted in turn (the symmetric delete method). A query word that is one
+  edit away from a key (a wrong, missing, extra or swapped letter) shares
+  one of those variants with it, so typos are found with a few dictionary
+  lookups instead of comparing against every key.
+
+Version: 1.0.0
+License: MIT
+"""
+
+import bisect
+import hashlib
+import json
+import logging
+import os
+import re
+import unicodedata
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from zoneinfo import TZPATH, available_timezones
+
+from tz_engine import get_zone
+
+logger = logging.getLogger(__name__)
+
+# Where the app saves the collected aliases
+INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".zone_index.json")
+# Bump when the index layout or its sources change, to invalidate saved files
+INDEX_VERSION = 1
+# Key words shorter than this get no typo variants (too many false matches)
+MIN_FUZZY_LENGTH = 4
+# Keys examined per prefix, so one-letter queries stay fast
+MAX_PREFIX_KEYS = 300
+
+# Kinds of aliases, with their ranking bonus
+ZONE, CITY, COUNTRY, ABBREVIATION = "zone", "city", "country", "abbreviation"
+KIND_BONUS = {ZONE: 0.3, CITY: 0.3, ABBREVIATION: 0.2, COUNTRY: 0.1}
+
+# Major cities that don't appear in any zone name
+CITY_ZONES: Dict[str, str] = {
+    "Mumbai": "Asia/Kolkata", "Delhi": "Asia/Kolkata", "New Delhi": "Asia/Kolkata",
+    "Bangalore": "Asia/Kolkata", "Bengaluru": "Asia/Kolkata", "Chennai": "Asia/Kolkata",
+    "Hyderabad": "Asia/Kolkata", "Pune": "Asia/Kolkata", "Calcutta": "Asia/Kolkata",
+    "Lahore": "Asia/Karachi", "Islamabad": "Asia/Karachi", "Rawalpindi": "Asia/Karachi",
+    "Faisalabad": "Asia/Karachi", "Peshawar": "Asia/Karachi",
+    "Beijing": "Asia/Shanghai", "Guangzhou": "Asia/Shanghai", "Shenzhen": "Asia/Shanghai",
+    "Chengdu": "Asia/Shanghai", "Wuhan": "Asia/Shanghai", "Xi'an": "Asia/Shanghai",
+    "Osaka": "Asia/Tokyo", "Kyoto": "Asia/Tokyo", "Yokohama": "Asia/Tokyo",
+    "Busan": "Asia/Seoul", "Hanoi": "Asia/Bangkok", "Abu Dhabi": "Asia/Dubai",
+    "Sharjah": "Asia/Dubai", "Jeddah": "Asia/Riyadh", "Mecca": "Asia/Riyadh", "Makkah": "Asia/Riyadh",
+    "Medina": "Asia/Riyadh", "Doha": "Asia/Qatar", "Ankara": "Europe/Istanbul",
+    "Tel Aviv": "Asia/Jerusalem", "Cairo": "Africa/Cairo", "Alexandria": "Africa/Cairo",
+    "Cape Town": "Africa/Johannesburg", "Pretoria": "Africa/Johannesburg", "Durban": "Africa/Johannesburg",
+    "Abuja": "Africa/Lagos", "Addis Ababa": "Africa/Addis_Ababa", "Casablanca": "Africa/Casablanca",
+    "San Francisco": "America/Los_Angeles", "Seattle": "America/Los_Angeles", "San Diego": "America/Los_Angeles",
+    "Las Vegas": "America/Los_Angeles", "Portland": "America/Los_Angeles", "San Jose": "America/Los_Angeles",
+    "Washington": "America/New_York", "Boston": "America/New_York", "Miami": "America/New_York",
+    "Atlanta": "America/New_York", "Philadelphia": "America/New_York", "Ottawa": "America/Toronto",
+    "Montreal": "America/Toronto", "Houston": "America/Chicago", "Dallas": "America/Chicago",
+    "Austin": "America/Chicago", "San Antonio": "America/Chicago", "Minneapolis": "America/Chicago",
+    "Salt Lake City": "America/Denver", "Calgary": "America/Edmonton", "Rio de Janeiro": "America/Sao_Paulo",
+    "Brasilia": "America/Sao_Paulo", "Munich": "Europe/Berlin", "Frankfurt": "Europe/Berlin",
+    "Hamburg": "Europe/Berlin", "Cologne": "Europe/Berlin", "Milan": "Europe/Rome", "Naples": "Europe/Rome",
+    "Barcelona": "Europe/Madrid", "Seville": "Europe/Madrid", "Geneva": "Europe/Zurich",
+    "Manchester": "Europe/London", "Birmingham": "Europe/London", "Edinburgh": "Europe/London",
+    "Glasgow": "Europe/London", "Rotterdam": "Europe/Amsterdam", "Saint Petersburg": "Europe/Moscow",
+    "St Petersburg": "Europe/Moscow", "Krakow": "Europe/Warsaw", "Canberra": "Australia/Sydney",
+    "Auckland": "Pacific/Auckland", "Wellington": "Pacific/Auckland",
+}
+
+# Zones that win ties between zones sharing an alias (e.g. the IST or CST
+# abbreviations, or a country with many zones)
+PREFERRED_ZONES = ("UTC", "America/New_York", "America/Chicago", "America/Denver", "America/Los_Angeles",
+                   "Europe/London", "Europe/Berlin", "Asia/Kolkata", "Asia/Karachi", "Asia/Tokyo",
+                   "Asia/Shanghai", "Australia/Sydney")
+
+_PUNCTUATION_RE = re.compile(r"[^\w+]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase, strip accents and turn punctuation into single spaces"""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).replace("'", "")
+    return _PUNCTUATION_RE.sub(" ", text.replace("_", " ")).strip()
+
+
+def deletes(word: str) -> Set[str]:
+    """The word with each of its letters deleted in turn"""
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+@dataclass(frozen=True)
+class ZoneMatch:
+    """A search result"""
+    zone: str
+    # The alias that matched, as written, e.g. "Mumbai"
+    matched: str
+    kind: str
+    score: float
+
+
+def _find_tab_file(name: str) -> Optional[str]:
+    for directory in TZPATH:
+        path = os.path.join(directory, name)
+        if os.path.exists(path):
+            return path
+    try:
+        from importlib.resources import files
+        path = files("tzdata").joinpath("zoneinfo", name)
+        if path.is_file():
+            return str(path)
+    except (ImportError, ModuleNotFoundError):
+        pass
+    return None
+
+
+def _read_tab(name: str) -> List[List[str]]:
+    path = _find_tab_file(name)
+    if path is None:
+        logger.warning(f"{name} not found; country names won't be searchable")
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.rstrip("\n").split("\t") for line in f if line.strip() and not line.startswith("#")]
+
+
+def collect_aliases(zones: Iterable[str]) -> List[Tuple[str, str, str]]:
+    """
+    Gather the searchable names of the zones.
+
+    Args:
+        zones: The zone names to index
+
+    Returns:
+        (alias, zone, kind) triples
+    """
+    zones = sorted(zones)
+    known = set(zones)
+    aliases: List[Tuple[str, str, str]] = []
+    for zone in zones:
+        aliases.append((zone, zone, ZONE))
+        # The city part, e.g. "Kolkata" or "Buenos Aires"
+        city = zone.rsplit("/", 1)[-1].replace("_", " ")
+        if city != zone:
+            aliases.append((city, zone, ZONE))
+
+    for city, zone in CITY_ZONES.items():
+        if zone in known:
+            aliases.append((city, zone, CITY))
+
+    countries = {row[0]: row[1] for row in _read_tab("iso3166.tab") if len(row) >= 2}
+    for row in _read_tab("zone.tab"):
+        if len(row) >= 3 and row[2] in known and row[0] in countries:
+            aliases.append((countries[row[0]], row[2], COUNTRY))
+
+    # Abbreviations in use this year, in winter and summer
+    year = datetime.now(timezone.utc).year
+    for zone in zones:
+        try:
+            tz = get_zone(zone)
+        except Exception:
+            # e.g. "localtime" or files that aren't zones
+            continue
+        names = set()
+        for month in (1, 7):
+            name = datetime(year, month, 1, tzinfo=tz).tzname()
+            # "+05" style names are not abbreviations
+            if name and name[0].isalpha():
+                names.add(name)
+        for name in names:
+            aliases.append((name, zone, ABBREVIATION))
+    return aliases
+
+
+class ZoneSearchIndex:
+    """
+    A prefix and typo-tolerant search index over time zone aliases.
+
+    Args:
+        aliases: (alias, zone, kind) triples, see collect_aliases()
+    """
+
+    def __init__(self, aliases: List[Tuple[str, str, str]]):
+        self.aliases = aliases
+        # key -> [(alias id, whole phrase?)]
+        entries: Dict[str, List[Tuple[int, bool]]] = {}
+        for alias_id, (alias, _, _) in enumerate(aliases):
+            phrase = normalize(alias)
+            if not phrase:
+                continue
+            entries.setdefault(phrase, []).append((alias_id, True))
+            words = phrase.split()
+            if len(words) > 1:
+                for word in set(words):
+                    entries.setdefault(word, []).append((alias_id, False))
+        self._entries = entries
+        self._keys = sorted(entries)
+        # Typo variant -> single-word keys it was derived from
+        variants: Dict[str, Set[str]] = {}
+        for key in self._keys:
+            if " " not in key and len(key) >= MIN_FUZZY_LENGTH:
+                for variant in deletes(key) | {key}:
+                    variants.setdefault(variant, set()).add(key)
+        self._variants = {variant: sorted(keys) for variant, keys in variants.items()}
+
+    @classmethod
+    def build(cls, zones: Optional[Iterable[str]] = None) -> "ZoneSearchIndex":
+        """Build an index over the given zones, all IANA zones by default"""
+        return cls(collect_aliases(zones if zones is not None else available_timezones()))
+
+    @staticmethod
+    def signature(zones: Iterable[str]) -> str:
+        """Identifies the tz data an index was built from"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{INDEX_VERSION}:{datetime.now(timezone.utc).year}\n".encode())
+        digest.update("\n".join(sorted(zones)).encode())
+        return digest.hexdigest()
+
+    def save(self, path: str, signature: str) -> None:
+        """Save the aliases; loading rebuilds the lookup tables from them"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"signature": signature, "aliases": self.aliases}, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load_or_build(cls, path: str) -> "ZoneSearchIndex":
+        """
+        Load an index saved for the current tz data, or build and save one.
+
+        Collecting the aliases (reading the tz tables and every zone's
+        abbreviations) is the slow part of building, so that's what is saved.
+
+        Args:
+            path: The JSON file
+
+        Returns:
+            ZoneSearchIndex: The index
+        """
+        zones = available_timezones()
+        signature = cls.signature(zones)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data["signature"] == signature:
+                return cls([tuple(alias) for alias in data["aliases"]])
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Rebuilding the zone search index; {path} is unreadable: {str(e)}")
+        index = cls.build(zones)
+        try:
+            index.save(path, signature)
+        except OSError as e:
+            logger.warning(f"Could not save the zone search index: {str(e)}")
+        return index
+
+    def _prefix_keys(self, prefix: str) -> List[str]:
+        keys = self._keys
+        start = bisect.bisect_left(keys, prefix)
+        found = []
+        for key in keys[start:start + MAX_PREFIX_KEYS]:
+            if not key.startswith(prefix):
+                break
+            found.append(key)
+        return found
+
+    def _fuzzy_keys(self, word: str) -> Set[str]:
+        if len(word) < MIN_FUZZY_LENGTH:
+            return set()
+        found: Set[str] = set()
+        for variant in deletes(word) | {word}:
+            found.update(self._variants.get(variant, ()))
+        return found
+
+    def search(self, query: str, limit: int = 10) -> List[ZoneMatch]:
+        """
+        Find zones for a query, best first.
+
+        Exact matches rank above prefix matches, which rank above matches
+        with a typo; whole names rank above single words of longer names
+        ("York" vs "New York").
+
+        Args:
+            query: What the user typed, e.g. "mumbai", "new yo", "pakistn"
+            limit: The maximum number of zones to return
+
+        Returns:
+            At most limit matches, one per zone
+        """
+        q = normalize(query)
+        if not q:
+            return []
+
+        # key -> match quality (3 exact, 2 prefix, 1 typo)
+        candidates: Dict[str, float] = {q: 3} if q in self._entries else {}
+        for key in self._prefix_keys(q):
+            candidates.setdefault(key, 2)
+        if not candidates:
+            # Tolerate a typo in the last word by matching it as a whole
+            # word; the words before it must match exactly
+            *head, last = q.split()
+            prefix = " ".join(head)
+            for key in self._fuzzy_keys(last):
+                phrase = f"{prefix} {key}" if prefix else key
+                if phrase in self._entries:
+                    candidates.setdefault(phrase, 1)
+
+        best: Dict[str, ZoneMatch] = {}
+        preferred = {zone: i for i, zone in enumerate(PREFERRED_ZONES)}
+        for key, quality in candidates.items():
+            for alias_id, whole in self._entries[key]:
+                alias, zone, kind = self.aliases[alias_id]
+                # Ties go to shorter keys, then shorter aliases, then
+                # preferred zones
+                score = (quality + KIND_BONUS[kind] + (0.5 if whole else 0.0) - len(key) / 1000
+                         - len(alias) / 100000 - preferred.get(zone, len(preferred)) / 10000000)
+                current = best.get(zone)
+                if current is None or score > current.score:
+                    best[zone] = ZoneMatch(zone, alias, kind, score)
+        return sorted(best.values(), key=lambda match: (-match.score, match.zone))[:limit]
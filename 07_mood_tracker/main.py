@@ -4,20 +4,128 @@ import pandas as pd     # Pandas: Powerful data manipulation and analysis librar
 import datetime        # Datetime: Standard library for handling dates and times
 import csv            # CSV: Standard library for reading/writing CSV files
 import os             # OS: Standard library for file and directory operations
+import threading      # Threading: Lock guarding the shared data cache
+from dataclasses import dataclass, field  # Dataclasses: Simple container for the cache state
 
 # Configuration: Define the CSV file path for persistent mood data storage
 MOOD_FILE = "mood_log.csv"
 
+# Available mood options
+MOODS = ["Happy", "Sad", "Angry", "Neutral"]
+# Bytes from the end of the loaded data that must be unchanged for the file
+# to count as "only appended to"
+CHECK_BYTES = 64
+
+def empty_mood_data():
+    """Returns an empty DataFrame with the mood log columns"""
+    return pd.DataFrame({"Date": pd.Series(dtype="datetime64[ns]"), "Mood": pd.Series(dtype="object")})
+
+def parse_mood_lines(text):
+    """
+    Parses mood log lines into a DataFrame.
+    Lines are "date<TAB>mood" or "date,mood" (both formats occur in the log);
+    a "Date,Mood" header and malformed lines are skipped.
+    Args:
+        text: The lines to parse
+    """
+    dates, moods = [], []
+    for line in text.splitlines():
+        date, separator, mood = line.partition("\t")
+        if not separator:
+            date, separator, mood = line.partition(",")
+        if separator and date.strip() != "Date":
+            dates.append(date.strip())
+            moods.append(mood.strip())
+    if not dates:
+        return empty_mood_data()
+    chunk = pd.DataFrame({"Date": pd.to_datetime(dates, errors="coerce"), "Mood": moods})
+    return chunk.dropna(subset=["Date"])
+
+@dataclass
+class MoodCache:
+    """The loaded mood data, and which version of the file it came from"""
+    size: int = -1
+    mtime: int = -1
+    # Bytes of complete lines parsed so far and the last few of them, to
+    # detect rewrites
+    offset: int = 0
+    check: bytes = b""
+    # The entries of the complete lines and the entries per mood
+    lines: pd.DataFrame = field(default_factory=empty_mood_data)
+    line_counts: pd.Series = field(default_factory=lambda: pd.Series(dtype="int64", name="Date"))
+    # What is shown: the complete lines plus a last line that isn't ended
+    # yet, which is parsed again once it is. counts is the same as
+    # data.groupby("Mood").count()["Date"]
+    data: pd.DataFrame = field(default_factory=empty_mood_data)
+    counts: pd.Series = field(default_factory=lambda: pd.Series(dtype="int64", name="Date"))
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def clear(self):
+        """Forgets the loaded data, e.g. when the file was replaced"""
+        self.size, self.mtime, self.offset, self.check = -1, -1, 0, b""
+        self.lines = self.data = empty_mood_data()
+        self.line_counts = self.counts = pd.Series(dtype="int64", name="Date")
+
+def add_mood_lines(data, counts, chunk):
+    """Returns data and counts with the entries of a parsed chunk added"""
+    if chunk.empty:
+        return data, counts
+    data = chunk if data.empty else pd.concat([data, chunk], ignore_index=True)
+    chunk_counts = chunk.groupby("Mood").count()["Date"]
+    return data, counts.add(chunk_counts, fill_value=0).astype("int64").sort_index()
+
+@st.cache_resource
+def get_mood_cache():
+    """Returns the mood data cache shared by all sessions"""
+    return MoodCache()
+
 def load_mood_data():
     """
     Loads mood tracking data from CSV file.
-    Returns an empty DataFrame if no data exists.
+    The data is cached and only reloaded when the file's size or modification
+    time changes. When the file has only grown, just the new lines are parsed
+    and added to the cached data and mood counts; an unfinished last line is
+    shown but parsed again on the next load.
+    Returns the MoodCache; its data is an empty DataFrame if no data exists.
+    The DataFrame is shared between sessions and must not be modified.
     """
-    if not os.path.exists(MOOD_FILE):
-        # Initialize empty DataFrame with required columns if file doesn't exist
-        return pd.DataFrame(columns=["Date", "Mood"])
-    # Load existing mood data from CSV file
-    return pd.read_csv(MOOD_FILE)
+    cache = get_mood_cache()
+    with cache.lock:
+        try:
+            stat = os.stat(MOOD_FILE)
+        except FileNotFoundError:
+            # Initialize empty data if the file doesn't exist
+            cache.clear()
+            return cache
+        if (stat.st_size, stat.st_mtime_ns) == (cache.size, cache.mtime):
+            # Nothing changed since the last rerun
+            return cache
+
+        with open(MOOD_FILE, "rb") as file:
+            appended = False
+            if cache.offset and stat.st_size >= cache.offset:
+                # Same file with lines added at the end?
+                file.seek(cache.offset - len(cache.check))
+                appended = file.read(len(cache.check)) == cache.check
+            if not appended:
+                # New or rewritten file: load it all
+                cache.clear()
+                file.seek(0)
+            new_bytes = file.read()
+
+        # Parse only the new complete lines and merge them into the cached
+        # results. A last line without a newline may still be being written,
+        # so it is shown but read again next time, like the rest of the file
+        complete = new_bytes.rfind(b"\n") + 1
+        lines, tail = new_bytes[:complete], new_bytes[complete:]
+        chunk = parse_mood_lines(lines.decode("utf-8", errors="replace"))
+        cache.lines, cache.line_counts = add_mood_lines(cache.lines, cache.line_counts, chunk)
+        cache.check = (cache.check + lines)[-CHECK_BYTES:]
+        cache.offset += len(lines)
+        tail_chunk = parse_mood_lines(tail.decode("utf-8", errors="replace"))
+        cache.data, cache.counts = add_mood_lines(cache.lines, cache.line_counts, tail_chunk)
+        cache.size, cache.mtime = stat.st_size, stat.st_mtime_ns
+        return cache
 
 def save_mood_data(date, mood):
     """
@@ -26,8 +134,16 @@ def save_mood_data(date, mood):
         date: The date of the mood entry
         mood: The mood value to be recorded
     """
-    with open(MOOD_FILE, "a") as file:
-        writer = csv.writer(file)
+    # Start a new line if the last entry wasn't ended with one
+    needs_newline = False
+    if os.path.exists(MOOD_FILE) and os.path.getsize(MOOD_FILE) > 0:
+        with open(MOOD_FILE, "rb") as file:
+            file.seek(-1, os.SEEK_END)
+            needs_newline = file.read(1) not in (b"\n", b"\r")
+    with open(MOOD_FILE, "a", newline="") as file:
+        if needs_newline:
+            file.write("\n")
+        writer = csv.writer(file, lineterminator="\n")
         writer.writerow([date, mood])
 
 # Initialize Streamlit UI components
@@ -38,7 +154,7 @@ today = datetime.date.today()  # Get current date for new entries
 st.subheader("How are your feeling today?")
 mood = st.selectbox(
     "Select your mood",
-    ["Happy", "Sad", "Angry", "Neutral"]  # Available mood options
+    MOODS  # Available mood options
 )
 
 # Handle mood logging
@@ -46,16 +162,16 @@ if st.button("Log Mood"):
     save_mood_data(today, mood)
     st.success("Mood Logged Successfully!")
 
-# Load and display mood data
-data = load_mood_data()
+# Load and display mood data (cached, dates already parsed)
+mood_data = load_mood_data()
+data = mood_data.data
 
 if not data.empty:
     # Create visualization section
     st.subheader("Mood Trends Over Time")
     
-    # Process data for visualization
-    data["Date"] = pd.to_datetime(data["Date"])  # Convert string dates to datetime
-    mood_counts = data.groupby("Mood").count()["Date"]  # Calculate mood frequencies
+    # Mood frequencies, kept up to date as entries are added
+    mood_counts = mood_data.counts
     
     # Display mood distribution chart
     st.bar_chart(mood_counts)